@@ -1,4 +1,70 @@
-from appwashpy.client.appwash import AppWash, check_credentials
-from appwashpy.common.enums import LOCATION_TYPE, SERVICE_TYPE, STATE
-from appwashpy.core.location import Location
-from appwashpy.core.service import Service
+import importlib
+from typing import TYPE_CHECKING
+
+from appwashpy.common.enums import ENDPOINT, LOCATION_TYPE, SERVICE_TYPE, STATE
+
+# Public names and the modules they are imported from on first access,
+# so `import appwashpy` doesn't load requests, aiohttp or numpy
+_LAZY = {
+    "AppWash": "appwashpy.client.appwash",
+    "check_credentials": "appwashpy.client.appwash",
+    "AsyncAppWash": "appwashpy.client.async_appwash",
+    "BuyQueue": "appwashpy.client.buy_queue",
+    "ResponseCache": "appwashpy.client.cache",
+    "HistoryRecorder": "appwashpy.client.history",
+    "Metrics": "appwashpy.client.metrics",
+    "AccountPool": "appwashpy.client.pool",
+    "check_credentials_many": "appwashpy.client.pool",
+    "RateLimiter": "appwashpy.client.ratelimit",
+    "CircuitBreaker": "appwashpy.client.retry",
+    "RetryPolicy": "appwashpy.client.retry",
+    "AdaptivePoller": "appwashpy.client.scheduler",
+    "FileTokenStore": "appwashpy.client.token_store",
+    "OccupancyAnalytics": "appwashpy.core.analytics",
+    "ServiceStateChange": "appwashpy.core.change",
+    "CompactLocation": "appwashpy.core.compact",
+    "CompactService": "appwashpy.core.compact",
+    "BuyIntent": "appwashpy.core.intent",
+    "Location": "appwashpy.core.location",
+    "PriceCatalog": "appwashpy.core.pricing",
+    "BuyResult": "appwashpy.core.purchase",
+    "Service": "appwashpy.core.service",
+}
+
+__all__ = ["ENDPOINT", "LOCATION_TYPE", "SERVICE_TYPE", "STATE", *_LAZY]
+
+# Eager imports for type checkers and IDEs
+if TYPE_CHECKING:
+    from appwashpy.client.appwash import AppWash, check_credentials
+    from appwashpy.client.async_appwash import AsyncAppWash
+    from appwashpy.client.buy_queue import BuyQueue
+    from appwashpy.client.cache import ResponseCache
+    from appwashpy.client.history import HistoryRecorder
+    from appwashpy.client.metrics import Metrics
+    from appwashpy.client.pool import AccountPool, check_credentials_many
+    from appwashpy.client.ratelimit import RateLimiter
+    from appwashpy.client.retry import CircuitBreaker, RetryPolicy
+    from appwashpy.client.scheduler import AdaptivePoller
+    from appwashpy.client.token_store import FileTokenStore
+    from appwashpy.core.analytics import OccupancyAnalytics
+    from appwashpy.core.change import ServiceStateChange
+    from appwashpy.core.compact import CompactLocation, CompactService
+    from appwashpy.core.intent import BuyIntent
+    from appwashpy.core.location import Location
+    from appwashpy.core.pricing import PriceCatalog
+    from appwashpy.core.purchase import BuyResult
+    from appwashpy.core.service import Service
+
+
+def __getattr__(name: str):
+    """Imports the module of a public name on first access and caches the name in the package."""
+    module = _LAZY.get(name)
+    if module == None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list:
+    return sorted(set(globals()) | set(_LAZY))
@@ -0,0 +1,5 @@
+import sys
+
+from appwashpy.cli import main
+
+sys.exit(main())
@@ -0,0 +1,341 @@
+import argparse
+import os
+import sys
+import time
+from typing import TYPE_CHECKING, Iterator
+
+from appwashpy.client.daemon import AppWashDaemon, connect, send_request
+from appwashpy.common.enums import SERVICE_TYPE, STATE
+from appwashpy.common.errors import BaseError
+from appwashpy.common.serialization import dumps
+from appwashpy.common.settings import (
+    BASE_URL,
+    DAEMON_SOCKET_PATH,
+    TOKEN_STORE_PATH,
+    WATCH_INTERVAL,
+)
+
+# The client is only imported when a command runs without daemon, requests takes long to import
+if TYPE_CHECKING:
+    from appwashpy.client.appwash import AppWash
+
+# Options that configure the client or the output instead of the command
+GLOBAL_OPTIONS = (
+    "email",
+    "password",
+    "location",
+    "base_url",
+    "token_store",
+    "socket",
+    "no_daemon",
+    "pretty",
+    "command",
+)
+
+
+def _service_type(name: str) -> SERVICE_TYPE:
+    return SERVICE_TYPE[name] if name != None else None
+
+
+def _location(client: "AppWash", location_id: str = None) -> Iterator:
+    yield client.location(location_id)
+
+
+def _locations(client: "AppWash", location_ids: list) -> Iterator:
+    yield client.locations_many(location_ids)
+
+
+def _services(
+    client: "AppWash",
+    location_id: str = None,
+    service_type: str = None,
+    available: bool = False,
+) -> Iterator:
+    services = client.services(location_id, _service_type(service_type))
+    if available:
+        services = [s for s in services if s.state == STATE.AVAILABLE]
+    yield services
+
+
+def _service(client: "AppWash", service_id: str) -> Iterator:
+    yield client.service(service_id)
+
+
+def _find(
+    client: "AppWash",
+    location_ids: list,
+    service_type: str = None,
+    count: int = 1,
+    cheapest: bool = False,
+) -> Iterator:
+    yield client.find_available(
+        location_ids, _service_type(service_type), count, cheapest
+    )
+
+
+def _buy(client: "AppWash", service_id: str, unsafe: bool = False) -> Iterator:
+    yield client.buy_service(service_id, safe=not unsafe)
+
+
+def _stop(client: "AppWash", service_id: str) -> Iterator:
+    client.stop_service(service_id)
+    yield {"service_id": service_id, "stopped": True}
+
+
+def _watch(
+    client: "AppWash",
+    location_ids: list = None,
+    service_type: str = None,
+    interval: float = WATCH_INTERVAL,
+    initial: bool = False,
+    polls: int = None,
+) -> Iterator:
+    watcher = client.watch(
+        location_ids or None, _service_type(service_type), interval, initial
+    )
+    while polls == None or watcher.polls < polls:
+        if watcher.polls > 0:
+            time.sleep(interval)
+        yield from watcher.poll()
+
+
+# Commands that can be run directly or by the daemon, each yields its results
+COMMANDS = {
+    "location": _location,
+    "locations": _locations,
+    "services": _services,
+    "service": _service,
+    "find": _find,
+    "buy": _buy,
+    "stop": _stop,
+    "watch": _watch,
+}
+
+
+def execute(client: "AppWash", request: dict) -> Iterator:
+    """Runs a request of the form {"command": name, "args": {...}} and yields its results."""
+    command = COMMANDS.get(request.get("command"))
+    if command == None:
+        raise ValueError(f"Unknown command {request.get('command')!r}")
+    return command(client, **request.get("args", {}))
+
+
+def serve(client: "AppWash", request: dict) -> Iterator:
+    """Runs a request sent to the daemon, see execute().
+
+    Requests naming another account or server than the one of the client are refused with a ValueError,
+    so a command is never run, and possibly billed, with the wrong credentials.
+    """
+    email = request.get("email")
+    if email != None and email != client.email:
+        raise ValueError(
+            f"The daemon is logged in as {client.email}, not as {email}. Use --no-daemon or another --socket."
+        )
+    base_url = request.get("base_url")
+    if base_url != None and base_url != client.base_url:
+        raise ValueError(
+            f"The daemon is connected to {client.base_url}, not to {base_url}. Use --no-daemon or another --socket."
+        )
+    return execute(client, request)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="appwashpy",
+        description="Inofficial command-line client for appWash by Miele. Prints the results as JSON.",
+    )
+    parser.add_argument(
+        "--email",
+        default=os.environ.get("APPWASH_EMAIL"),
+        help="Email of your AppWash account (env APPWASH_EMAIL)",
+    )
+    parser.add_argument(
+        "--password",
+        default=os.environ.get("APPWASH_PASSWORD"),
+        help="Password of your AppWash account (env APPWASH_PASSWORD)",
+    )
+    parser.add_argument(
+        "--location",
+        default=os.environ.get("APPWASH_LOCATION_ID"),
+        help="Default location_id of the commands (env APPWASH_LOCATION_ID)",
+    )
+    parser.add_argument(
+        "--base-url",
+        default=os.environ.get("APPWASH_BASE_URL", BASE_URL),
+        help=argparse.SUPPRESS,
+    )
+    parser.add_argument(
+        "--token-store",
+        default=os.environ.get("APPWASH_TOKEN_STORE", TOKEN_STORE_PATH),
+        help="File the token is shared in between invocations (env APPWASH_TOKEN_STORE)",
+    )
+    parser.add_argument(
+        "--socket",
+        default=os.environ.get("APPWASH_SOCKET", DAEMON_SOCKET_PATH),
+        help="Unix socket of the daemon (env APPWASH_SOCKET)",
+    )
+    parser.add_argument(
+        "--no-daemon",
+        action="store_true",
+        help="Don't use a running daemon, always connect directly",
+    )
+    parser.add_argument("--pretty", action="store_true", help="Indent the JSON output")
+
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    command = commands.add_parser("location", help="Show a location")
+    command.add_argument("location_id", nargs="?")
+
+    command = commands.add_parser("locations", help="Show several locations")
+    command.add_argument("location_ids", nargs="+")
+
+    command = commands.add_parser("services", help="List the services of a location")
+    command.add_argument("location_id", nargs="?")
+    command.add_argument(
+        "--type", dest="service_type", choices=list(SERVICE_TYPE.__members__)
+    )
+    command.add_argument(
+        "--available", action="store_true", help="Only list available services"
+    )
+
+    command = commands.add_parser("service", help="Show a service")
+    command.add_argument("service_id")
+
+    command = commands.add_parser(
+        "find", help="Find available services at one or more locations"
+    )
+    command.add_argument("location_ids", nargs="*")
+    command.add_argument(
+        "--type", dest="service_type", choices=list(SERVICE_TYPE.__members__)
+    )
+    command.add_argument("--count", type=int, default=1)
+    command.add_argument(
+        "--cheapest", action="store_true", help="Prefer the cheapest services"
+    )
+
+    command = commands.add_parser("buy", help="Buy a service. This bills you!")
+    command.add_argument("service_id")
+    command.add_argument(
+        "--unsafe",
+        action="store_true",
+        help="Buy even if the service is already running for you",
+    )
+
+    command = commands.add_parser("stop", help="Stop a service")
+    command.add_argument("service_id")
+
+    command = commands.add_parser(
+        "watch", help="Print the state changes of services, one JSON line each"
+    )
+    command.add_argument("location_ids", nargs="*")
+    command.add_argument(
+        "--type", dest="service_type", choices=list(SERVICE_TYPE.__members__)
+    )
+    command.add_argument("--interval", type=float, default=WATCH_INTERVAL)
+    command.add_argument(
+        "--initial",
+        action="store_true",
+        help="Report the current state of every service first",
+    )
+    command.add_argument("--polls", type=int, help="Stop after this number of polls")
+
+    commands.add_parser(
+        "daemon",
+        help="Keep an authenticated client warm and serve the other commands over the socket",
+    )
+    return parser
+
+
+def _request(options: argparse.Namespace) -> dict:
+    """The command and its arguments, with the default location filled in.
+
+    The account and server are sent along, so a daemon of another account refuses the command.
+    """
+    args = {
+        name: value
+        for name, value in vars(options).items()
+        if name not in GLOBAL_OPTIONS
+    }
+    if options.location != None:
+        if "location_id" in args and args["location_id"] == None:
+            args["location_id"] = options.location
+        if "location_ids" in args and not args["location_ids"]:
+            args["location_ids"] = [options.location]
+    return {
+        "command": options.command,
+        "args": args,
+        "email": options.email,
+        "base_url": options.base_url,
+    }
+
+
+def _client(parser: argparse.ArgumentParser, options: argparse.Namespace) -> "AppWash":
+    from appwashpy.client.appwash import AppWash
+    from appwashpy.client.token_store import FileTokenStore
+
+    if options.email == None or options.password == None:
+        parser.error(
+            "Pass --email and --password or set APPWASH_EMAIL and APPWASH_PASSWORD"
+        )
+    return AppWash(
+        options.email,
+        options.password,
+        options.location,
+        base_url=options.base_url,
+        token_store=FileTokenStore(options.token_store),
+    )
+
+
+def _serve(parser: argparse.ArgumentParser, options: argparse.Namespace) -> int:
+    with _client(parser, options) as client:
+        # Log in before accepting requests, so the first one is already fast
+        client.token
+        daemon = AppWashDaemon(lambda request: serve(client, request), options.socket)
+        print(f"Listening on {options.socket}", file=sys.stderr, flush=True)
+        try:
+            daemon.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            daemon.server_close()
+    return 0
+
+
+def main(argv: list = None) -> int:
+    """Runs the appwashpy command line and returns its exit code.
+
+    Commands are sent to a daemon listening on --socket if there is one, otherwise run with a new client.
+    Every result is printed to stdout as one JSON document, errors to stderr with exit code 1.
+    """
+    parser = build_parser()
+    options = parser.parse_args(argv)
+    indent = 2 if options.pretty else None
+
+    if options.command == "daemon":
+        return _serve(parser, options)
+
+    request = _request(options)
+    connection = None
+    if not options.no_daemon:
+        try:
+            connection = connect(options.socket)
+        except OSError:
+            pass
+
+    try:
+        if connection != None:
+            for message in send_request(connection, request):
+                if "error" in message:
+                    print(dumps(message["error"]), file=sys.stderr)
+                    return 1
+                print(dumps(message["result"], indent), flush=True)
+        else:
+            with _client(parser, options) as client:
+                for result in execute(client, request):
+                    print(dumps(result, indent), flush=True)
+    except (BaseError, ValueError) as error:
+        print(dumps(error), file=sys.stderr)
+        return 1
+    except KeyboardInterrupt:
+        return 130
+    return 0
@@ -1,37 +1,181 @@
-from appwashpy.client.requests import ApiRequest
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Iterator, Union
+
+import requests
+
+from appwashpy.client.cache import ResponseCache
+from appwashpy.client.coalesce import SingleFlight
+from appwashpy.client.metrics import Metrics
+from appwashpy.client.ratelimit import RateLimiter
+from appwashpy.client.requests import ApiRequest, StreamingApiRequest
+from appwashpy.client.retry import (
+    CircuitBreaker,
+    RetryPolicy,
+    RetryStats,
+    default_retry_policies,
+)
+from appwashpy.client.session import create_session
+from appwashpy.client.token_store import FileTokenStore
+from appwashpy.client.watch import ServiceWatcher
 from appwashpy.common.enums import HTTP_METHOD, SERVICE_TYPE, STATE
 from appwashpy.common.errors import AppWashApiError, WrongCredentialsError
 from appwashpy.common.helper import current_timestamp
+from appwashpy.common.settings import (
+    BASE_URL,
+    BATCH_MAX_WORKERS,
+    BUY_MAX_STATE_AGE,
+    POOL_BLOCK,
+    POOL_CONNECTIONS,
+    POOL_MAXSIZE,
+    REQUEST_TIMEOUT,
+    TOKEN_REFRESH_MARGIN,
+    WATCH_INTERVAL,
+)
+from appwashpy.core.compact import CompactLocation, CompactService
 from appwashpy.core.location import Location
+from appwashpy.core.pricing import PriceCatalog
+from appwashpy.core.purchase import (
+    STATE_FROM_CACHE,
+    STATE_FROM_NETWORK,
+    STATE_FROM_SERVICE,
+    STATE_UNCHECKED,
+    BuyResult,
+)
 from appwashpy.core.service import Service
 
+# The history and the buy queue are imported when they are used, sqlite3 takes long to import
+if TYPE_CHECKING:
+    from appwashpy.client.buy_queue import BuyQueue
+    from appwashpy.client.history import HistoryRecorder
+
 
 class AppWash:
     """Entry point for the AppWashPy SDK.
 
     Entry point containing methods to load locations and services.
     Needs your AppWash Login credentials to handle the authentication.
+    All requests share one pooled keep-alive HTTP session, which is released by close() or by using the client as a context manager.
 
     Attributes:
         email: Email Adress of your AppWash Account.
         password: Password of your AppWash Account.
         location_id (optional): The location_id of your house. Can be obtained via the website (URL-Parameter id, e.g. 11111 for https://appwash.com/myappwash/location/?id=11111)
+        base_url (optional): Base URL of the AppWash API, e.g. to point the client at a local stub server.
+        pool_connections (optional): Number of per-host connection pools to cache.
+        pool_maxsize (optional): Maximum number of keep-alive connections kept open per host.
+        pool_block (optional): Whether to wait for a free connection once pool_maxsize connections are in use instead of opening additional ones.
+        session (optional): An existing requests.Session to use instead of creating an own one. It is not closed by close().
+        token_refresh_margin (optional): Seconds before the token expires in which it is renewed in the background.
+        token_store (optional): A FileTokenStore to share the token with other processes. A stored token is used before logging in again.
+        cache (optional): A ResponseCache for the results of location(), services() and service(). Buying or stopping a service invalidates its cached entries.
+        compact (optional): Whether to return the memory-compact CompactService and CompactLocation instead of Service and Location.
+        timeout (optional): Connect and read timeout of every request in seconds, as single number or tuple.
+        retry_policy (optional): RetryPolicy of the idempotent endpoints (login and all reads). Starting and stopping services is never retried unless configured in retry_policies.
+        retry_policies (optional): Dict mapping an ENDPOINT to its RetryPolicy, overrides the defaults per endpoint.
+        circuit_breaker (optional): CircuitBreaker of the client. Pass False to disable it.
+        rate_limiter (optional): RateLimiter every request of the client has to pass. Logins, starting and stopping services are served before reads.
+        coalesce (optional): Whether concurrent identical calls of location(), services() and service() share one request.
+        metrics (optional): Metrics recording latency, status codes, error codes and response sizes of every request attempt. Disabled by default.
+        max_state_age (optional): Seconds a state observed by services(), service() or the cache is trusted by a safe buy_service() instead of loading it again.
+        recorder (optional): HistoryRecorder storing the state transitions of every service loaded by services(), iter_services(), service() and watch().
+        max_concurrency (optional): Maximum number of requests of the client in flight at once, further ones wait. Unlimited by default.
+        coalescer: The SingleFlight coalescing identical reads, its stats() tell how many calls were coalesced. None if disabled.
+        retry_stats: Number of retries and of requests that failed after their last attempt, per endpoint.
+        price_catalog: PriceCatalog with the prices of all locations loaded by the client. Identical tariffs are shared between the locations.
 
     """
 
     email: str
     password: str
     location_id: str = None
+    base_url: str = BASE_URL
 
     _token: str = None
     _token_expiry: int = None
-
-    def __init__(self, email: str, password: str, location_id: str = None):
+    _clock_offset: int = 0
+    _session: requests.Session = None
+    _owns_session: bool = False
+
+    def __init__(
+        self,
+        email: str,
+        password: str,
+        location_id: str = None,
+        base_url: str = None,
+        pool_connections: int = POOL_CONNECTIONS,
+        pool_maxsize: int = POOL_MAXSIZE,
+        pool_block: bool = POOL_BLOCK,
+        session: requests.Session = None,
+        token_refresh_margin: int = TOKEN_REFRESH_MARGIN,
+        token_store: FileTokenStore = None,
+        cache: ResponseCache = None,
+        compact: bool = False,
+        timeout: Union[float, tuple] = REQUEST_TIMEOUT,
+        retry_policy: RetryPolicy = None,
+        retry_policies: dict = None,
+        circuit_breaker: Union[CircuitBreaker, bool] = None,
+        rate_limiter: RateLimiter = None,
+        coalesce: bool = True,
+        metrics: Metrics = None,
+        max_state_age: float = BUY_MAX_STATE_AGE,
+        recorder: "HistoryRecorder" = None,
+        max_concurrency: int = None,
+    ):
         self.email = email
         self.password = password
 
         if location_id != None:
             self.location_id = location_id
+        if base_url != None:
+            self.base_url = base_url
+
+        if session != None:
+            self._session = session
+        else:
+            self._session = create_session(pool_connections, pool_maxsize, pool_block)
+            self._owns_session = True
+
+        self.token_refresh_margin = token_refresh_margin
+        self.token_store = token_store
+        self.cache = cache
+        self.price_catalog = PriceCatalog()
+
+        self.timeout = timeout
+        self.retry_policies = default_retry_policies(retry_policy)
+        if retry_policies != None:
+            self.retry_policies.update(retry_policies)
+        if circuit_breaker == None:
+            circuit_breaker = CircuitBreaker()
+        self.circuit_breaker = circuit_breaker if circuit_breaker != False else None
+        self.retry_stats = RetryStats()
+        self.rate_limiter = rate_limiter
+        self.coalescer = SingleFlight() if coalesce else None
+        self.metrics = metrics
+        self.max_state_age = max_state_age
+        self.recorder = recorder
+        self.max_concurrency = max_concurrency
+        self._request_slots = (
+            threading.BoundedSemaphore(max_concurrency)
+            if max_concurrency != None
+            else None
+        )
+        self._service_class = CompactService if compact else Service
+        self._location_class = CompactLocation if compact else Location
+        self._token_lock = threading.Lock()
+        self._refresh_thread = None
+
+    def close(self) -> None:
+        """Closes the pooled connections of the client."""
+        if self._owns_session:
+            self._session.close()
+
+    def __enter__(self) -> "AppWash":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
 
     def _authenticate(self) -> None:
         """Loads a new authentication token for your Account."""
@@ -46,6 +190,11 @@ class AppWash:
         if error_code == 0:
             self._token = request.response["login"]["token"]
             self._token_expiry = request.response["token_expire_ts"]
+            # token_expire_ts is given in server time, remember how far the local clock is off
+            if "serverTime" in request.response:
+                self._clock_offset = (
+                    request.response["serverTime"] - current_timestamp()
+                )
         elif error_code == 61:
             raise WrongCredentialsError(
                 error_code,
@@ -56,33 +205,132 @@ class AppWash:
         else:
             raise AppWashApiError(error_code, request.response["errorDescription"])
 
-    @property
-    def token(self) -> None:
-        """Getter for the token. Automatically renews the token if the old one is expired."""
+    def _login_entry(self) -> dict:
+        """Logs in and returns the token as entry for the token store."""
+        self._authenticate()
+        return {
+            "token": self._token,
+            "token_expiry": self._token_expiry,
+            "clock_offset": self._clock_offset,
+        }
+
+    def _server_timestamp(self) -> int:
+        """Current timestamp corrected by the clock skew observed at the last login."""
+        return current_timestamp() + self._clock_offset
+
+    def _token_expires_in(self) -> int:
+        """Seconds until the token expires, 0 if there is no valid token."""
         if self._token == None:
-            self._authenticate()
-        if self._token_expiry > current_timestamp():
-            return self._token
-        else:
-            self._authenticate()
+            return 0
+        return max(self._token_expiry - self._server_timestamp(), 0)
+
+    def _renew_token(self, margin: int = 0, blocking: bool = True) -> None:
+        """Renews the token unless it is valid for more than margin seconds.
+
+        Only one login is in flight at a time. Blocking callers wait for it and reuse its token,
+        non-blocking callers return immediately if a renewal is already running.
+        """
+        if not self._token_lock.acquire(blocking):
+            return
+        try:
+            # Another thread may have renewed the token while this one was waiting
+            if self._token_expires_in() <= margin:
+                if self.token_store != None:
+                    entry = self.token_store.get_or_create(
+                        self.email, self._login_entry, margin
+                    )
+                    self._token = entry["token"]
+                    self._token_expiry = entry["token_expiry"]
+                    self._clock_offset = entry["clock_offset"]
+                else:
+                    self._authenticate()
+        finally:
+            self._token_lock.release()
+
+    def _renew_token_in_background(self) -> None:
+        """Starts a background renewal of the token if none is running."""
+        if self._refresh_thread != None and self._refresh_thread.is_alive():
+            return
+
+        def renew():
+            try:
+                self._renew_token(self.token_refresh_margin, blocking=False)
+            except Exception:
+                # The current token is still valid, a failing renewal is retried on the next access
+                pass
+
+        self._refresh_thread = threading.Thread(target=renew, daemon=True)
+        self._refresh_thread.start()
+
+    @property
+    def token(self) -> str:
+        """Getter for the token. Automatically renews the token if the old one is expired.
+
+        A token close to its expiry is renewed in the background while the current one is still returned.
+        """
+        token = self._token
+        expires_in = self._token_expires_in()
+        if expires_in == 0:
+            self._renew_token()
             return self._token
 
-    def location(self, location_id: str = None) -> Location:
-        """Load your default or a specific location.
+        if expires_in <= self.token_refresh_margin:
+            self._renew_token_in_background()
+        return token
 
-        Attributes:
-            location_id (optional): The location_id of your house. Can be seen in the appwash URL. Uses the location_id of the Objekt if not specified.
+    def _coalesced(self, key: tuple, load: Callable[[], Any]) -> Any:
+        """Returns the result of load(), shared with concurrent calls for the same key if coalescing is enabled."""
+        if self.coalescer == None:
+            return load()
+        return self.coalescer.do(key, load)
+
+    def _cached(self, key: tuple, load: Callable[[], Any]) -> tuple:
+        """Returns the result of load(), served from the response cache if one is configured.
+
+        Returns:
+            Tuple of the result and the monotonic time it was loaded at, which is earlier for cached results.
         """
+        if self.cache == None:
+            return self._coalesced(key, load), time.monotonic()
+        return self.cache.get_or_load_timed(key, lambda: self._coalesced(key, load))
 
-        # Use either location_id parameter or default location_id
-        if location_id == None and self.location_id == None:
-            raise ValueError(
-                "Either set a default location_id or pass a location_id to the method."
+    def _load_location(self, location_id: str) -> dict:
+        """Loads the raw data of a location."""
+        request = ApiRequest(
+            self, endpoint=f"/locations/split/{location_id}", method=HTTP_METHOD.GET
+        )
+
+        if request.response["errorCode"] != 0:
+            raise AppWashApiError(
+                request.response["errorCode"], request.response["errorDescription"]
             )
-        location_id = location_id if location_id != None else self.location_id
+
+        return request.response["data"]
+
+    def _load_services(
+        self, location_id: str, service_type: SERVICE_TYPE = None
+    ) -> list[dict]:
+        """Loads the raw data of the services at a location."""
+        body = {"serviceType": str(service_type)} if service_type != None else {}
 
         request = ApiRequest(
-            self, endpoint=f"/locations/split/{location_id}", method=HTTP_METHOD.GET
+            self,
+            endpoint=f"/location/{location_id}/connectorsv2",
+            method=HTTP_METHOD.POST,
+            body=body,
+        )
+
+        if request.response["errorCode"] != 0:
+            raise AppWashApiError(
+                request.response["errorCode"], request.response["errorDescription"]
+            )
+
+        return request.response["data"]
+
+    def _load_service(self, service_id: str) -> dict:
+        """Loads the raw data of a service."""
+        request = ApiRequest(
+            self, endpoint=f"//connector/{service_id}", method=HTTP_METHOD.GET
         )
 
         if request.response["errorCode"] != 0:
@@ -90,7 +338,29 @@ class AppWash:
                 request.response["errorCode"], request.response["errorDescription"]
             )
 
-        return Location._from_result(request.response["data"])
+        return request.response["data"]
+
+    def _location_id(self, location_id: str = None) -> str:
+        """Returns the given location_id or the default one."""
+        # Use either location_id parameter or default location_id
+        if location_id == None and self.location_id == None:
+            raise ValueError(
+                "Either set a default location_id or pass a location_id to the method."
+            )
+        return location_id if location_id != None else self.location_id
+
+    def location(self, location_id: str = None) -> Location:
+        """Load your default or a specific location.
+
+        Attributes:
+            location_id (optional): The location_id of your house. Can be seen in the appwash URL. Uses the location_id of the Objekt if not specified.
+        """
+        location_id = self._location_id(location_id)
+
+        data, _ = self._cached(
+            ("location", location_id), lambda: self._load_location(location_id)
+        )
+        return self._location_class._from_result(data, self.price_catalog)
 
     def services(
         self, location_id: str = None, service_type: SERVICE_TYPE = None
@@ -99,69 +369,252 @@ class AppWash:
 
         Attributes:
             location_id (optional): The location_id of your house. Can be seen in the appwash URL. Uses the location_id of the Objekt if not specified.
+            service_type (optional): Only load services of this type.
         """
-        # Use either location_id parameter or default location_id
-        if location_id == None and self.location_id == None:
-            raise ValueError(
-                "Either set a default location_id or pass a location_id to the method."
-            )
-        location_id = location_id if location_id != None else self.location_id
+        location_id = self._location_id(location_id)
 
-        body = {"serviceType": service_type} if service_type != None else {}
+        data, observed_at = self._cached(
+            ("services", location_id, str(service_type)),
+            lambda: self._load_services(location_id, service_type),
+        )
+        services = [
+            self._service_class._from_result(self, service, observed_at)
+            for service in data
+        ]
+        self._record(services)
+        return services
 
-        request = ApiRequest(
+    def iter_services(
+        self, location_id: str = None, service_type: SERVICE_TYPE = None
+    ) -> Iterator[Service]:
+        """Load the services at your house one by one while the response is being received.
+
+        Unlike services(), the response is decoded incrementally, so the first services are available before the
+        whole response has arrived and memory doesn't grow with the size of the location. Bypasses the response cache.
+
+        Attributes:
+            location_id (optional): The location_id of your house. Can be seen in the appwash URL. Uses the location_id of the Objekt if not specified.
+            service_type (optional): Only load services of this type.
+        """
+        location_id = self._location_id(location_id)
+        body = {"serviceType": str(service_type)} if service_type != None else {}
+
+        request = StreamingApiRequest(
             self,
             endpoint=f"/location/{location_id}/connectorsv2",
             method=HTTP_METHOD.POST,
             body=body,
         )
 
+        # Release the connection even if the caller stops iterating early
+        try:
+            for service in request.iter_array("data"):
+                # errorCode precedes the data in the response, an error response contains no data
+                if request.response.get("errorCode", 0) != 0:
+                    break
+                service = self._service_class._from_result(self, service)
+                self._record([service])
+                yield service
+        finally:
+            request.close()
+
         if request.response["errorCode"] != 0:
             raise AppWashApiError(
                 request.response["errorCode"], request.response["errorDescription"]
             )
 
-        services = []
-        for service in request.response["data"]:
-            services.append(Service._from_result(self, service))
-
-        return services
-
     def service(self, service_id: str) -> Service:
         """Load a specific service by ID.
 
         Attributes:
             serivce_id: ID of the service"""
 
-        request = ApiRequest(
-            self, endpoint=f"//connector/{service_id}", method=HTTP_METHOD.GET
+        data, observed_at = self._cached(
+            ("service", service_id), lambda: self._load_service(service_id)
         )
+        service = self._service_class._from_result(self, data, observed_at)
+        self._record([service])
+        return service
+
+    def _record(self, services: list[Service]) -> None:
+        """Passes observed services to the history recorder, if there is one."""
+        if self.recorder != None:
+            self.recorder.record(services, self._server_timestamp())
+
+    def _map_locations(
+        self, load: Callable[[str], Any], location_ids: Iterable[str], max_workers: int
+    ) -> dict:
+        """Calls load for every location concurrently and maps each location_id to the result or the raised exception."""
+        location_ids = list(dict.fromkeys(location_ids))
+
+        def run(location_id: str):
+            try:
+                return load(location_id)
+            except Exception as error:
+                return error
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return dict(zip(location_ids, executor.map(run, location_ids)))
+
+    def locations_many(
+        self, location_ids: Iterable[str], max_workers: int = BATCH_MAX_WORKERS
+    ) -> dict[str, Union[Location, Exception]]:
+        """Load several locations concurrently.
 
-        if request.response["errorCode"] != 0:
-            raise AppWashApiError(
-                request.response["errorCode"], request.response["errorDescription"]
-            )
+        Attributes:
+            location_ids: IDs of the locations.
+            max_workers (optional): Maximum number of concurrent requests. Should not exceed the pool_maxsize of the client.
+
+        Returns:
+            Dict mapping each location_id to its Location, or to the exception raised while loading it.
+        """
+        return self._map_locations(self.location, location_ids, max_workers)
+
+    def services_many(
+        self,
+        location_ids: Iterable[str],
+        service_type: SERVICE_TYPE = None,
+        max_workers: int = BATCH_MAX_WORKERS,
+    ) -> dict[str, Union[list[Service], Exception]]:
+        """Load the services of several locations concurrently.
 
-        return Service._from_result(self, request.response["data"])
+        A failing location doesn't abort the batch, its exception is returned in place of its services.
 
-    def buy_service(self, service_id: str, safe: bool = True) -> bool:
+        Attributes:
+            location_ids: IDs of the locations.
+            service_type (optional): Only load services of this type.
+            max_workers (optional): Maximum number of concurrent requests. Should not exceed the pool_maxsize of the client.
+
+        Returns:
+            Dict mapping each location_id to its list of services, or to the exception raised while loading them.
+        """
+        return self._map_locations(
+            lambda location_id: self.services(location_id, service_type),
+            location_ids,
+            max_workers,
+        )
+
+    def find_available(
+        self,
+        location_ids: Iterable[str],
+        service_type: SERVICE_TYPE = None,
+        count: int = 1,
+        cheapest: bool = False,
+        max_workers: int = BATCH_MAX_WORKERS,
+    ) -> list[Service]:
+        """Find available services by querying several locations concurrently.
+
+        Returns as soon as count available services are found, queries that haven't started yet are cancelled.
+        Requests already on their way are finished in the background, their results are discarded.
+        Locations that fail to load are skipped, if all of them fail the error of the first one is raised.
+
+        Attributes:
+            location_ids: IDs of the locations.
+            service_type (optional): Only find services of this type.
+            count (optional): Number of available services to find.
+            cheapest (optional): Whether to return the count cheapest available services, sorted by cost_cents.
+                Waits for all locations instead of returning early.
+            max_workers (optional): Maximum number of concurrent requests. Should not exceed the pool_maxsize of the client.
+
+        Returns:
+            Up to count available services, in the order they were found or cheapest first.
+        """
+        location_ids = list(dict.fromkeys(location_ids))
+        found = []
+        errors = []
+
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+        try:
+            futures = [
+                executor.submit(self.services, location_id, service_type)
+                for location_id in location_ids
+            ]
+            for future in as_completed(futures):
+                try:
+                    services = future.result()
+                except Exception as error:
+                    errors.append(error)
+                    continue
+                found.extend(s for s in services if s.state == STATE.AVAILABLE)
+                if not cheapest and len(found) >= count:
+                    break
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        if errors and len(errors) == len(location_ids):
+            raise errors[0]
+        if cheapest:
+            found.sort(key=lambda service: service.cost_cents)
+        return found[:count]
+
+    def watch(
+        self,
+        location_ids: Iterable[str] = None,
+        service_type: SERVICE_TYPE = None,
+        interval: float = WATCH_INTERVAL,
+        emit_initial: bool = False,
+    ) -> ServiceWatcher:
+        """Watch the services of one or more locations for state changes.
+
+        Iterating the returned watcher polls every interval seconds and yields a ServiceStateChange
+        whenever a service changes its state. Call .poll() on it to poll once instead.
+
+        Attributes:
+            location_ids (optional): IDs of the locations to watch. Uses the default location_id if not specified.
+            service_type (optional): Only watch services of this type.
+            interval (optional): Seconds between two polls.
+            emit_initial (optional): Whether the first poll reports every service as a change from None.
+        """
+        if location_ids == None:
+            location_ids = [self._location_id()]
+        return ServiceWatcher(self, location_ids, service_type, interval, emit_initial)
+
+    def buy_queue(self, interval: float = WATCH_INTERVAL) -> "BuyQueue":
+        """Queue for buying the next available services at one or more locations.
+
+        submit() an intent per wanted service, then call .run() to poll every interval seconds until all
+        intents are bought, or .poll() to poll once. All intents of a location share one poll.
+
+        Attributes:
+            interval (optional): Seconds between two polls.
+        """
+        from appwashpy.client.buy_queue import BuyQueue
+
+        return BuyQueue(self, interval)
+
+    def buy_service(
+        self,
+        service_id: str,
+        safe: bool = True,
+        service: Union[Service, CompactService] = None,
+        max_state_age: float = None,
+    ) -> BuyResult:
         """Buy the service with the specified ID.
 
             Be careful, calling this function multiple times cancels the previous service and bill you again.
             No warranty for freedom from errors and no compensation for damages incurred.
 
+        In safe mode the state of the service is checked before buying it. A state observed within max_state_age seconds
+        is reused instead of loading the service again, taken from the passed service or from the cache of the client.
+
         Attributes:
             serivce_id: ID of the service
             safe: If the service should be bougth again if it's already running.
+            service (optional): The service as observed before, e.g. by services(). Used by Service.buy().
+            max_state_age (optional): Seconds an observed state is trusted. Defaults to the max_state_age of the client.
 
         Returns:
-            Whether the service was bought sucessfully.
+            BuyResult, truthy if the service was bought sucessfully, telling where the checked state came from.
         """
-
+        state, source, age = None, STATE_UNCHECKED, None
         if safe:
-            service = self.service(service_id)
-            if service.state in (STATE.SESSION_WAIT_ON.name, STATE.STOPPABLE.name):
-                return False
+            state, source, age = self._observed_state(
+                service_id,
+                service,
+                max_state_age if max_state_age != None else self.max_state_age,
+            )
+            if state in (STATE.SESSION_WAIT_ON.name, STATE.STOPPABLE.name):
+                return BuyResult(service_id, False, state, source, age)
 
         body = {"sourceChannel": "WEBSITE"}
         request = ApiRequest(
@@ -170,13 +623,43 @@ class AppWash:
             method=HTTP_METHOD.POST,
             body=body,
         )
+        if self.cache != None:
+            self.cache.invalidate_service(service_id)
 
         if request.response["errorCode"] != 0:
             raise AppWashApiError(
                 request.response["errorCode"], request.response["errorDescription"]
             )
 
-        return True
+        return BuyResult(service_id, True, state, source, age)
+
+    def _observed_state(
+        self,
+        service_id: str,
+        service: Union[Service, CompactService],
+        max_age: float,
+    ) -> tuple:
+        """The state of a service for the safe buy check, reusing a recent observation.
+
+        Returns:
+            Tuple of the state, where it came from and its age in seconds.
+        """
+        if service != None:
+            age = time.monotonic() - service.observed_at
+            if age <= max_age:
+                return service.state, STATE_FROM_SERVICE, age
+
+        if self.cache != None:
+            data, age = self.cache.lookup_service(service_id)
+            if data != None and age <= max_age:
+                return data["state"], STATE_FROM_CACHE, age
+
+        data = self._coalesced(
+            ("service", service_id), lambda: self._load_service(service_id)
+        )
+        if self.cache != None:
+            self.cache.set(("service", service_id), data)
+        return data["state"], STATE_FROM_NETWORK, 0.0
 
     def stop_service(self, service_id: str, safe: bool = True) -> None:
         """Stop the service with the specified ID.
@@ -192,6 +675,8 @@ class AppWash:
             method=HTTP_METHOD.POST,
             body=body,
         )
+        if self.cache != None:
+            self.cache.invalidate_service(service_id)
 
         if request.response["errorCode"] != 0:
             raise AppWashApiError(
@@ -0,0 +1,310 @@
+import asyncio
+import time
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+from appwashpy.client.async_requests import AsyncApiRequest
+from appwashpy.common.enums import HTTP_METHOD, SERVICE_TYPE, STATE
+from appwashpy.common.errors import AppWashApiError, WrongCredentialsError
+from appwashpy.common.helper import current_timestamp
+from appwashpy.common.settings import (
+    ASYNC_KEEPALIVE_TIMEOUT,
+    ASYNC_POOL_LIMIT,
+    ASYNC_POOL_LIMIT_PER_HOST,
+    BASE_URL,
+    BUY_MAX_STATE_AGE,
+)
+from appwashpy.core.location import Location
+from appwashpy.core.purchase import (
+    STATE_FROM_NETWORK,
+    STATE_FROM_SERVICE,
+    STATE_UNCHECKED,
+    BuyResult,
+)
+from appwashpy.core.service import Service
+
+
+class AsyncAppWash:
+    """Asynchronous entry point for the AppWashPy SDK.
+
+    Mirrors the methods of AppWash as coroutines, so one event loop can drive many concurrent requests.
+    All requests share one pooled aiohttp session, which is released by close() or by using the client as an async context manager.
+    Requires the optional dependency aiohttp (pip install appwashpy[async]).
+
+    Services returned by this client are bound to it, so service.buy() and service.stop() have to be awaited.
+
+    Attributes:
+        email: Email Adress of your AppWash Account.
+        password: Password of your AppWash Account.
+        location_id (optional): The location_id of your house.
+        base_url (optional): Base URL of the AppWash API.
+        limit (optional): Maximum number of simultaneous connections.
+        limit_per_host (optional): Maximum number of simultaneous connections per host.
+        keepalive_timeout (optional): Seconds an idle connection is kept alive.
+        max_state_age (optional): Seconds the state of a service is trusted by a safe buy_service() instead of loading it again.
+    """
+
+    email: str
+    password: str
+    location_id: str = None
+    base_url: str = BASE_URL
+
+    _token: str = None
+    _token_expiry: int = None
+    _token_lock: asyncio.Lock = None
+    _session: "aiohttp.ClientSession" = None
+
+    def __init__(
+        self,
+        email: str,
+        password: str,
+        location_id: str = None,
+        base_url: str = None,
+        limit: int = ASYNC_POOL_LIMIT,
+        limit_per_host: int = ASYNC_POOL_LIMIT_PER_HOST,
+        keepalive_timeout: float = ASYNC_KEEPALIVE_TIMEOUT,
+        max_state_age: float = BUY_MAX_STATE_AGE,
+    ):
+        if aiohttp == None:
+            raise ImportError(
+                "AsyncAppWash requires aiohttp. Install it via: pip install appwashpy[async]"
+            )
+
+        self.email = email
+        self.password = password
+
+        if location_id != None:
+            self.location_id = location_id
+        if base_url != None:
+            self.base_url = base_url
+
+        self._limit = limit
+        self._limit_per_host = limit_per_host
+        self._keepalive_timeout = keepalive_timeout
+        self.max_state_age = max_state_age
+
+    async def _get_session(self) -> "aiohttp.ClientSession":
+        """Returns the pooled session. It is created lazily, as it has to be bound to the running event loop."""
+        if self._session == None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self._limit,
+                limit_per_host=self._limit_per_host,
+                keepalive_timeout=self._keepalive_timeout,
+            )
+            self._session = aiohttp.ClientSession(connector=connector)
+        return self._session
+
+    async def close(self) -> None:
+        """Closes the pooled connections of the client."""
+        if self._session != None:
+            await self._session.close()
+
+    async def __aenter__(self) -> "AsyncAppWash":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def _authenticate(self) -> None:
+        """Loads a new authentication token for your Account."""
+        request = await AsyncApiRequest.send(
+            self,
+            endpoint="/login",
+            method=HTTP_METHOD.POST,
+            body={"email": self.email, "password": self.password},
+        )
+
+        error_code = request.response["errorCode"]
+        if error_code == 0:
+            self._token = request.response["login"]["token"]
+            self._token_expiry = request.response["token_expire_ts"]
+        elif error_code == 61:
+            raise WrongCredentialsError(
+                error_code,
+                request.response["errorDescription"],
+                self.email,
+                self.password,
+            )
+        else:
+            raise AppWashApiError(error_code, request.response["errorDescription"])
+
+    def _token_valid(self) -> bool:
+        return self._token != None and self._token_expiry > current_timestamp()
+
+    async def token(self) -> str:
+        """Returns the token. Automatically renews the token if the old one is expired.
+
+        Concurrent callers share a single login request.
+        """
+        if self._token_valid():
+            return self._token
+
+        if self._token_lock == None:
+            self._token_lock = asyncio.Lock()
+        async with self._token_lock:
+            # Another task may have renewed the token while this one was waiting
+            if not self._token_valid():
+                await self._authenticate()
+        return self._token
+
+    async def check_credentials(self) -> bool:
+        """Checks whether the credentials of the client are valid."""
+        try:
+            await self._authenticate()
+        except WrongCredentialsError:
+            return False
+        return True
+
+    async def location(self, location_id: str = None) -> Location:
+        """Load your default or a specific location.
+
+        Attributes:
+            location_id (optional): The location_id of your house. Uses the location_id of the Objekt if not specified.
+        """
+
+        # Use either location_id parameter or default location_id
+        if location_id == None and self.location_id == None:
+            raise ValueError(
+                "Either set a default location_id or pass a location_id to the method."
+            )
+        location_id = location_id if location_id != None else self.location_id
+
+        request = await AsyncApiRequest.send(
+            self, endpoint=f"/locations/split/{location_id}", method=HTTP_METHOD.GET
+        )
+
+        if request.response["errorCode"] != 0:
+            raise AppWashApiError(
+                request.response["errorCode"], request.response["errorDescription"]
+            )
+
+        return Location._from_result(request.response["data"])
+
+    async def services(
+        self, location_id: str = None, service_type: SERVICE_TYPE = None
+    ) -> list[Service]:
+        """Load the available services at your house.
+
+        Attributes:
+            location_id (optional): The location_id of your house. Uses the location_id of the Objekt if not specified.
+            service_type (optional): Only load services of this type.
+        """
+        # Use either location_id parameter or default location_id
+        if location_id == None and self.location_id == None:
+            raise ValueError(
+                "Either set a default location_id or pass a location_id to the method."
+            )
+        location_id = location_id if location_id != None else self.location_id
+
+        body = {"serviceType": str(service_type)} if service_type != None else {}
+
+        request = await AsyncApiRequest.send(
+            self,
+            endpoint=f"/location/{location_id}/connectorsv2",
+            method=HTTP_METHOD.POST,
+            body=body,
+        )
+
+        if request.response["errorCode"] != 0:
+            raise AppWashApiError(
+                request.response["errorCode"], request.response["errorDescription"]
+            )
+
+        return [
+            Service._from_result(self, service) for service in request.response["data"]
+        ]
+
+    async def service(self, service_id: str) -> Service:
+        """Load a specific service by ID.
+
+        Attributes:
+            serivce_id: ID of the service"""
+
+        request = await AsyncApiRequest.send(
+            self, endpoint=f"//connector/{service_id}", method=HTTP_METHOD.GET
+        )
+
+        if request.response["errorCode"] != 0:
+            raise AppWashApiError(
+                request.response["errorCode"], request.response["errorDescription"]
+            )
+
+        return Service._from_result(self, request.response["data"])
+
+    async def buy_service(
+        self,
+        service_id: str,
+        safe: bool = True,
+        service: Service = None,
+        max_state_age: float = None,
+    ) -> BuyResult:
+        """Buy the service with the specified ID.
+
+            Be careful, calling this function multiple times cancels the previous service and bill you again.
+            No warranty for freedom from errors and no compensation for damages incurred.
+
+        In safe mode the state of the service is checked before buying it. The state of the passed service is reused
+        if it was observed within max_state_age seconds, otherwise the service is loaded again.
+
+        Attributes:
+            serivce_id: ID of the service
+            safe: If the service should be bougth again if it's already running.
+            service (optional): The service as observed before, e.g. by services(). Used by Service.buy().
+            max_state_age (optional): Seconds an observed state is trusted. Defaults to the max_state_age of the client.
+
+        Returns:
+            BuyResult, truthy if the service was bought sucessfully, telling where the checked state came from.
+        """
+        state, source, age = None, STATE_UNCHECKED, None
+        if safe:
+            if max_state_age == None:
+                max_state_age = self.max_state_age
+            if (
+                service != None
+                and time.monotonic() - service.observed_at <= max_state_age
+            ):
+                state, source = service.state, STATE_FROM_SERVICE
+                age = time.monotonic() - service.observed_at
+            else:
+                state = (await self.service(service_id)).state
+                source, age = STATE_FROM_NETWORK, 0.0
+            if state in (STATE.SESSION_WAIT_ON.name, STATE.STOPPABLE.name):
+                return BuyResult(service_id, False, state, source, age)
+
+        body = {"sourceChannel": "WEBSITE"}
+        request = await AsyncApiRequest.send(
+            self,
+            endpoint=f"/connector/{service_id}/start",
+            method=HTTP_METHOD.POST,
+            body=body,
+        )
+
+        if request.response["errorCode"] != 0:
+            raise AppWashApiError(
+                request.response["errorCode"], request.response["errorDescription"]
+            )
+
+        return BuyResult(service_id, True, state, source, age)
+
+    async def stop_service(self, service_id: str, safe: bool = True) -> None:
+        """Stop the service with the specified ID.
+
+        Attributes:
+            serivce_id: ID of the service
+        """
+
+        body = {"sourceChannel": "WEBSITE"}
+        request = await AsyncApiRequest.send(
+            self,
+            endpoint=f"/connector/{service_id}/stop",
+            method=HTTP_METHOD.POST,
+            body=body,
+        )
+
+        if request.response["errorCode"] != 0:
+            raise AppWashApiError(
+                request.response["errorCode"], request.response["errorDescription"]
+            )
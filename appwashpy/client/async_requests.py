@@ -0,0 +1,74 @@
+from typing import TYPE_CHECKING
+
+from appwashpy.common.enums import HTTP_METHOD
+
+# Fix cyclical import because of type annotation
+if TYPE_CHECKING:
+    from appwashpy.client.async_appwash import AsyncAppWash
+
+
+class AsyncApiRequest:
+    """Asynchronous counterpart of ApiRequest.
+
+    Use the awaitable AsyncApiRequest.send() to create and perform a request.
+    """
+
+    method: HTTP_METHOD = HTTP_METHOD.GET
+    url: str
+    params: dict
+    body: dict
+    headers: dict = {
+        "platform": "appWash",
+        "language": "EN",
+        "Accept": "application/json",
+    }
+    _response: dict
+
+    def __init__(
+        self,
+        client: "AsyncAppWash",
+        endpoint: str,
+        method: HTTP_METHOD = HTTP_METHOD.GET,
+        body: dict = None,
+        params: dict = None,
+    ):
+        self._client = client
+        self.endpoint = endpoint
+        self.headers = dict(self.headers)
+        self.method = str(method)
+        self.body = body
+        self.url = client.base_url + endpoint
+        self.params = params
+
+    @classmethod
+    async def send(
+        cls,
+        client: "AsyncAppWash",
+        endpoint: str,
+        method: HTTP_METHOD = HTTP_METHOD.GET,
+        body: dict = None,
+        params: dict = None,
+    ) -> "AsyncApiRequest":
+        request = cls(client, endpoint, method, body, params)
+
+        if endpoint != "/login":
+            request.headers["token"] = await client.token()
+
+        await request._perform_request()
+        return request
+
+    async def _perform_request(self) -> None:
+        session = await self._client._get_session()
+        async with session.request(
+            self.method,
+            self.url,
+            params=self.params,
+            json=self.body,
+            headers=self.headers,
+        ) as response:
+            # The API does not always send an application/json content type
+            self._response = await response.json(content_type=None)
+
+    @property
+    def response(self) -> dict:
+        return self._response
@@ -0,0 +1,180 @@
+import itertools
+import threading
+import time
+from typing import TYPE_CHECKING, Callable
+
+from appwashpy.common.enums import SERVICE_TYPE, STATE
+from appwashpy.common.errors import AppWashApiError, CircuitOpenError
+from appwashpy.common.settings import BATCH_MAX_WORKERS, WATCH_INTERVAL
+from appwashpy.core.intent import (
+    INTENT_BOUGHT,
+    INTENT_CANCELLED,
+    INTENT_UNKNOWN,
+    BuyIntent,
+)
+
+# Fix cyclical import because of type annotation
+if TYPE_CHECKING:
+    from appwashpy.client.appwash import AppWash
+
+
+class BuyQueue:
+    """Holds pending buy intents and starts matching services as soon as they become available.
+
+    Every poll loads the services of each location with pending intents once, shared by all intents targeting it.
+    Intents are served first come first served per location. A service is assigned to one intent at most and is
+    not offered again until a poll has seen it leave AVAILABLE, so no service is booked twice.
+    An intent whose purchase clearly failed stays pending. If it isn't known whether the service was started,
+    e.g. after a timeout, the intent is finished with status "unknown" instead of risking a second purchase.
+
+    Attributes:
+        client: The AppWash client used for polling and buying.
+        interval (optional): Seconds between two polls.
+        max_workers (optional): Maximum number of locations polled concurrently.
+        sleep (optional): Function used to wait between polls.
+        polls: Number of polls so far.
+    """
+
+    def __init__(
+        self,
+        client: "AppWash",
+        interval: float = WATCH_INTERVAL,
+        max_workers: int = BATCH_MAX_WORKERS,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.client = client
+        self.interval = interval
+        self.max_workers = max_workers
+        self.sleep = sleep
+        self.polls = 0
+
+        self._intents = {}
+        self._booked = set()
+        self._counter = itertools.count(1)
+        self._lock = threading.Lock()
+        self._poll_lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """Number of pending intents."""
+        with self._lock:
+            return len(self._intents)
+
+    def submit(self, location_id: str, service_type: SERVICE_TYPE = None) -> BuyIntent:
+        """Queues the wish to buy the next available service of service_type at the location."""
+        with self._lock:
+            intent = BuyIntent(next(self._counter), location_id, service_type)
+            self._intents[intent.intent_id] = intent
+        return intent
+
+    def cancel(self, intent: BuyIntent) -> bool:
+        """Removes a pending intent. Returns False if it is being bought or was bought already."""
+        with self._lock:
+            if self._intents.pop(intent.intent_id, None) == None:
+                return intent.status == INTENT_CANCELLED
+            intent._finish(INTENT_CANCELLED)
+            return True
+
+    def poll(self) -> list[BuyIntent]:
+        """Polls the locations of the pending intents once and buys available services for them.
+
+        Locations that fail to load are skipped, their intents stay pending.
+
+        Returns:
+            The intents bought in this poll.
+        """
+        # Only one poll at a time, so a service can't be assigned by two polls
+        with self._poll_lock:
+            with self._lock:
+                by_location = {}
+                for intent in sorted(self._intents.values(), key=lambda i: i.intent_id):
+                    by_location.setdefault(intent.location_id, []).append(intent)
+
+            results = self.client._map_locations(
+                lambda location_id: self.client._coalesced(
+                    ("services", location_id, "None"),
+                    lambda: self.client._load_services(location_id),
+                ),
+                by_location,
+                self.max_workers,
+            )
+            self.polls += 1
+
+            bought = []
+            for location_id, payloads in results.items():
+                if isinstance(payloads, Exception):
+                    continue
+                bought += self._dispatch(by_location[location_id], payloads)
+            return bought
+
+    def _dispatch(
+        self, intents: list[BuyIntent], payloads: list[dict]
+    ) -> list[BuyIntent]:
+        """Assigns the available services of a location to its intents in order and buys them."""
+        available = []
+        for payload in payloads:
+            service_id = payload["externalId"]
+            if payload["state"] != STATE.AVAILABLE.name:
+                # The service has been taken, it can be offered again once it is free
+                self._booked.discard(service_id)
+            elif service_id not in self._booked:
+                available.append(payload)
+
+        bought = []
+        for intent in intents:
+            for payload in available:
+                if intent.service_type == None or payload["serviceType"] == str(
+                    intent.service_type
+                ):
+                    break
+            else:
+                continue
+            available.remove(payload)
+            if self._buy(intent, payload):
+                bought.append(intent)
+        return bought
+
+    def _buy(self, intent: BuyIntent, payload: dict) -> bool:
+        """Buys the service for the intent.
+
+        The intent stays pending if the service wasn't started: the safe check refused it, the API answered
+        with an error or the request wasn't sent because the circuit breaker is open. Any other error leaves
+        the outcome unknown, the intent is finished with INTENT_UNKNOWN and the service stays booked.
+        """
+        with self._lock:
+            # Claim the intent, so it can't be cancelled while its service is being started
+            if self._intents.pop(intent.intent_id, None) == None:
+                return False
+
+        service_id = payload["externalId"]
+        service = self.client._service_class._from_result(self.client, payload)
+        self._booked.add(service_id)
+        intent.attempts += 1
+        try:
+            result = self.client.buy_service(service_id, service=service)
+        except (AppWashApiError, CircuitOpenError) as error:
+            intent.error = error
+            result = None
+        except Exception as error:
+            intent.error = error
+            with self._lock:
+                intent.service_id = service_id
+                intent._finish(INTENT_UNKNOWN)
+            return False
+
+        with self._lock:
+            if not result:
+                # Not started, the service may be offered again
+                self._booked.discard(service_id)
+                self._intents[intent.intent_id] = intent
+                return False
+            intent.service_id = service_id
+            intent.result = result
+            intent._finish(INTENT_BOUGHT)
+        return True
+
+    def run(self) -> None:
+        """Polls every interval until no intent is pending."""
+        while len(self):
+            self.poll()
+            if len(self):
+                self.sleep(self.interval)
@@ -0,0 +1,212 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable
+
+from appwashpy.common.settings import (
+    CACHE_LOCATION_TTL,
+    CACHE_MAXSIZE,
+    CACHE_SERVICE_TTL,
+    CACHE_SERVICES_TTL,
+)
+
+
+class ResponseCache:
+    """Thread-safe LRU cache for API results with a separate TTL per endpoint.
+
+    Keys are tuples whose first item names the endpoint: ("location", location_id),
+    ("services", location_id, service_type) or ("service", service_id).
+    Once maxsize entries are stored, the least recently used one is evicted.
+
+    Attributes:
+        location_ttl (optional): Seconds a location is cached.
+        services_ttl (optional): Seconds the services of a location are cached.
+        service_ttl (optional): Seconds a single service is cached.
+        maxsize (optional): Maximum number of cached entries.
+        hits: Number of cache hits per endpoint.
+        misses: Number of cache misses per endpoint.
+    """
+
+    def __init__(
+        self,
+        location_ttl: float = CACHE_LOCATION_TTL,
+        services_ttl: float = CACHE_SERVICES_TTL,
+        service_ttl: float = CACHE_SERVICE_TTL,
+        maxsize: int = CACHE_MAXSIZE,
+    ):
+        self.ttls = {
+            "location": location_ttl,
+            "services": services_ttl,
+            "service": service_ttl,
+        }
+        self.maxsize = maxsize
+        self.hits = dict.fromkeys(self.ttls, 0)
+        self.misses = dict.fromkeys(self.ttls, 0)
+
+        self._entries = OrderedDict()
+        # Keys of the location and services entries of every location
+        self._location_keys = {}
+        # Locations of the cached services and the reverse index, kept only while something of them is cached
+        self._service_locations = {}
+        self._location_services = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: tuple) -> Any:
+        """Returns the cached value or None if it is missing or expired."""
+        return self._get(key)[0]
+
+    def _get(self, key: tuple) -> tuple:
+        """Returns the cached value and the monotonic time it was cached at, (None, None) if it is missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry != None and entry[0] > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits[key[0]] += 1
+                return entry[1], entry[0] - self.ttls[key[0]]
+
+            if entry != None:
+                self._remove(key)
+            self.misses[key[0]] += 1
+            return None, None
+
+    def set(self, key: tuple, value: Any) -> None:
+        """Caches the value with the TTL of its endpoint.
+
+        The locations of the services in a services list or a single service are remembered while they are cached,
+        so lookup_service() and invalidate_service() find everything cached for the location of a service.
+        """
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttls[key[0]], value)
+            self._entries.move_to_end(key)
+            if key[0] == "service":
+                if isinstance(value, dict) and "locationId" in value:
+                    self._remember(key[1], value["locationId"])
+            else:
+                self._location_keys.setdefault(key[1], set()).add(key)
+                if key[0] == "services" and isinstance(value, list):
+                    for data in value:
+                        self._remember(data["externalId"], key[1])
+
+            while len(self._entries) > self.maxsize:
+                self._remove(next(iter(self._entries)))
+
+    def _remember(self, service_id: str, location_id: str) -> None:
+        previous = self._service_locations.get(service_id)
+        if previous != None and previous != location_id:
+            self._forget(service_id)
+        self._service_locations[service_id] = location_id
+        self._location_services.setdefault(location_id, set()).add(service_id)
+
+    def _forget(self, service_id: str) -> None:
+        location_id = self._service_locations.pop(service_id)
+        services = self._location_services[location_id]
+        services.discard(service_id)
+        if not services:
+            del self._location_services[location_id]
+
+    def _remove(self, key: tuple) -> None:
+        """Removes an entry and forgets the locations of services nothing cached refers to anymore.
+
+        Must be called with the lock held.
+        """
+        del self._entries[key]
+        if key[0] == "service":
+            location_id = self._service_locations.get(key[1])
+            if location_id != None and location_id not in self._location_keys:
+                self._forget(key[1])
+            return
+
+        location_id = key[1]
+        keys = self._location_keys[location_id]
+        keys.discard(key)
+        if keys:
+            return
+        del self._location_keys[location_id]
+        for service_id in list(self._location_services.get(location_id, ())):
+            if ("service", service_id) not in self._entries:
+                self._forget(service_id)
+
+    def get_or_load(self, key: tuple, load: Callable[[], Any]) -> Any:
+        """Returns the cached value or loads, caches and returns it."""
+        return self.get_or_load_timed(key, load)[0]
+
+    def get_or_load_timed(self, key: tuple, load: Callable[[], Any]) -> tuple:
+        """Like get_or_load(), but also returns the monotonic time the value was loaded at."""
+        value, loaded_at = self._get(key)
+        if value == None:
+            value = load()
+            loaded_at = time.monotonic()
+            self.set(key, value)
+        return value, loaded_at
+
+    def lookup_service(self, service_id: str) -> tuple:
+        """Finds an unexpired result of a service, either cached on its own or in a service list of its location.
+
+        Doesn't count as hit or miss.
+
+        Returns:
+            Tuple of the raw service data and the seconds since it was cached, (None, None) if it isn't cached.
+        """
+        now = time.monotonic()
+        with self._lock:
+            candidates = [("service", service_id)]
+            location_id = self._service_locations.get(service_id)
+            if location_id != None:
+                candidates += [
+                    key
+                    for key in self._location_keys.get(location_id, ())
+                    if key[0] == "services"
+                ]
+
+            best = (None, None)
+            for key in candidates:
+                entry = self._entries.get(key)
+                if entry == None:
+                    continue
+                if entry[0] <= now:
+                    self._remove(key)
+                    continue
+                age = now - (entry[0] - self.ttls[key[0]])
+                if best[1] != None and best[1] <= age:
+                    continue
+                if key[0] == "service":
+                    best = (entry[1], age)
+                else:
+                    for data in entry[1]:
+                        if data["externalId"] == service_id:
+                            best = (data, age)
+                            break
+            return best
+
+    def invalidate_location(self, location_id: str) -> None:
+        """Removes the location and all service lists of it."""
+        with self._lock:
+            self._invalidate_location(location_id)
+
+    def _invalidate_location(self, location_id: str) -> None:
+        for key in list(self._location_keys.get(location_id, ())):
+            self._remove(key)
+
+    def invalidate_service(self, service_id: str) -> None:
+        """Removes the service and, if known, everything cached for its location."""
+        with self._lock:
+            location_id = self._service_locations.get(service_id)
+            if ("service", service_id) in self._entries:
+                self._remove(("service", service_id))
+            if location_id != None:
+                self._invalidate_location(location_id)
+
+    def clear(self) -> None:
+        """Removes all entries."""
+        with self._lock:
+            self._entries.clear()
+            self._location_keys.clear()
+            self._service_locations.clear()
+            self._location_services.clear()
+
+    def stats(self) -> dict:
+        """Returns the hit and miss counters per endpoint and the number of cached entries."""
+        return {"hits": dict(self.hits), "misses": dict(self.misses), "size": len(self)}
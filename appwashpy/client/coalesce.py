@@ -0,0 +1,59 @@
+import threading
+from typing import Any, Callable, Hashable
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Coalesces concurrent identical calls into one.
+
+    While a call for a key is in flight, further calls for the same key wait for it and receive its result
+    or exception instead of executing again.
+
+    Attributes:
+        executed: Number of calls that were executed.
+        coalesced: Number of calls that shared the result of an executed call.
+    """
+
+    def __init__(self):
+        self.executed = 0
+        self.coalesced = 0
+
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: Hashable, function: Callable[[], Any]) -> Any:
+        """Returns the result of function(), shared with all concurrent calls for the same key."""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call == None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.executed += 1
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error != None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = function()
+            return call.result
+        except BaseException as error:
+            call.error = error
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def stats(self) -> dict:
+        return {"executed": self.executed, "coalesced": self.coalesced}
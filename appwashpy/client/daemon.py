@@ -0,0 +1,103 @@
+import json
+import os
+import socket
+import socketserver
+from typing import Callable, Iterable, Iterator
+
+from appwashpy.common.serialization import dumps, loads
+from appwashpy.common.settings import DAEMON_SOCKET_PATH
+
+
+class _DaemonHandler(socketserver.StreamRequestHandler):
+    """Reads one JSON request line and writes one JSON line per message of the response."""
+
+    def handle(self):
+        line = self.rfile.readline()
+        # Connections without a request only check whether the daemon is running
+        if not line.strip():
+            return
+        try:
+            for result in self.server.handle(loads(line)):
+                self._send({"result": result})
+        except (BrokenPipeError, ConnectionResetError):
+            # The caller went away, e.g. a watch was interrupted
+            pass
+        except Exception as error:
+            self._send({"error": error})
+
+    def _send(self, message: dict) -> None:
+        self.wfile.write(dumps(message).encode() + b"\n")
+        self.wfile.flush()
+
+
+class AppWashDaemon(socketserver.ThreadingUnixStreamServer):
+    """Serves requests over a local Unix socket, so short-lived processes can share one warm client.
+
+    Every connection sends a single JSON request line. The daemon answers with one JSON line
+    {"result": ...} per result handle yields, or {"error": {"type": ..., "message": ...}} if it raised,
+    and closes the connection. The socket is only accessible by the current user.
+
+    Attributes:
+        handle: Callable taking a request dict and returning an iterable of JSON-encodable results.
+        path (optional): Path of the Unix socket.
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        handle: Callable[[dict], Iterable],
+        path: str = DAEMON_SOCKET_PATH,
+    ):
+        self.handle = handle
+        self.path = path
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        if os.path.exists(path):
+            try:
+                connect(path).close()
+            except OSError:
+                # Left behind by a daemon that didn't shut down cleanly
+                os.unlink(path)
+            else:
+                raise OSError(f"Another daemon is already listening on {path}")
+
+        umask = os.umask(0o177)
+        try:
+            super().__init__(path, _DaemonHandler)
+        finally:
+            os.umask(umask)
+
+    def server_close(self) -> None:
+        super().server_close()
+        try:
+            os.unlink(self.path)
+        except FileNotFoundError:
+            pass
+
+
+def connect(path: str = DAEMON_SOCKET_PATH, timeout: float = None) -> socket.socket:
+    """Connects to a running daemon.
+
+    Raises an OSError like FileNotFoundError or ConnectionRefusedError if no daemon is listening on path.
+    """
+    connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    connection.settimeout(timeout)
+    try:
+        connection.connect(path)
+    except OSError:
+        connection.close()
+        raise
+    return connection
+
+
+def send_request(connection: socket.socket, request: dict) -> Iterator[dict]:
+    """Sends a request over a connection returned by connect() and yields the messages of the response.
+
+    Every message is a dict with either a "result" or an "error" key. The connection is closed afterwards.
+    """
+    with connection:
+        connection.sendall(json.dumps(request).encode() + b"\n")
+        with connection.makefile("rb") as stream:
+            for line in stream:
+                yield loads(line)
@@ -0,0 +1,195 @@
+import os
+import sqlite3
+import threading
+import time
+from typing import TYPE_CHECKING, Callable, Iterable, Union
+
+from appwashpy.common.settings import (
+    HISTORY_BATCH_SIZE,
+    HISTORY_FLUSH_INTERVAL,
+    HISTORY_PATH,
+)
+
+# Fix cyclical import because of type annotation
+if TYPE_CHECKING:
+    from appwashpy.core.compact import CompactService
+    from appwashpy.core.service import Service
+
+# Columns of a recorded transition, in the order they are returned by transitions()
+COLUMNS = (
+    "service_id",
+    "location_id",
+    "service_type",
+    "state",
+    "session_start",
+    "observed_at",
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS transitions (
+    service_id TEXT NOT NULL,
+    location_id TEXT NOT NULL,
+    service_type TEXT NOT NULL,
+    state TEXT NOT NULL,
+    session_start INTEGER,
+    observed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS transitions_location_time ON transitions (location_id, observed_at);
+CREATE INDEX IF NOT EXISTS transitions_service_time ON transitions (service_id, observed_at);
+"""
+
+
+class HistoryRecorder:
+    """Records the state transitions of observed services in a local SQLite database.
+
+    A service is only written when its state or session_start differ from its last recorded observation.
+    Transitions are buffered and written in one transaction once batch_size of them are pending or flush_interval
+    seconds have passed since the last write, checked whenever services are recorded. close() writes the rest.
+
+    Attributes:
+        path (optional): Path of the database file. ":memory:" keeps the history in memory.
+        batch_size (optional): Number of pending transitions that are written at once.
+        flush_interval (optional): Maximum seconds a transition is held back.
+        clock (optional): Returns the timestamp of an observation if none is passed to record().
+        recorded: Number of transitions recorded so far.
+    """
+
+    def __init__(
+        self,
+        path: str = HISTORY_PATH,
+        batch_size: int = HISTORY_BATCH_SIZE,
+        flush_interval: float = HISTORY_FLUSH_INTERVAL,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.clock = clock
+        self.recorded = 0
+
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.executescript(SCHEMA)
+        self._lock = threading.Lock()
+        self._pending = []
+        self._flushed = time.monotonic()
+        self._last = self._load_last()
+
+    def _load_last(self) -> dict:
+        """Last recorded state and session_start of every service, to continue a previous history."""
+        rows = self._connection.execute(
+            "SELECT service_id, state, session_start, MAX(observed_at) FROM transitions GROUP BY service_id"
+        )
+        return {
+            service_id: (state, session_start)
+            for service_id, state, session_start, _ in rows
+        }
+
+    def record(
+        self,
+        services: Iterable[Union["Service", "CompactService"]],
+        observed_at: float = None,
+    ) -> int:
+        """Records the services whose state changed since they were last observed.
+
+        Attributes:
+            services: The observed services.
+            observed_at (optional): Timestamp of the observation. Defaults to the current time of clock.
+
+        Returns:
+            Number of recorded transitions.
+        """
+        if observed_at == None:
+            observed_at = self.clock()
+
+        with self._lock:
+            count = 0
+            for service in services:
+                state = str(service.state)
+                current = (state, service.session_start)
+                if self._last.get(service.service_id) == current:
+                    continue
+                self._last[service.service_id] = current
+                self._pending.append(
+                    (
+                        service.service_id,
+                        service.location_id,
+                        str(service.type),
+                        state,
+                        service.session_start,
+                        observed_at,
+                    )
+                )
+                count += 1
+            self.recorded += count
+
+            if (
+                len(self._pending) >= self.batch_size
+                or time.monotonic() - self._flushed >= self.flush_interval
+            ):
+                self._flush()
+        return count
+
+    def _flush(self) -> None:
+        if self._pending:
+            with self._connection:
+                self._connection.executemany(
+                    "INSERT INTO transitions VALUES (?, ?, ?, ?, ?, ?)", self._pending
+                )
+            self._pending = []
+        self._flushed = time.monotonic()
+
+    def flush(self) -> None:
+        """Writes all pending transitions."""
+        with self._lock:
+            self._flush()
+
+    def transitions(
+        self,
+        location_id: str = None,
+        service_id: str = None,
+        since: float = None,
+        until: float = None,
+    ) -> list[tuple]:
+        """Recorded transitions ordered by time, pending ones included.
+
+        Attributes:
+            location_id (optional): Only transitions of services at this location.
+            service_id (optional): Only transitions of this service.
+            since (optional): Only transitions observed at or after this timestamp.
+            until (optional): Only transitions observed before this timestamp.
+
+        Returns:
+            List of tuples with the values of COLUMNS.
+        """
+        conditions, parameters = [], []
+        for column, operator, value in (
+            ("location_id", "=", location_id),
+            ("service_id", "=", service_id),
+            ("observed_at", ">=", since),
+            ("observed_at", "<", until),
+        ):
+            if value != None:
+                conditions.append(f"{column} {operator} ?")
+                parameters.append(value)
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+
+        with self._lock:
+            self._flush()
+            return self._connection.execute(
+                f"SELECT {', '.join(COLUMNS)} FROM transitions{where} ORDER BY observed_at",
+                parameters,
+            ).fetchall()
+
+    def close(self) -> None:
+        """Writes the pending transitions and closes the database."""
+        with self._lock:
+            self._flush()
+            self._connection.close()
+
+    def __enter__(self) -> "HistoryRecorder":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
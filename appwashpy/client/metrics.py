@@ -0,0 +1,165 @@
+import bisect
+import threading
+from typing import TYPE_CHECKING, Callable
+
+from appwashpy.common.settings import METRICS_LATENCY_BUCKETS
+
+# Fix cyclical import because of type annotation
+if TYPE_CHECKING:
+    from appwashpy.client.requests import ApiRequest
+
+
+class _EndpointMetrics:
+    def __init__(self, buckets: tuple):
+        self.requests = 0
+        self.latency_sum = 0.0
+        self.latency_buckets = [0] * (len(buckets) + 1)
+        self.response_bytes = 0
+        self.status_codes = {}
+        self.error_codes = {}
+        self.exceptions = {}
+
+    def to_dict(self, buckets: tuple) -> dict:
+        return {
+            "requests": self.requests,
+            "latency_sum": self.latency_sum,
+            "latency_buckets": dict(
+                zip([str(b) for b in buckets] + ["+Inf"], self.latency_buckets)
+            ),
+            "response_bytes": self.response_bytes,
+            "status_codes": dict(self.status_codes),
+            "error_codes": dict(self.error_codes),
+            "exceptions": dict(self.exceptions),
+        }
+
+
+class Metrics:
+    """Records latency, status codes, AppWash error codes and response sizes per endpoint.
+
+    Every attempt of a request is recorded, so a retried request counts once per attempt.
+    Hooks are called before and after every attempt: before_request(request) and after_request(request, seconds, error),
+    where error is the exception of a failed attempt or None.
+
+    Attributes:
+        buckets (optional): Upper bounds of the latency histogram in seconds.
+    """
+
+    def __init__(self, buckets: tuple = METRICS_LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.before_request_hooks = []
+        self.after_request_hooks = []
+
+        self._endpoints = {}
+        self._lock = threading.Lock()
+
+    def add_hooks(
+        self,
+        before_request: Callable[["ApiRequest"], None] = None,
+        after_request: Callable[["ApiRequest", float, Exception], None] = None,
+    ) -> None:
+        """Registers hooks called before and after every attempt of a request."""
+        if before_request != None:
+            self.before_request_hooks.append(before_request)
+        if after_request != None:
+            self.after_request_hooks.append(after_request)
+
+    def before_request(self, request: "ApiRequest") -> None:
+        for hook in self.before_request_hooks:
+            hook(request)
+
+    def after_request(
+        self, request: "ApiRequest", seconds: float, error: Exception = None
+    ) -> None:
+        """Records an attempt of the request and calls the after_request hooks."""
+        endpoint = str(request.endpoint_type)
+        status_code = request.status_code
+        response_bytes = request.response_bytes
+        error_code = (
+            request._response.get("errorCode")
+            if error == None and getattr(request, "_response", None) != None
+            else None
+        )
+
+        with self._lock:
+            metrics = self._endpoints.get(endpoint)
+            if metrics == None:
+                metrics = self._endpoints[endpoint] = _EndpointMetrics(self.buckets)
+            metrics.requests += 1
+            metrics.latency_sum += seconds
+            metrics.latency_buckets[bisect.bisect_left(self.buckets, seconds)] += 1
+            if response_bytes != None:
+                metrics.response_bytes += response_bytes
+            if status_code != None:
+                metrics.status_codes[status_code] = (
+                    metrics.status_codes.get(status_code, 0) + 1
+                )
+            if error_code != None:
+                metrics.error_codes[error_code] = (
+                    metrics.error_codes.get(error_code, 0) + 1
+                )
+            if error != None:
+                name = type(error).__name__
+                metrics.exceptions[name] = metrics.exceptions.get(name, 0) + 1
+
+        for hook in self.after_request_hooks:
+            hook(request, seconds, error)
+
+    def to_dict(self) -> dict:
+        """Returns the metrics per endpoint as dict."""
+        with self._lock:
+            return {
+                endpoint: metrics.to_dict(self.buckets)
+                for endpoint, metrics in self._endpoints.items()
+            }
+
+    def to_prometheus(self, prefix: str = "appwash") -> str:
+        """Returns the metrics in the Prometheus text exposition format, the samples of each metric after its type."""
+        families = {
+            f"{prefix}_request_duration_seconds": ("histogram", []),
+            f"{prefix}_response_bytes_total": ("counter", []),
+            f"{prefix}_responses_total": ("counter", []),
+            f"{prefix}_api_errors_total": ("counter", []),
+            f"{prefix}_request_exceptions_total": ("counter", []),
+        }
+        durations = families[f"{prefix}_request_duration_seconds"][1]
+        response_bytes = families[f"{prefix}_response_bytes_total"][1]
+        responses = families[f"{prefix}_responses_total"][1]
+        api_errors = families[f"{prefix}_api_errors_total"][1]
+        exceptions = families[f"{prefix}_request_exceptions_total"][1]
+
+        for endpoint, metrics in self.to_dict().items():
+            label = f'endpoint="{endpoint}"'
+            cumulative = 0
+            for bound, count in metrics["latency_buckets"].items():
+                cumulative += count
+                durations.append(
+                    f'{prefix}_request_duration_seconds_bucket{{{label},le="{bound}"}} {cumulative}'
+                )
+            durations.append(
+                f"{prefix}_request_duration_seconds_sum{{{label}}} {metrics['latency_sum']}"
+            )
+            durations.append(
+                f"{prefix}_request_duration_seconds_count{{{label}}} {metrics['requests']}"
+            )
+            response_bytes.append(
+                f"{prefix}_response_bytes_total{{{label}}} {metrics['response_bytes']}"
+            )
+            for status_code, count in metrics["status_codes"].items():
+                responses.append(
+                    f'{prefix}_responses_total{{{label},status="{status_code}"}} {count}'
+                )
+            for error_code, count in metrics["error_codes"].items():
+                api_errors.append(
+                    f'{prefix}_api_errors_total{{{label},error_code="{error_code}"}} {count}'
+                )
+            for name, count in metrics["exceptions"].items():
+                exceptions.append(
+                    f'{prefix}_request_exceptions_total{{{label},exception="{name}"}} {count}'
+                )
+
+        # Samples of a metric must directly follow its TYPE line
+        lines = []
+        for name, (metric_type, samples) in families.items():
+            lines.append(f"# TYPE {name} {metric_type}")
+            lines.extend(samples)
+        return "\n".join(lines) + "\n"
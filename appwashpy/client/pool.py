@@ -0,0 +1,251 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, Union
+
+from requests.adapters import HTTPAdapter
+
+from appwashpy.client.appwash import AppWash
+from appwashpy.client.session import create_session
+from appwashpy.common.enums import SERVICE_TYPE
+from appwashpy.common.errors import WrongCredentialsError
+from appwashpy.common.settings import (
+    ACCOUNT_MAX_CONCURRENCY,
+    ACCOUNT_POOL_MAXSIZE,
+    BATCH_MAX_WORKERS,
+    POOL_BLOCK,
+    POOL_CONNECTIONS,
+)
+from appwashpy.core.location import Location
+from appwashpy.core.purchase import BuyResult
+from appwashpy.core.service import Service
+
+
+class AccountPool:
+    """Many AppWash accounts sharing one connection pool, with calls routed to the account of each location.
+
+    Every account is an AppWash client with its own token, which it renews on its own, and its own session, so
+    cookies aren't shared. All sessions send their requests through the same HTTPAdapter and its keep-alive
+    connections. Locations are assigned to the account that may access them and calls for a location are made
+    with its credentials. Each account has at most max_concurrency requests in flight, so one busy account
+    can't take all connections.
+
+    Attributes:
+        max_concurrency (optional): Maximum number of requests of one account in flight at once.
+        pool_connections (optional): Number of per-host connection pools to cache.
+        pool_maxsize (optional): Maximum number of keep-alive connections shared by all accounts.
+        pool_block (optional): Whether to wait for a free connection once pool_maxsize connections are in use instead of opening additional ones.
+        adapter (optional): An existing HTTPAdapter whose connection pool is shared instead of creating an own one. It is not closed by close().
+        max_workers (optional): Maximum number of concurrent requests of the batch methods.
+        client_options (optional): Further keyword arguments of every AppWash, e.g. base_url, cache or token_store.
+        accounts: Dict mapping the email of every account to its AppWash client.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = ACCOUNT_MAX_CONCURRENCY,
+        pool_connections: int = POOL_CONNECTIONS,
+        pool_maxsize: int = ACCOUNT_POOL_MAXSIZE,
+        pool_block: bool = POOL_BLOCK,
+        adapter: HTTPAdapter = None,
+        max_workers: int = BATCH_MAX_WORKERS,
+        **client_options,
+    ):
+        self.max_concurrency = max_concurrency
+        self.max_workers = max_workers
+        self.client_options = client_options
+        self.accounts = {}
+
+        if adapter != None:
+            self.adapter = adapter
+            self._owns_adapter = False
+        else:
+            self.adapter = HTTPAdapter(
+                pool_connections=pool_connections,
+                pool_maxsize=pool_maxsize,
+                pool_block=pool_block,
+            )
+            self._owns_adapter = True
+
+        self._locations = {}
+        self._service_locations = {}
+        self._lock = threading.Lock()
+
+    def close(self) -> None:
+        """Closes the shared connections."""
+        if self._owns_adapter:
+            self.adapter.close()
+
+    def __enter__(self) -> "AccountPool":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self.accounts)
+
+    def add_account(
+        self, email: str, password: str, location_ids: Iterable[str] = ()
+    ) -> AppWash:
+        """Adds an account and assigns locations to it. Adding an email again replaces its password.
+
+        Attributes:
+            email: Email Adress of the AppWash Account.
+            password: Password of the AppWash Account.
+            location_ids (optional): IDs of the locations that are accessed with this account.
+
+        Returns:
+            The AppWash client of the account.
+        """
+        client = AppWash(
+            email,
+            password,
+            # Sessions of their own keep the cookies of the accounts apart
+            session=create_session(adapter=self.adapter),
+            max_concurrency=self.max_concurrency,
+            **self.client_options,
+        )
+        with self._lock:
+            self.accounts[email] = client
+            for location_id in location_ids:
+                self._locations[location_id] = email
+        return client
+
+    def assign(self, location_id: str, email: str) -> None:
+        """Assigns a location to the account it is accessed with."""
+        if email not in self.accounts:
+            raise ValueError(f"There is no account {email} in the pool.")
+        with self._lock:
+            self._locations[location_id] = email
+
+    def client(self, location_id: str) -> AppWash:
+        """The AppWash client of the account a location is assigned to."""
+        email = self._locations.get(location_id)
+        if email == None:
+            raise ValueError(f"No account is assigned to location {location_id}.")
+        return self.accounts[email]
+
+    def _service_client(self, service_id: str, location_id: str = None) -> AppWash:
+        """The client of the location of a service, which is known once the service was loaded through the pool."""
+        if location_id == None:
+            location_id = self._service_locations.get(service_id)
+        if location_id == None:
+            raise ValueError(
+                f"The location of service {service_id} is unknown, pass its location_id."
+            )
+        return self.client(location_id)
+
+    def _remember(self, services: list) -> None:
+        for service in services:
+            self._service_locations[service.service_id] = service.location_id
+
+    def location(self, location_id: str) -> Location:
+        """Load a location with the account it is assigned to."""
+        return self.client(location_id).location(location_id)
+
+    def services(
+        self, location_id: str, service_type: SERVICE_TYPE = None
+    ) -> list[Service]:
+        """Load the services of a location with the account it is assigned to.
+
+        The returned services belong to that account, so .buy() and .stop() use its credentials as well.
+        """
+        services = self.client(location_id).services(location_id, service_type)
+        self._remember(services)
+        return services
+
+    def services_many(
+        self,
+        location_ids: Iterable[str] = None,
+        service_type: SERVICE_TYPE = None,
+    ) -> dict[str, Union[list[Service], Exception]]:
+        """Load the services of several locations concurrently, each with its own account.
+
+        Attributes:
+            location_ids (optional): IDs of the locations. Defaults to all assigned locations.
+            service_type (optional): Only load services of this type.
+
+        Returns:
+            Dict mapping each location_id to its list of services, or to the exception raised while loading them.
+        """
+        if location_ids == None:
+            location_ids = list(self._locations)
+        location_ids = list(dict.fromkeys(location_ids))
+
+        def run(location_id: str):
+            try:
+                return self.services(location_id, service_type)
+            except Exception as error:
+                return error
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            return dict(zip(location_ids, executor.map(run, location_ids)))
+
+    def service(self, service_id: str, location_id: str = None) -> Service:
+        """Load a service with the account of its location.
+
+        Attributes:
+            service_id: ID of the service.
+            location_id (optional): ID of its location. Only needed if the service wasn't loaded through the pool before.
+        """
+        service = self._service_client(service_id, location_id).service(service_id)
+        self._remember([service])
+        return service
+
+    def buy_service(
+        self, service_id: str, location_id: str = None, **kwargs
+    ) -> BuyResult:
+        """Buy a service with the account of its location. Further arguments are passed to AppWash.buy_service()."""
+        client = self._service_client(service_id, location_id)
+        return client.buy_service(service_id, **kwargs)
+
+    def stop_service(self, service_id: str, location_id: str = None) -> None:
+        """Stop a service with the account of its location."""
+        self._service_client(service_id, location_id).stop_service(service_id)
+
+    def check_credentials(self) -> dict[str, Union[bool, Exception]]:
+        """Logs in to all accounts concurrently.
+
+        Every account logs in again, even if it has a valid token, so a password changed since is detected.
+        Valid accounts keep their new token, so their first call doesn't need to log in anymore.
+
+        Returns:
+            Dict mapping each email to whether its credentials are valid, or to the exception raised while checking them.
+        """
+
+        def run(client: AppWash):
+            try:
+                with client._token_lock:
+                    client._authenticate()
+                return True
+            except WrongCredentialsError:
+                return False
+            except Exception as error:
+                return error
+
+        clients = list(self.accounts.values())
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            return dict(
+                zip((client.email for client in clients), executor.map(run, clients))
+            )
+
+
+def check_credentials_many(
+    credentials: Union[dict, Iterable[tuple]],
+    max_workers: int = BATCH_MAX_WORKERS,
+    **client_options,
+) -> dict[str, Union[bool, Exception]]:
+    """Checks many credentials concurrently over one shared connection pool.
+
+    Attributes:
+        credentials: Dict mapping emails to passwords, or iterable of (email, password) tuples.
+        max_workers (optional): Maximum number of concurrent logins.
+        client_options (optional): Further keyword arguments of the AccountPool and its clients.
+
+    Returns:
+        Dict mapping each email to whether its credentials are valid, or to the exception raised while checking them.
+    """
+    with AccountPool(max_workers=max_workers, **client_options) as pool:
+        for email, password in dict(credentials).items():
+            pool.add_account(email, password)
+        return pool.check_credentials()
@@ -0,0 +1,80 @@
+import heapq
+import itertools
+import threading
+import time
+
+from appwashpy.common.enums import ENDPOINT
+
+# Lower values are served first: user-facing actions jump ahead of background reads
+HIGH_PRIORITY = 0
+LOW_PRIORITY = 1
+ENDPOINT_PRIORITIES = {
+    ENDPOINT.LOGIN: HIGH_PRIORITY,
+    ENDPOINT.START: HIGH_PRIORITY,
+    ENDPOINT.STOP: HIGH_PRIORITY,
+}
+
+
+class RateLimiter:
+    """Thread-safe token bucket limiting the request rate, serving waiting requests by priority.
+
+    Every request takes one token, tokens are refilled at rate per second up to burst. Requests waiting for a token
+    are served in order of their priority and, within a priority, first come first served.
+    Pass the same instance to several AppWash clients to limit their combined rate.
+
+    Attributes:
+        rate: Tokens added per second.
+        burst (optional): Maximum number of tokens, i.e. requests that can be sent at once. Defaults to rate.
+        priorities (optional): Dict mapping an ENDPOINT to its priority. Endpoints not in it have LOW_PRIORITY.
+    """
+
+    def __init__(self, rate: float, burst: float = None, priorities: dict = None):
+        self.rate = rate
+        self.burst = burst if burst != None else max(rate, 1)
+        self.priorities = priorities if priorities != None else ENDPOINT_PRIORITIES
+        self.waited = 0
+
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._waiters = []
+        self._counter = itertools.count()
+        self._condition = threading.Condition()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, priority: int = LOW_PRIORITY) -> None:
+        """Blocks until a token is available for a request of the given priority and takes it."""
+        with self._condition:
+            self._refill()
+            if not self._waiters and self._tokens >= 1:
+                self._tokens -= 1
+                return
+
+            self.waited += 1
+            waiter = (priority, next(self._counter))
+            heapq.heappush(self._waiters, waiter)
+            try:
+                while True:
+                    self._refill()
+                    if self._waiters[0] == waiter:
+                        if self._tokens >= 1:
+                            heapq.heappop(self._waiters)
+                            self._tokens -= 1
+                            # Let the next waiter become head
+                            self._condition.notify_all()
+                            return
+                        self._condition.wait((1 - self._tokens) / self.rate)
+                    else:
+                        self._condition.wait()
+            except BaseException:
+                self._waiters.remove(waiter)
+                heapq.heapify(self._waiters)
+                self._condition.notify_all()
+                raise
+
+    def acquire_for(self, endpoint: ENDPOINT) -> None:
+        """Acquires a token with the priority of the endpoint."""
+        self.acquire(self.priorities.get(endpoint, LOW_PRIORITY))
@@ -1,13 +1,42 @@
-from typing import TYPE_CHECKING
+import re
+import threading
+import time
+from typing import TYPE_CHECKING, Iterator
 
 import requests
 
-from appwashpy.common.enums import HTTP_METHOD
-from appwashpy.common.settings import BASE_URL
+from appwashpy.client.retry import NO_RETRY
+from appwashpy.common.enums import ENDPOINT, HTTP_METHOD
+from appwashpy.common.errors import AppWashConnectionError
+from appwashpy.common.serialization import JsonArrayStream, loads
+from appwashpy.common.settings import BASE_URL, REQUEST_TIMEOUT, STREAM_CHUNK_SIZE
 
 # Fix cyclical import because of type annotation
 if TYPE_CHECKING:
     from appwashpy.client.appwash import AppWash
+    from appwashpy.client.metrics import Metrics
+    from appwashpy.client.ratelimit import RateLimiter
+    from appwashpy.client.retry import CircuitBreaker
+
+ENDPOINT_PATTERNS = (
+    (re.compile(r"^/login$"), ENDPOINT.LOGIN),
+    (re.compile(r"^/locations/split/[^/]+$"), ENDPOINT.LOCATION),
+    (re.compile(r"^/location/[^/]+/connectorsv2$"), ENDPOINT.SERVICES),
+    (re.compile(r"^/+connector/[^/]+/start$"), ENDPOINT.START),
+    (re.compile(r"^/+connector/[^/]+/stop$"), ENDPOINT.STOP),
+    (re.compile(r"^/+connector/[^/]+$"), ENDPOINT.SERVICE),
+)
+
+# HTTP status codes of a degraded API that are worth retrying
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+
+def endpoint_type(endpoint: str) -> ENDPOINT:
+    """Classifies the path of a request."""
+    for pattern, endpoint_type in ENDPOINT_PATTERNS:
+        if pattern.match(endpoint):
+            return endpoint_type
+    return ENDPOINT.OTHER
 
 
 class ApiRequest:
@@ -21,6 +50,11 @@ class ApiRequest:
         "Accept": "application/json",
     }
     _response: dict
+    status_code: int = None
+    response_bytes: int = None
+    # Whether the response is read after the request returned, see StreamingApiRequest
+    _deferred = False
+    _pending: tuple = None
 
     def __init__(
         self,
@@ -31,25 +65,204 @@ class ApiRequest:
         params: dict = None,
     ):
 
+        self.endpoint = endpoint
+        self.endpoint_type = endpoint_type(endpoint)
+
+        # Copy the default headers so the token of one client never leaks into another request
+        self.headers = dict(self.headers)
         if endpoint != "/login":
             self.headers["token"] = client.token
 
         self.method = str(method)
         self.body = body
-        self.url = BASE_URL + endpoint
+        self.url = (client.base_url if client != None else BASE_URL) + endpoint
         self.params = params
 
-        self._perform_request()
+        # Reuse the pooled session of the client, fall back to a one-off connection otherwise
+        self._session = client._session if client != None else requests
+        self._client = client
+        self.timeout = client.timeout if client != None else REQUEST_TIMEOUT
 
-    def _perform_request(self) -> None:
-        self._response = requests.request(
+        self._send()
+
+    def _send(self) -> None:
+        """Performs the request, retrying failed attempts according to the retry policy of the endpoint."""
+        if self._client != None:
+            policy = self._client.retry_policies.get(self.endpoint_type, NO_RETRY)
+            breaker = self._client.circuit_breaker
+            limiter = self._client.rate_limiter
+            metrics = self._client.metrics
+            slots = self._client._request_slots
+        else:
+            policy, breaker, limiter, metrics, slots = NO_RETRY, None, None, None, None
+
+        attempt = 0
+        while True:
+            attempt += 1
+            trial = breaker.before_request() if breaker != None else False
+            try:
+                error = self._attempt(breaker, limiter, metrics, slots, trial)
+            finally:
+                # Whatever ends the trial request, e.g. a raising metrics hook, it must not block the next one.
+                # A pending attempt ends it once its outcome is known.
+                if trial and self._pending == None:
+                    breaker.end_trial()
+            if error == None:
+                return
+
+            if attempt >= policy.max_attempts:
+                if self._client != None:
+                    self._client.retry_stats.record_failure(self.endpoint_type)
+                if isinstance(error, AppWashConnectionError):
+                    raise error
+                raise AppWashConnectionError(
+                    f"{self.method} {self.url} failed: {error}"
+                ) from error
+            self._client.retry_stats.record_retry(self.endpoint_type)
+            time.sleep(policy.delay(attempt))
+
+    def _attempt(
+        self,
+        breaker: "CircuitBreaker",
+        limiter: "RateLimiter",
+        metrics: "Metrics",
+        slots: threading.Semaphore,
+        trial: bool,
+    ) -> Exception:
+        """Performs one attempt and records its outcome.
+
+        If the response is read after the request returned (_deferred), the outcome is left pending until
+        _complete() is called.
+
+        Returns:
+            The error of a failed attempt that may be retried, None if the attempt succeeded.
+        """
+        if limiter != None:
+            limiter.acquire_for(self.endpoint_type)
+        if metrics != None:
+            metrics.before_request(self)
+        started = time.perf_counter()
+        # Only the attempt itself holds a slot of the client, not the backoff
+        if slots != None:
+            slots.acquire()
+        attempt = (breaker, metrics, slots, started, trial)
+        try:
+            self._perform_request()
+        except (
+            requests.RequestException,
+            AppWashConnectionError,
+            ValueError,
+        ) as error:
+            self._complete(attempt, error)
+            return error
+        except BaseException:
+            if slots != None:
+                slots.release()
+            raise
+
+        if self._deferred:
+            self._pending = attempt
+        else:
+            self._complete(attempt)
+        return None
+
+    def _complete(self, attempt: tuple, error: Exception = None) -> None:
+        """Releases the slot of an attempt and records its outcome."""
+        breaker, metrics, slots, started, trial = attempt
+        if slots != None:
+            slots.release()
+        try:
+            if breaker != None:
+                if error != None:
+                    breaker.record_failure()
+                else:
+                    breaker.record_success()
+            if metrics != None:
+                metrics.after_request(self, time.perf_counter() - started, error)
+        finally:
+            if trial:
+                breaker.end_trial()
+
+    def _request(self, **kwargs) -> requests.Response:
+        self.status_code = None
+        self.response_bytes = None
+        response = self._session.request(
             self.method,
             url=self.url,
             params=self.params,
             json=self.body,
             headers=self.headers,
-        ).json()
+            timeout=self.timeout,
+            **kwargs,
+        )
+        self.status_code = response.status_code
+        if response.status_code in RETRY_STATUS_CODES:
+            raise AppWashConnectionError(
+                f"{self.method} {self.url} failed: HTTP {response.status_code}"
+            )
+        return response
+
+    def _perform_request(self) -> None:
+        content = self._request().content
+        self.response_bytes = len(content)
+        self._response = loads(content)
 
     @property
     def response(self) -> dict:
         return self._response
+
+
+class StreamingApiRequest(ApiRequest):
+    """ApiRequest whose response body is decoded incrementally.
+
+    The items of an array in the response are yielded by iter_array() while the body is still being received.
+    The remaining members of the response, e.g. errorCode, are available in response once they have been decoded.
+    The connection, the concurrency slot of the client and the outcome for the circuit breaker and the metrics are
+    only released and recorded by close(), which iter_array() calls once the body is read or the iteration stops.
+    """
+
+    _chunks: Iterator[bytes]
+    _stream: requests.Response = None
+    _deferred = True
+
+    def _perform_request(self) -> None:
+        self._response = {}
+        self._stream = self._request(stream=True)
+        self.response_bytes = 0
+        self._chunks = self._count(self._stream.iter_content(STREAM_CHUNK_SIZE))
+
+    def _count(self, chunks: Iterator[bytes]) -> Iterator[bytes]:
+        for chunk in chunks:
+            self.response_bytes += len(chunk)
+            yield chunk
+
+    def iter_array(self, key: str) -> Iterator:
+        """Yields the items of the array under key in the response as they are decoded.
+
+        Errors while receiving or decoding the body are raised as AppWashConnectionError.
+        """
+        stream = JsonArrayStream(self._chunks, key)
+        # Share the dict, so members decoded before the array are visible while iterating
+        self._response = stream.header
+        try:
+            yield from stream
+        except (requests.RequestException, ValueError) as error:
+            self.close(error)
+            raise AppWashConnectionError(
+                f"{self.method} {self.url} failed while streaming: {error}"
+            ) from error
+        finally:
+            self.close()
+
+    def close(self, error: Exception = None) -> None:
+        """Closes the response and records the outcome of the request. Calling it again does nothing.
+
+        Attributes:
+            error (optional): Error that ended reading the response.
+        """
+        stream, self._stream = self._stream, None
+        if stream != None:
+            stream.close()
+        attempt, self._pending = self._pending, None
+        if attempt != None:
+            self._complete(attempt, error)
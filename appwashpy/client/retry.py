@@ -0,0 +1,156 @@
+import random
+import threading
+import time
+from dataclasses import dataclass
+
+from appwashpy.common.enums import ENDPOINT
+from appwashpy.common.errors import CircuitOpenError
+from appwashpy.common.settings import (
+    BREAKER_FAILURE_THRESHOLD,
+    BREAKER_RESET_TIMEOUT,
+    RETRY_BACKOFF,
+    RETRY_MAX_ATTEMPTS,
+    RETRY_MAX_BACKOFF,
+)
+
+# Endpoints that can be repeated without side effects
+IDEMPOTENT_ENDPOINTS = (
+    ENDPOINT.LOGIN,
+    ENDPOINT.LOCATION,
+    ENDPOINT.SERVICES,
+    ENDPOINT.SERVICE,
+)
+
+
+@dataclass
+class RetryPolicy:
+    """How often and how long apart a failed request is retried.
+
+    Only connection errors, timeouts, HTTP 429 and 5xx responses and invalid response bodies are retried,
+    never responses with an AppWash errorCode.
+
+    Attributes:
+        max_attempts: Maximum number of attempts including the first one. 1 disables retries.
+        backoff: Base delay in seconds, doubled with every retry.
+        max_backoff: Maximum delay in seconds.
+        jitter: Whether to draw the delay uniformly between 0 and the backoff, so clients don't retry in lockstep.
+    """
+
+    max_attempts: int = RETRY_MAX_ATTEMPTS
+    backoff: float = RETRY_BACKOFF
+    max_backoff: float = RETRY_MAX_BACKOFF
+    jitter: bool = True
+
+    def delay(self, attempt: int) -> float:
+        """Seconds to wait before the retry following the given attempt."""
+        delay = min(self.backoff * 2 ** (attempt - 1), self.max_backoff)
+        return random.uniform(0, delay) if self.jitter else delay
+
+
+NO_RETRY = RetryPolicy(max_attempts=1)
+
+
+def default_retry_policies(policy: RetryPolicy = None) -> dict:
+    """Retry policy per endpoint: the given or default policy for idempotent endpoints, no retries for all others."""
+    policy = policy if policy != None else RetryPolicy()
+    return {
+        endpoint: policy if endpoint in IDEMPOTENT_ENDPOINTS else NO_RETRY
+        for endpoint in ENDPOINT
+    }
+
+
+class CircuitBreaker:
+    """Fails requests fast while the AppWash API is down.
+
+    Opens after failure_threshold consecutive failed attempts. While open, requests raise CircuitOpenError without
+    being sent. After reset_timeout seconds one trial request is let through, which closes the breaker on success
+    and opens it again on failure.
+
+    Attributes:
+        failure_threshold (optional): Consecutive failures until the breaker opens.
+        reset_timeout (optional): Seconds the breaker stays open before a trial request.
+        trips: Number of times the breaker opened.
+        rejected: Number of requests rejected while the breaker was open.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = BREAKER_FAILURE_THRESHOLD,
+        reset_timeout: float = BREAKER_RESET_TIMEOUT,
+    ):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.trips = 0
+        self.rejected = 0
+
+        self._failures = 0
+        self._opened_at = None
+        self._trial_running = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        """CLOSED, OPEN or HALF_OPEN."""
+        if self._opened_at == None:
+            return "CLOSED"
+        if time.monotonic() - self._opened_at < self.reset_timeout:
+            return "OPEN"
+        return "HALF_OPEN"
+
+    def before_request(self) -> bool:
+        """Raises CircuitOpenError if the request must not be sent.
+
+        Returns:
+            Whether the request is the trial request, which must be followed by end_trial().
+        """
+        with self._lock:
+            if self._opened_at == None:
+                return False
+            remaining = self.reset_timeout - (time.monotonic() - self._opened_at)
+            if remaining <= 0 and not self._trial_running:
+                self._trial_running = True
+                return True
+            self.rejected += 1
+            raise CircuitOpenError(max(remaining, 0))
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_running = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._trial_running or (
+                self._opened_at == None and self._failures >= self.failure_threshold
+            ):
+                self.trips += 1
+                self._opened_at = time.monotonic()
+            self._trial_running = False
+
+    def end_trial(self) -> None:
+        """Lets another trial request through if the trial ended without recording its outcome, e.g. by an unexpected exception."""
+        with self._lock:
+            self._trial_running = False
+
+
+class RetryStats:
+    """Thread-safe counters of retried requests and requests that failed after their last attempt, per endpoint."""
+
+    def __init__(self):
+        self.retries = {}
+        self.failures = {}
+        self._lock = threading.Lock()
+
+    def record_retry(self, endpoint: ENDPOINT) -> None:
+        with self._lock:
+            self.retries[str(endpoint)] = self.retries.get(str(endpoint), 0) + 1
+
+    def record_failure(self, endpoint: ENDPOINT) -> None:
+        with self._lock:
+            self.failures[str(endpoint)] = self.failures.get(str(endpoint), 0) + 1
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            return {"retries": dict(self.retries), "failures": dict(self.failures)}
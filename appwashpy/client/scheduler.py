@@ -0,0 +1,154 @@
+import heapq
+import time
+from typing import TYPE_CHECKING, Callable, Iterable, Iterator
+
+from appwashpy.common.enums import STATE
+from appwashpy.common.errors import BaseError
+from appwashpy.common.settings import (
+    POLL_BASE_INTERVAL,
+    POLL_DEFAULT_CYCLE,
+    POLL_MAX_INTERVAL,
+    POLL_MIN_INTERVAL,
+)
+from appwashpy.core.service import Service
+
+# Fix cyclical import because of type annotation
+if TYPE_CHECKING:
+    from appwashpy.client.appwash import AppWash
+
+BUSY_STATES = (STATE.OCCUPIED, STATE.SESSION_WAIT_ON, STATE.STOPPABLE)
+
+
+class AdaptivePoller:
+    """Polls services with intervals adapted to their state and session timing.
+
+    Keeps a priority queue of the next poll deadline per service. Available services are polled every base_interval,
+    running services are left alone until shortly before their expected finish and polled every min_interval from then on.
+    The expected finish is derived from the session start and the cycle lengths observed so far.
+    A service that fails to load is retried after min_interval, doubled with every further failure up to max_interval.
+
+    Attributes:
+        client: The AppWash client used for polling.
+        service_ids: IDs of the services to poll.
+        base_interval (optional): Seconds between polls of available services, also the interval of the fixed-interval baseline.
+        min_interval (optional): Seconds between polls of services that are about to finish.
+        max_interval (optional): Maximum seconds between two polls of a service.
+        default_cycle (optional): Assumed cycle length in seconds until a cycle of the service type has been observed.
+        clock (optional): Returns the current timestamp in server time. Defaults to the clock of the client.
+        sleep (optional): Function used to wait for the next deadline.
+        errors: Number of polls that failed.
+    """
+
+    def __init__(
+        self,
+        client: "AppWash",
+        service_ids: Iterable[str],
+        base_interval: float = POLL_BASE_INTERVAL,
+        min_interval: float = POLL_MIN_INTERVAL,
+        max_interval: float = POLL_MAX_INTERVAL,
+        default_cycle: float = POLL_DEFAULT_CYCLE,
+        clock: Callable[[], float] = None,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.client = client
+        self.base_interval = base_interval
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.default_cycle = default_cycle
+        self.clock = clock if clock != None else client._server_timestamp
+        self.sleep = sleep
+
+        self.calls = 0
+        self.errors = 0
+        self._failures = {}
+        self._started = self.clock()
+        self._queue = [(self._started, service_id) for service_id in service_ids]
+        heapq.heapify(self._queue)
+        self._services = {}
+        self._cycles = {}
+
+    def expected_cycle(self, service: Service) -> float:
+        """Average observed cycle length of the service, falling back to its type and default_cycle."""
+        for key in (service.service_id, str(service.type)):
+            if key in self._cycles:
+                total, count = self._cycles[key]
+                return total / count
+        return self.default_cycle
+
+    def _record_cycle(self, previous: Service, now: float) -> None:
+        """Records the length of a finished session of the service."""
+        length = now - previous.session_start
+        for key in (previous.service_id, str(previous.type)):
+            total, count = self._cycles.get(key, (0, 0))
+            self._cycles[key] = (total + length, count + 1)
+
+    def next_interval(self, service: Service, now: float) -> float:
+        """Seconds until the service should be polled again."""
+        if service.state in BUSY_STATES and service.session_start != None:
+            expected_finish = service.session_start + self.expected_cycle(service)
+            interval = expected_finish - self.min_interval - now
+        elif service.state == STATE.FAULTED:
+            interval = self.max_interval
+        else:
+            interval = self.base_interval
+        return min(max(interval, self.min_interval), self.max_interval)
+
+    def poll_due(self) -> list[Service]:
+        """Polls every service whose deadline has passed and schedules its next poll.
+
+        Returns:
+            The polled services.
+        """
+        now = self.clock()
+        polled = []
+        while self._queue and self._queue[0][0] <= now:
+            _, service_id = heapq.heappop(self._queue)
+            self.calls += 1
+            try:
+                service = self.client.service(service_id)
+            except BaseError:
+                # Keep the service and retry it with backoff, the other due services are still polled
+                self.errors += 1
+                failures = self._failures.get(service_id, 0) + 1
+                self._failures[service_id] = failures
+                retry_in = min(
+                    self.min_interval * 2 ** (failures - 1), self.max_interval
+                )
+                heapq.heappush(self._queue, (now + retry_in, service_id))
+                continue
+            self._failures.pop(service_id, None)
+
+            previous = self._services.get(service_id)
+            if (
+                previous != None
+                and previous.state in BUSY_STATES
+                and previous.session_start != None
+                and service.state not in BUSY_STATES
+            ):
+                self._record_cycle(previous, now)
+            self._services[service_id] = service
+
+            heapq.heappush(
+                self._queue, (now + self.next_interval(service, now), service_id)
+            )
+            polled.append(service)
+        return polled
+
+    def __iter__(self) -> Iterator[Service]:
+        """Polls forever, sleeping until the next deadline, and yields every polled service. Stops at once without services."""
+        while self._queue:
+            yield from self.poll_due()
+            self.sleep(max(self._queue[0][0] - self.clock(), 0))
+
+    def stats(self) -> dict:
+        """Returns the number of calls made and saved compared to polling every service each base_interval, and of failed calls."""
+        elapsed = self.clock() - self._started
+        fixed_interval_calls = len(self._queue) * (
+            int(elapsed // self.base_interval) + 1
+        )
+        return {
+            "calls": self.calls,
+            "fixed_interval_calls": fixed_interval_calls,
+            "calls_saved": fixed_interval_calls - self.calls,
+            "errors": self.errors,
+        }
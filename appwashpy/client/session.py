@@ -0,0 +1,31 @@
+import requests
+from requests.adapters import HTTPAdapter
+
+from appwashpy.common.settings import POOL_BLOCK, POOL_CONNECTIONS, POOL_MAXSIZE
+
+
+def create_session(
+    pool_connections: int = POOL_CONNECTIONS,
+    pool_maxsize: int = POOL_MAXSIZE,
+    pool_block: bool = POOL_BLOCK,
+    adapter: HTTPAdapter = None,
+) -> requests.Session:
+    """Creates a HTTP session with a keep-alive connection pool.
+
+    Attributes:
+        pool_connections: Number of per-host connection pools to cache.
+        pool_maxsize: Maximum number of keep-alive connections kept open per host.
+        pool_block: Whether to block once pool_maxsize connections to a host are in use instead of opening additional, non-pooled connections.
+        adapter (optional): An existing HTTPAdapter whose connection pool the session shares, the pool options are ignored then.
+    """
+    if adapter == None:
+        adapter = HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block,
+        )
+
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
@@ -0,0 +1,116 @@
+import json
+import os
+import tempfile
+from contextlib import contextmanager
+from typing import Callable
+
+from appwashpy.common.helper import current_timestamp
+from appwashpy.common.settings import TOKEN_STORE_PATH
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+    import msvcrt
+
+
+class FileTokenStore:
+    """Persists authentication tokens on disk, keyed by account email.
+
+    Lets new processes reuse the token of a previous one instead of logging in again.
+    Access is serialized between processes with a lock file next to the store, so concurrent cold starts share one login.
+    The store only contains tokens, never passwords, and is created readable for the current user only.
+
+    Attributes:
+        path (optional): Path of the JSON file the tokens are stored in.
+    """
+
+    path: str
+
+    def __init__(self, path: str = TOKEN_STORE_PATH):
+        self.path = path
+
+    @contextmanager
+    def _lock(self):
+        """Holds an exclusive lock on the store across processes."""
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        with open(self.path + ".lock", "a+") as lock_file:
+            if fcntl != None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            else:
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+            try:
+                yield
+            finally:
+                if fcntl != None:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+                else:
+                    msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+
+    def _read(self) -> dict:
+        try:
+            with open(self.path) as file:
+                return json.load(file)
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def _write(self, entries: dict) -> None:
+        # Write to a temporary file first, so readers never see a partially written store
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tokens-")
+        try:
+            with os.fdopen(fd, "w") as file:
+                json.dump(entries, file)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    @staticmethod
+    def _expires_in(entry: dict) -> int:
+        """Seconds until the token of the entry expires, measured in server time."""
+        return entry["token_expiry"] - (current_timestamp() + entry["clock_offset"])
+
+    def load(self, email: str) -> dict:
+        """Returns the stored entry of the account or None.
+
+        Entries contain the keys token, token_expiry and clock_offset.
+        """
+        return self._read().get(email)
+
+    def save(self, email: str, entry: dict) -> None:
+        """Stores the entry of the account."""
+        with self._lock():
+            entries = self._read()
+            entries[email] = entry
+            self._write(entries)
+
+    def delete(self, email: str) -> None:
+        """Removes the entry of the account."""
+        with self._lock():
+            entries = self._read()
+            if entries.pop(email, None) != None:
+                self._write(entries)
+
+    def get_or_create(
+        self, email: str, create: Callable[[], dict], min_ttl: int = 0
+    ) -> dict:
+        """Returns the stored entry if it is valid for more than min_ttl seconds, otherwise stores and returns a new one.
+
+        The lock is held while create() runs, so concurrent processes wait for a single login and reuse its token.
+
+        Attributes:
+            email: Email of the account.
+            create: Callable performing the login and returning a new entry.
+            min_ttl: Minimum number of seconds the stored token has to be valid.
+        """
+        with self._lock():
+            entries = self._read()
+            entry = entries.get(email)
+            if entry != None and self._expires_in(entry) > min_ttl:
+                return entry
+
+            entry = create()
+            entries[email] = entry
+            self._write(entries)
+            return entry
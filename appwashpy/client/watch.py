@@ -0,0 +1,111 @@
+import time
+from typing import TYPE_CHECKING, Iterable, Iterator
+
+from appwashpy.common.enums import SERVICE_TYPE
+from appwashpy.common.settings import BATCH_MAX_WORKERS, WATCH_INTERVAL
+from appwashpy.core.change import ServiceStateChange
+
+# Fix cyclical import because of type annotation
+if TYPE_CHECKING:
+    from appwashpy.client.appwash import AppWash
+
+
+class ServiceWatcher:
+    """Polls the services of one or more locations and reports their state changes.
+
+    Snapshots are diffed by service_id. Services whose raw payload didn't change since the last poll
+    are skipped without building a Service object.
+
+    Attributes:
+        client: The AppWash client used for polling.
+        location_ids: IDs of the watched locations.
+        service_type (optional): Only watch services of this type.
+        interval (optional): Seconds between two polls.
+        emit_initial (optional): Whether the first poll reports every service as a change from None.
+        max_workers (optional): Maximum number of locations polled concurrently.
+    """
+
+    def __init__(
+        self,
+        client: "AppWash",
+        location_ids: Iterable[str],
+        service_type: SERVICE_TYPE = None,
+        interval: float = WATCH_INTERVAL,
+        emit_initial: bool = False,
+        max_workers: int = BATCH_MAX_WORKERS,
+    ):
+        self.client = client
+        self.location_ids = list(location_ids)
+        self.service_type = service_type
+        self.interval = interval
+        self.emit_initial = emit_initial
+        self.max_workers = max_workers
+
+        self.polls = 0
+        self._payloads = {}
+        self._states = {}
+
+    def poll(self) -> list[ServiceStateChange]:
+        """Loads the current services once and returns the changes since the previous poll.
+
+        Locations that fail to load are skipped and keep their previous snapshot.
+        """
+        results = self.client._map_locations(
+            lambda location_id: self.client._coalesced(
+                ("services", location_id, str(self.service_type)),
+                lambda: self.client._load_services(location_id, self.service_type),
+            ),
+            self.location_ids,
+            self.max_workers,
+        )
+        initial = self.polls == 0
+        self.polls += 1
+
+        report = not initial or self.emit_initial
+        # The initial states are recorded in the history even if they aren't reported
+        build = report or self.client.recorder != None
+
+        changes = []
+        for payloads in results.values():
+            if isinstance(payloads, Exception):
+                continue
+            for payload in payloads:
+                change = self._diff(payload, build)
+                if change != None:
+                    changes.append(change)
+
+        if self.client.recorder != None:
+            self.client.recorder.record(
+                [change.service for change in changes], self.client._server_timestamp()
+            )
+        return changes if report else []
+
+    def _diff(self, payload: dict, build: bool) -> ServiceStateChange:
+        service_id = payload["externalId"]
+        if self._payloads.get(service_id) == payload:
+            return None
+        self._payloads[service_id] = payload
+
+        old_state = self._states.get(service_id)
+        new_state = payload["state"]
+        if old_state == new_state:
+            return None
+        self._states[service_id] = new_state
+        if not build:
+            return None
+
+        service = self.client._service_class._from_result(self.client, payload)
+        return ServiceStateChange(
+            service_id=service_id,
+            location_id=service.location_id,
+            old_state=old_state,
+            new_state=new_state,
+            session_start=service.session_start,
+            service=service,
+        )
+
+    def __iter__(self) -> Iterator[ServiceStateChange]:
+        """Polls forever and yields every change."""
+        while True:
+            yield from self.poll()
+            time.sleep(self.interval)
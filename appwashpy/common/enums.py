@@ -18,6 +18,10 @@ class BaseStringEnum(Enum):
         else:
             return False
 
+    def __hash__(self):
+        """Hash like the name, so members and their names are interchangeable as dict keys."""
+        return hash(self.name)
+
     @classmethod
     def has(cls, name):
         return name in cls.__members__
@@ -53,3 +57,13 @@ class LOCATION_TYPE(BaseStringEnum):
     SERVICED_APARTMENT = auto()
     STUDENT_HOME = auto()
     OTHER = auto()
+
+
+class ENDPOINT(BaseStringEnum):
+    LOGIN = auto()
+    LOCATION = auto()
+    SERVICES = auto()
+    SERVICE = auto()
+    START = auto()
+    STOP = auto()
+    OTHER = auto()
@@ -30,3 +30,19 @@ class WrongCredentialsError(AppWashApiError):
         super().__init__(error_code, error_message)
         self.email = (email,)
         self.password = password
+
+
+class AppWashConnectionError(BaseError):
+    """The AppWash API couldn't be reached or didn't send a valid response."""
+
+
+class CircuitOpenError(AppWashConnectionError):
+    """The request wasn't sent because the circuit breaker is open after repeated failures."""
+
+    retry_after: float
+
+    def __init__(self, retry_after: float):
+        super().__init__(
+            f"AppWash API unavailable, requests are paused for {retry_after:.1f} more seconds."
+        )
+        self.retry_after = retry_after
@@ -0,0 +1,146 @@
+import codecs
+import json
+from dataclasses import fields, is_dataclass
+from enum import Enum
+from typing import Any, Iterable, Iterator
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Characters that may continue a number token
+NUMBER_CHARS = "0123456789+-.eE"
+
+
+def loads(data: bytes) -> dict:
+    """Decodes a JSON response body, using orjson if it is installed (pip install appwashpy[fast])."""
+    if orjson != None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _encode(value: Any) -> Any:
+    """Encodes the SDK objects json can't: enums by name, dataclasses by the fields shown in their repr and exceptions by type and message."""
+    if isinstance(value, Enum):
+        return str(value)
+    if is_dataclass(value) and not isinstance(value, type):
+        return {
+            field.name: getattr(value, field.name)
+            for field in fields(value)
+            if field.repr
+        }
+    if isinstance(value, Exception):
+        return {"type": type(value).__name__, "message": str(value)}
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(value: Any, indent: int = None) -> str:
+    """Encodes a value to JSON, including Services, Locations, results and exceptions of the SDK."""
+    return json.dumps(value, default=_encode, indent=indent)
+
+
+class JsonArrayStream:
+    """Incrementally decodes a JSON object from chunks of bytes and yields the items of one of its arrays.
+
+    Only the items of the array under key are yielded as soon as they are decoded, all other
+    top-level members are collected in header.
+
+    Attributes:
+        chunks: Iterable of bytes containing the JSON object.
+        key: Top-level key of the array whose items are yielded.
+        header: Top-level members other than the array, filled while decoding.
+    """
+
+    def __init__(self, chunks: Iterable[bytes], key: str):
+        self.key = key
+        self.header = {}
+
+        self._chunks = iter(chunks)
+        self._text = codecs.getincrementaldecoder("utf-8")()
+        self._decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self) -> bool:
+        """Appends the next chunk to the buffer. Returns False once the input is exhausted."""
+        if self._eof:
+            return False
+        try:
+            chunk = next(self._chunks)
+        except StopIteration:
+            self._eof = True
+            chunk = b""
+        # Drop the consumed part of the buffer
+        self._buffer = self._buffer[self._pos :] + self._text.decode(chunk, self._eof)
+        self._pos = 0
+        return True
+
+    def _peek(self) -> str:
+        """Skips whitespace and returns the next character without consuming it."""
+        while True:
+            while (
+                self._pos < len(self._buffer) and self._buffer[self._pos] in " \t\r\n"
+            ):
+                self._pos += 1
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._fill():
+                raise ValueError("Unexpected end of JSON input")
+
+    def _expect(self, char: str) -> None:
+        if self._peek() != char:
+            raise ValueError(
+                f"Expected {char!r} but found {self._buffer[self._pos]!r} in JSON input"
+            )
+        self._pos += 1
+
+    def _value(self):
+        """Decodes the next complete JSON value, reading more chunks as required."""
+        self._peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+                if self._complete(value, end):
+                    self._pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self._eof:
+                    raise
+            self._fill()
+
+    def _complete(self, value, end: int) -> bool:
+        """Whether a decoded value is complete. A number is only complete once a delimiter follows it,
+        otherwise it may continue in the next chunk, e.g. 1. followed by 5 or 1e followed by 3.
+        """
+        if not isinstance(value, (int, float)) or isinstance(value, bool):
+            return True
+        rest = self._buffer[end:].lstrip(" \t\r\n")
+        if rest == "":
+            return self._eof
+        if rest[0] in ",]}":
+            return True
+        if self._eof or rest.strip(NUMBER_CHARS) != "":
+            raise ValueError(f"Unexpected {rest[0]!r} after a number in JSON input")
+        # The rest of the buffer continues the number
+        return False
+
+    def __iter__(self) -> Iterator:
+        self._expect("{")
+        while self._peek() != "}":
+            if self._peek() == ",":
+                self._pos += 1
+            key = self._value()
+            self._expect(":")
+
+            if key == self.key and self._peek() == "[":
+                self._pos += 1
+                while self._peek() != "]":
+                    if self._peek() == ",":
+                        self._pos += 1
+                    yield self._value()
+                self._pos += 1
+            else:
+                self.header[key] = self._value()
+        self._pos += 1
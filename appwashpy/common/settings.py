@@ -1 +1,78 @@
+import os
+
 BASE_URL = "https://www.involtum-services.com/api-rest/"
+
+# Connection pool defaults of the HTTP session owned by an AppWash client
+POOL_CONNECTIONS = 10
+POOL_MAXSIZE = 10
+POOL_BLOCK = False
+
+# Connection pool defaults of the aiohttp session owned by an AsyncAppWash client
+ASYNC_POOL_LIMIT = 100
+ASYNC_POOL_LIMIT_PER_HOST = 100
+ASYNC_KEEPALIVE_TIMEOUT = 15
+
+# Seconds before its expiry in which the token is renewed in the background
+TOKEN_REFRESH_MARGIN = 300
+
+# Default location of the on-disk token store
+TOKEN_STORE_PATH = os.path.join(
+    os.path.expanduser("~"), ".cache", "appwashpy", "tokens.json"
+)
+
+# Response cache defaults: seconds an entry of each endpoint stays valid and maximum number of entries
+CACHE_LOCATION_TTL = 3600
+CACHE_SERVICES_TTL = 60
+CACHE_SERVICE_TTL = 60
+CACHE_MAXSIZE = 1024
+
+# Default number of concurrent requests of the batch methods, stays below POOL_MAXSIZE
+BATCH_MAX_WORKERS = 8
+
+# Default seconds between two polls of AppWash.watch()
+WATCH_INTERVAL = 30
+
+# Defaults of the adaptive poller in seconds
+POLL_BASE_INTERVAL = 60
+POLL_MIN_INTERVAL = 15
+POLL_MAX_INTERVAL = 1800
+POLL_DEFAULT_CYCLE = 3600
+
+# Bytes read at once when decoding a streamed response
+STREAM_CHUNK_SIZE = 16384
+
+# Connect and read timeout of requests in seconds
+REQUEST_TIMEOUT = (5, 30)
+
+# Retry defaults: attempts per request, base and maximum backoff in seconds
+RETRY_MAX_ATTEMPTS = 3
+RETRY_BACKOFF = 0.5
+RETRY_MAX_BACKOFF = 10
+
+# Circuit breaker defaults: consecutive failures until it opens and seconds until a trial request
+BREAKER_FAILURE_THRESHOLD = 5
+BREAKER_RESET_TIMEOUT = 30
+
+# Seconds an observed state is trusted by a safe buy instead of loading the service again
+BUY_MAX_STATE_AGE = 10
+
+# Upper bounds of the request latency histogram in seconds
+METRICS_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+# Default location of the SQLite history of state transitions
+HISTORY_PATH = os.path.join(
+    os.path.expanduser("~"), ".cache", "appwashpy", "history.sqlite3"
+)
+
+# History writes: transitions written in one transaction and maximum seconds they are held back
+HISTORY_BATCH_SIZE = 500
+HISTORY_FLUSH_INTERVAL = 5
+
+# Default path of the Unix socket the CLI daemon listens on
+DAEMON_SOCKET_PATH = os.path.join(
+    os.path.expanduser("~"), ".cache", "appwashpy", "daemon.sock"
+)
+
+# Account pool defaults: concurrent requests per account and keep-alive connections of the shared session
+ACCOUNT_MAX_CONCURRENCY = 4
+ACCOUNT_POOL_MAXSIZE = 32
@@ -0,0 +1,342 @@
+from typing import TYPE_CHECKING, Iterable
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from appwashpy.common.enums import STATE
+
+# Fix cyclical import because of type annotation
+if TYPE_CHECKING:
+    from appwashpy.client.history import HistoryRecorder
+
+HOUR = 3600
+WEEK_HOURS = 168
+# 1970-01-01 was a Thursday, shifts hour 0 of the week to Monday 00:00
+EPOCH_WEEK_OFFSET = 72 * HOUR
+
+BUSY_STATES = (STATE.OCCUPIED.name, STATE.SESSION_WAIT_ON.name, STATE.STOPPABLE.name)
+GROUPS = ("service_id", "location_id", "service_type")
+
+
+def _column(values: Iterable) -> "np.ndarray":
+    """Array of a column, strings are kept as fixed-width strings instead of objects."""
+    array = np.asarray(values)
+    if array.dtype == object or len(array) == 0:
+        array = array.astype(str)
+    return array
+
+
+class OccupancyAnalytics:
+    """Occupancy statistics over the recorded states of many services, computed with NumPy on columnar arrays.
+
+    Every observation holds until the next observation of the same service, the last one until `until`.
+    Services in OCCUPIED, SESSION_WAIT_ON or STOPPABLE count as busy, FAULTED time is ignored.
+    A cycle is an uninterrupted busy run of a service, a run that is still going at `until` isn't counted.
+    The location and type of a service are taken from its first observation.
+    Requires the optional dependency numpy (pip install appwashpy[analytics]).
+
+    Attributes:
+        service_ids: ID of the service of every observation. Integer IDs are sorted much faster than strings.
+        location_ids: ID of the location of every observation.
+        service_types: Service type of every observation.
+        states: State of every observation.
+        observed_at: Timestamp of every observation.
+        until (optional): Timestamp the history ends at. Defaults to the last observation.
+        labels: Dict mapping "service_id", "location_id" and "service_type" to the array of their distinct values.
+    """
+
+    def __init__(
+        self,
+        service_ids: Iterable[str],
+        location_ids: Iterable[str],
+        service_types: Iterable[str],
+        states: Iterable[str],
+        observed_at: Iterable[float],
+        until: float = None,
+    ):
+        if np == None:
+            raise ImportError(
+                "OccupancyAnalytics requires numpy. Install it via: pip install appwashpy[analytics]"
+            )
+
+        observed_at = np.asarray(observed_at, dtype=np.float64)
+        self.until = float(until if until != None else observed_at.max(initial=0))
+
+        states = _column(states)
+        busy = np.zeros(len(states), dtype=bool)
+        for state in BUSY_STATES:
+            busy |= states == state
+        faulted = states == STATE.FAULTED.name
+        del states
+
+        # Sort the observations by service and time once, all statistics work on runs of one service
+        service_ids = _column(service_ids)
+        order = np.lexsort((observed_at, service_ids))
+        ids = service_ids[order]
+        self._first = np.ones(len(ids), dtype=bool)
+        self._first[1:] = ids[1:] != ids[:-1]
+        # Slices instead of appending, so an empty history stays empty
+        self._last = np.zeros(len(ids), dtype=bool)
+        self._last[:-1] = self._first[1:]
+        self._last[-1:] = True
+        first_index = np.flatnonzero(self._first)
+        self.service = np.cumsum(self._first) - 1
+        self.busy = busy[order]
+        self.faulted = faulted[order]
+        self.start = observed_at[order]
+        # An observation lasts until the next one of its service
+        self.end = np.empty_like(self.start)
+        self.end[:-1] = self.start[1:]
+        self.end[self._last] = self.until
+
+        # Groups are encoded per service instead of per observation
+        self.labels = {"service_id": ids[first_index]}
+        self._service_groups = {"service_id": np.arange(len(first_index))}
+        first_rows = order[first_index]
+        for name, column in (
+            ("location_id", location_ids),
+            ("service_type", service_types),
+        ):
+            self.labels[name], self._service_groups[name] = np.unique(
+                _column(column)[first_rows], return_inverse=True
+            )
+        self._hours = {}
+
+    @classmethod
+    def from_transitions(
+        cls, rows: list[tuple], until: float = None
+    ) -> "OccupancyAnalytics":
+        """Creates the analytics from rows returned by HistoryRecorder.transitions()."""
+        if not rows:
+            return cls([], [], [], [], [], until)
+        service_ids, location_ids, service_types, states, _, observed_at = zip(*rows)
+        return cls(service_ids, location_ids, service_types, states, observed_at, until)
+
+    @classmethod
+    def from_recorder(
+        cls, recorder: "HistoryRecorder", until: float = None, **query
+    ) -> "OccupancyAnalytics":
+        """Creates the analytics from the history of a recorder, query is passed to transitions()."""
+        return cls.from_transitions(recorder.transitions(**query), until)
+
+    @classmethod
+    def from_snapshots(
+        cls, snapshots: Iterable[tuple], until: float = None
+    ) -> "OccupancyAnalytics":
+        """Creates the analytics from snapshots of AppWash.services().
+
+        Attributes:
+            snapshots: Iterable of tuples of the timestamp and the list of services observed at it.
+        """
+        columns = ([], [], [], [], [])
+        for observed_at, services in snapshots:
+            for service in services:
+                columns[0].append(service.service_id)
+                columns[1].append(service.location_id)
+                columns[2].append(str(service.type))
+                columns[3].append(str(service.state))
+                columns[4].append(observed_at)
+        return cls(*columns, until=until)
+
+    def _groups(self, by) -> tuple:
+        """Group code of every service and the labels of the groups."""
+        names = (by,) if isinstance(by, str) else tuple(by)
+        for name in names:
+            if name not in GROUPS:
+                raise ValueError(f"by must be one or more of {GROUPS}, not {name!r}")
+        if len(names) == 1:
+            return self._service_groups[names[0]], self.labels[names[0]].tolist()
+
+        combined, codes = np.unique(
+            np.stack([self._service_groups[name] for name in names], axis=1),
+            axis=0,
+            return_inverse=True,
+        )
+        labels = [
+            tuple(str(self.labels[name][code]) for name, code in zip(names, row))
+            for row in combined
+        ]
+        return codes.ravel(), labels
+
+    def _hours_of_week(self, utc_offset: float) -> list:
+        """Splits end and start of every observation into full weeks, hour of the week and seconds into the hour."""
+        if utc_offset not in self._hours:
+            self._hours[utc_offset] = []
+            for times in (self.end, self.start):
+                weeks, rest = np.divmod(
+                    times + (utc_offset + EPOCH_WEEK_OFFSET), WEEK_HOURS * HOUR
+                )
+                hour = (rest // HOUR).astype(np.int64)
+                self._hours[utc_offset].append((weeks * HOUR, hour, rest - hour * HOUR))
+        return self._hours[utc_offset]
+
+    def _seconds_per_hour_of_week(
+        self, mask: "np.ndarray", group: "np.ndarray", n_groups: int, utc_offset: float
+    ) -> "np.ndarray":
+        """Sums the seconds the masked observations last per group and hour of the week.
+
+        The seconds of [start, end) in hour h are C_h(end) - C_h(start), where C_h(t) counts the seconds of hour h
+        in [0, t): 3600 per full week, plus 3600 if t is past hour h of its week or the seconds into it if t is in it.
+        """
+        weights = mask.astype(np.float64)
+        result = np.zeros((n_groups, WEEK_HOURS))
+        for (weeks, hour, partial), sign in zip(
+            self._hours_of_week(utc_offset), (1, -1)
+        ):
+            index = group * WEEK_HOURS + hour
+            # Full weeks count in every hour
+            full = np.bincount(group, weights=weeks * weights, minlength=n_groups)
+            # Hours of the week already passed, i.e. the number of times in a later hour
+            counts = np.bincount(
+                index, weights=weights, minlength=n_groups * WEEK_HOURS
+            ).reshape(n_groups, WEEK_HOURS)
+            later = np.cumsum(counts[:, :0:-1], axis=1)[:, ::-1]
+            # Seconds into the current hour
+            into = np.bincount(
+                index, weights=partial * weights, minlength=n_groups * WEEK_HOURS
+            ).reshape(n_groups, WEEK_HOURS)
+
+            result += sign * (full[:, None] + into)
+            result[:, :-1] += sign * later * HOUR
+        return result
+
+    def heatmap(self, by="service_type", utc_offset: float = 0) -> tuple:
+        """Share of the observed time the services were busy, per group and hour of the week.
+
+        Attributes:
+            by (optional): Group by "service_type", "location_id" or "service_id", or a tuple of them,
+                e.g. ("location_id", "service_type") for a heatmap per location and type.
+            utc_offset (optional): Seconds added to the timestamps to get the local time of the hours.
+
+        Returns:
+            Tuple of the group labels and an array of shape (groups, 168). Hour 0 starts on Monday 00:00,
+            hours without observations are NaN.
+        """
+        service_groups, labels = self._groups(by)
+        group = service_groups[self.service]
+        observed = self._seconds_per_hour_of_week(
+            ~self.faulted, group, len(labels), utc_offset
+        )
+        busy = self._seconds_per_hour_of_week(self.busy, group, len(labels), utc_offset)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            share = np.where(observed > 0, busy / observed, np.nan)
+        return labels, share
+
+    def _runs(self) -> tuple:
+        """Indices of the first and the last observation of every busy run."""
+        busy = self.busy
+        previous_busy = np.append(False, busy[:-1]) & ~self._first
+        next_busy = np.append(busy[1:], False) & ~self._last
+        return np.flatnonzero(busy & ~previous_busy), np.flatnonzero(busy & ~next_busy)
+
+    def cycles(self) -> tuple:
+        """Finished busy runs of the services.
+
+        Returns:
+            Tuple of arrays: index of the service of each cycle in labels["service_id"] and its length in seconds.
+        """
+        start_index, end_index = self._runs()
+        # A run that lasts until the end of the history hasn't finished
+        finished = ~self._last[end_index]
+        lengths = self.end[end_index] - self.start[start_index]
+        return self.service[start_index][finished], lengths[finished]
+
+    def cycle_lengths(self, by="service_type") -> dict:
+        """Average length of a finished cycle in seconds, per group.
+
+        Attributes:
+            by (optional): Group by "service_type", "location_id" or "service_id", or a tuple of them.
+        """
+        service_groups, labels = self._groups(by)
+        service, lengths = self.cycles()
+        group = service_groups[service]
+
+        totals = np.bincount(group, weights=lengths, minlength=len(labels))
+        counts = np.bincount(group, minlength=len(labels))
+        return {
+            label: float(totals[i] / counts[i])
+            for i, label in enumerate(labels)
+            if counts[i] > 0
+        }
+
+    def _free_within(self, seconds: float, now: float) -> "np.ndarray":
+        """Probability of being free within seconds per service, see free_within()."""
+        busy_now = self.busy[self._last]
+        service_type = self._service_groups["service_type"]
+
+        # Start of the ongoing busy run of every service
+        start_index, end_index = self._runs()
+        ongoing = start_index[self._last[end_index]]
+        run_start = np.zeros(len(busy_now))
+        run_start[self.service[ongoing]] = self.start[ongoing]
+        elapsed = now - run_start
+
+        probability = np.where(busy_now | self.faulted[self._last], 0.0, 1.0)
+        cycle_service, lengths = self.cycles()
+        cycle_type = service_type[cycle_service]
+        for code in np.unique(service_type[busy_now]):
+            ended = np.sort(lengths[cycle_type == code])
+            if len(ended) == 0:
+                continue
+            selected = busy_now & (service_type == code)
+            # Survival of the cycle lengths at the elapsed time and seconds later
+            alive = len(ended) - np.searchsorted(ended, elapsed[selected], side="right")
+            later = len(ended) - np.searchsorted(
+                ended, elapsed[selected] + seconds, side="right"
+            )
+            with np.errstate(invalid="ignore", divide="ignore"):
+                probability[selected] = np.where(alive > 0, 1 - later / alive, 1.0)
+        return probability
+
+    def free_within(self, seconds: float, now: float = None) -> dict:
+        """Probability of every service being free within seconds.
+
+        Available services are free already. For a busy service the probability is estimated from the finished
+        cycles of its service type: the share of those that ended within seconds among those that lasted at least
+        as long as the current run so far. Faulted services and types without finished cycles get 0.
+
+        Attributes:
+            seconds: Time span in seconds.
+            now (optional): Timestamp to estimate from. Defaults to until.
+
+        Returns:
+            Dict mapping each service_id to the probability.
+        """
+        probability = self._free_within(seconds, self.until if now == None else now)
+        return dict(zip(self.labels["service_id"].tolist(), probability.tolist()))
+
+    def location_free_within(
+        self, seconds: float, service_type: str = None, now: float = None
+    ) -> dict:
+        """Probability of at least one service of each location being free within seconds.
+
+        Attributes:
+            seconds: Time span in seconds.
+            service_type (optional): Only consider services of this type.
+            now (optional): Timestamp to estimate from. Defaults to until.
+
+        Returns:
+            Dict mapping each location_id to the probability, assuming the services are independent.
+        """
+        probability = self._free_within(seconds, self.until if now == None else now)
+        locations = self._service_groups["location_id"]
+        selected = np.ones(len(locations), dtype=bool)
+        if service_type != None:
+            types = self.labels["service_type"][self._service_groups["service_type"]]
+            selected = types == str(service_type)
+
+        # 1 - product of the probabilities to stay busy, summed as logarithms per location
+        n_locations = len(self.labels["location_id"])
+        with np.errstate(divide="ignore"):
+            log_busy = np.log1p(-np.minimum(probability[selected], 1.0))
+        total = np.bincount(
+            locations[selected], weights=log_busy, minlength=n_locations
+        )
+        present = np.bincount(locations[selected], minlength=n_locations) > 0
+        return {
+            label: 1 - float(np.exp(total[i]))
+            for i, label in enumerate(self.labels["location_id"].tolist())
+            if present[i]
+        }
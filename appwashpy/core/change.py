@@ -0,0 +1,26 @@
+from dataclasses import dataclass
+
+from appwashpy.common.enums import STATE
+from appwashpy.core.service import Service
+
+
+@dataclass
+class ServiceStateChange:
+    """Representation of a state change of an AppWash Service.
+
+    Attributes:
+        service_id: ID of the service.
+        location_id: ID of the location this service belongs to.
+        old_state: State before the change. None if the service hasn't been observed before.
+        new_state: State after the change.
+        session_start: Timestamp of when the current session was started, if the service is active.
+        service: The service as observed after the change.
+
+    """
+
+    service_id: str
+    location_id: str
+    old_state: STATE
+    new_state: STATE
+    session_start: int
+    service: Service
@@ -0,0 +1,195 @@
+import sys
+import time
+from typing import TYPE_CHECKING
+
+from appwashpy.common.enums import LOCATION_TYPE, SERVICE_TYPE, STATE
+from appwashpy.core.pricing import PriceCatalog, index_pricing
+
+# Fix cyclical import because of type annotation
+if TYPE_CHECKING:
+    from appwashpy import AppWash
+    from appwashpy.core.purchase import BuyResult
+
+
+class CompactService:
+    """Memory-compact representation of an AppWash Service.
+
+    Offers the same attributes and methods as Service, but uses __slots__, doesn't keep the client in a
+    per-instance dict and interns strings that repeat across snapshots like IDs, type and state.
+
+    Attributes:
+        service_id: ID of the service.
+        location_id: ID of the location this service belongs to.
+        type: Type of the Service. Known Types: WASHING_MACHINE, DRYER, ELECTRICITY.
+        name: Name of the service.
+        cost_cents: Price of the service in cents.
+        reservable: Whether the service is reservable.
+        state: Current state of the service. Known States: AVAILABLE, OCCUPIED, FAULTED, SESSION_WAIT_ON
+        session_start: Timestamp of when the service was started, if it is currently activate.
+        observed_at: Monotonic time of when the state was loaded.
+
+    """
+
+    __slots__ = (
+        "_client",
+        "service_id",
+        "location_id",
+        "type",
+        "name",
+        "reservable",
+        "state",
+        "session_start",
+        "cost_cents",
+        "observed_at",
+    )
+
+    _client: "AppWash"
+    service_id: str
+    location_id: str
+    type: SERVICE_TYPE
+    name: str
+    cost_cents: int
+    reservable: bool
+    state: STATE
+    session_start: int
+    observed_at: float
+
+    @staticmethod
+    def _from_result(
+        client: "AppWash", result: dict, observed_at: float = None
+    ) -> "CompactService":
+        service = CompactService()
+        service._client = client
+        service.service_id = sys.intern(result["externalId"])
+        service.location_id = sys.intern(result["locationId"])
+        service.type = sys.intern(result["serviceType"])
+        service.name = sys.intern(result["serviceName"])
+        service.reservable = result["reservable"] != "NOT_RESERVABLE"
+        service.state = sys.intern(result["state"])
+        service.session_start = result.get("lastSessionStart")
+        service.observed_at = observed_at if observed_at != None else time.monotonic()
+        # Keep only the price instead of the nested pricing structure
+        service.cost_cents = result["pricing"][0]["componentPriceObjects"][0][
+            "costCents"
+        ]
+        return service
+
+    def _fields(self) -> tuple:
+        return (
+            self.service_id,
+            self.location_id,
+            self.type,
+            self.name,
+            self.cost_cents,
+            self.reservable,
+            self.state,
+            self.session_start,
+        )
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, CompactService):
+            return NotImplemented
+        return self._fields() == other._fields()
+
+    def __repr__(self) -> str:
+        return (
+            f"CompactService(service_id={self.service_id!r}, location_id={self.location_id!r}, "
+            f"type={self.type!r}, name={self.name!r}, cost_cents={self.cost_cents!r}, "
+            f"reservable={self.reservable!r}, state={self.state!r}, session_start={self.session_start!r})"
+        )
+
+    def buy(self, safe: bool = True) -> "BuyResult":
+        """Buys the service.
+
+        Be careful, calling this function multiple times cancels the previous service and bill you again.
+        No warranty for freedom from errors and no compensation for damages incurred.
+
+        Returns:
+            BuyResult telling whether the service was bought sucessfully.
+        """
+        return self._client.buy_service(self.service_id, safe, service=self)
+
+    def stop(self) -> None:
+        """Stops the service."""
+        self._client.stop_service(self.service_id)
+
+
+class CompactLocation:
+    """Memory-compact representation of an AppWash location.
+
+    Offers the same attributes as Location, but uses __slots__ and interns the repeating strings. Only the
+    decoded fields are kept, not the raw services and pricing they are decoded from.
+
+    Attributes:
+        id: ID of the Location
+        location_type: Which type of location it is.
+        services: List of dicsts of available services at the location. Dicts contains "service" and "costs_cent" keys.
+        name: Name of the location.
+        reservable: Whether you can reserve services at the location
+        reservable_days_in_advance: How much days in advance you can reserve if allowed.
+
+    """
+
+    __slots__ = (
+        "id",
+        "location_type",
+        "location_status",
+        "services",
+        "name",
+        "reservable",
+        "reservable_days_in_advance",
+    )
+
+    id: str
+    location_type: LOCATION_TYPE
+    location_status: str
+    services: list
+    name: str
+    reservable: bool
+    reservable_days_in_advance: int
+
+    @staticmethod
+    def _from_result(result: dict, catalog: PriceCatalog = None) -> "CompactLocation":
+        if catalog != None:
+            pricing = catalog.add_location(result["externalId"], result["pricing"])
+        else:
+            pricing = index_pricing(result["pricing"])
+
+        location = CompactLocation()
+        location.id = result["externalId"]
+        location.location_type = sys.intern(result["locationTypeV2"])
+        location.location_status = sys.intern(result["locationStatus"])
+        location.services = [
+            {
+                "service": sys.intern(service["type"]),
+                "costs_cent": pricing[service["type"]],
+            }
+            for service in result["services"]
+        ]
+        location.name = result["name"]
+        location.reservable = result["reservedType"] != "NOT_RESERVABLE"
+        location.reservable_days_in_advance = result["maxDaysInAdvance"]
+        return location
+
+    def _fields(self) -> tuple:
+        return (
+            self.id,
+            self.location_type,
+            self.location_status,
+            self.services,
+            self.name,
+            self.reservable,
+            self.reservable_days_in_advance,
+        )
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, CompactLocation):
+            return NotImplemented
+        return self._fields() == other._fields()
+
+    def __repr__(self) -> str:
+        return (
+            f"CompactLocation(id={self.id!r}, location_type={self.location_type!r}, "
+            f"location_status={self.location_status!r}, services={self.services!r}, name={self.name!r}, "
+            f"reservable={self.reservable!r}, reservable_days_in_advance={self.reservable_days_in_advance!r})"
+        )
@@ -0,0 +1,51 @@
+import threading
+from dataclasses import dataclass, field
+
+from appwashpy.common.enums import SERVICE_TYPE
+from appwashpy.core.purchase import BuyResult
+
+# Lifecycle of a BuyIntent
+INTENT_PENDING = "pending"
+INTENT_BOUGHT = "bought"
+INTENT_CANCELLED = "cancelled"
+# Starting the service failed in a way that doesn't tell whether it was started, e.g. a timeout
+INTENT_UNKNOWN = "unknown"
+
+
+@dataclass(eq=False)
+class BuyIntent:
+    """Pending wish to buy the next available service of a type at a location.
+
+    Attributes:
+        intent_id: Sequence number of the intent, intents are served in this order.
+        location_id: ID of the location.
+        service_type: Type of the service to buy. Any type if None.
+        status: "pending", "bought", "cancelled" or "unknown" if it isn't known whether the service was started.
+        service_id: ID of the bought service.
+        result: BuyResult of the purchase.
+        error: Last error raised while buying a service for the intent.
+        attempts: Number of services the intent tried to buy.
+
+    """
+
+    intent_id: int
+    location_id: str
+    service_type: SERVICE_TYPE = None
+    status: str = INTENT_PENDING
+    service_id: str = None
+    result: BuyResult = None
+    error: Exception = None
+    attempts: int = 0
+    _done: threading.Event = field(default_factory=threading.Event, repr=False)
+
+    @property
+    def done(self) -> bool:
+        return self._done.is_set()
+
+    def wait(self, timeout: float = None) -> bool:
+        """Blocks until the intent is bought, cancelled or its outcome is unknown. Returns whether it is done."""
+        return self._done.wait(timeout)
+
+    def _finish(self, status: str) -> None:
+        self.status = status
+        self._done.set()
@@ -1,6 +1,7 @@
 from dataclasses import dataclass
 
 from appwashpy.common.enums import LOCATION_TYPE
+from appwashpy.core.pricing import PriceCatalog, index_pricing
 
 
 @dataclass
@@ -26,15 +27,18 @@ class Location:
     reservable_days_in_advance: int
 
     @staticmethod
-    def _from_result(result: dict) -> "Location":
+    def _from_result(result: dict, catalog: PriceCatalog = None) -> "Location":
+        # Index the prices by service type once instead of searching them for every service
+        if catalog != None:
+            pricing = catalog.add_location(result["externalId"], result["pricing"])
+        else:
+            pricing = index_pricing(result["pricing"])
+
         services = []
         for service in result["services"]:
-            # Get price of service
-            price = list(
-                filter(lambda p: p["serviceType"] == service["type"], result["pricing"])
-            )[0]
-
-            services.append({"service": service["type"], "costs_cent": price})
+            services.append(
+                {"service": service["type"], "costs_cent": pricing[service["type"]]}
+            )
 
         return Location(
             id=result["externalId"],
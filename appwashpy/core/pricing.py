@@ -0,0 +1,69 @@
+import json
+import threading
+
+from appwashpy.common.enums import SERVICE_TYPE
+
+
+def index_pricing(pricing: list) -> dict:
+    """Indexes the pricing entries of a location by their serviceType in one pass.
+
+    If a serviceType has several entries, the first one is used.
+    """
+    index = {}
+    for price in pricing:
+        index.setdefault(price["serviceType"], price)
+    return index
+
+
+class PriceCatalog:
+    """Catalog of the prices of all loaded locations.
+
+    Identical tariffs are interned, so locations with the same tariff share one pricing dict,
+    which therefore must be treated as read-only. Prices are indexed by location and service type.
+    """
+
+    def __init__(self):
+        self._tariffs = {}
+        self._prices = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._prices)
+
+    def intern(self, price: dict) -> dict:
+        """Returns the catalog's instance of an identical pricing entry, adding the entry if it is new."""
+        key = json.dumps(price, sort_keys=True)
+        with self._lock:
+            return self._tariffs.setdefault(key, price)
+
+    def add_location(self, location_id: str, pricing: list) -> dict:
+        """Interns and indexes the pricing entries of a location, replacing previous prices of it.
+
+        Returns:
+            Dict mapping each serviceType to its interned pricing entry.
+        """
+        index = {
+            service_type: self.intern(price)
+            for service_type, price in index_pricing(pricing).items()
+        }
+        with self._lock:
+            self._prices[location_id] = {
+                service_type: price["componentPriceObjects"][0]["costCents"]
+                for service_type, price in index.items()
+            }
+        return index
+
+    def cost_cents(self, location_id: str, service_type: SERVICE_TYPE) -> int:
+        """Price of a service type at a location in cents, None if unknown."""
+        return self._prices.get(location_id, {}).get(str(service_type))
+
+    def locations_below(self, service_type: SERVICE_TYPE, max_cents: int) -> list[str]:
+        """IDs of the loaded locations where the service type costs less than max_cents, cheapest first."""
+        service_type = str(service_type)
+        with self._lock:
+            matches = [
+                (prices[service_type], location_id)
+                for location_id, prices in self._prices.items()
+                if prices.get(service_type, max_cents) < max_cents
+            ]
+        return [location_id for _, location_id in sorted(matches)]
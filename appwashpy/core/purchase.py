@@ -0,0 +1,49 @@
+from dataclasses import dataclass
+
+from appwashpy.common.enums import STATE
+
+# Where safe buy_service took the state of the service from
+STATE_FROM_SERVICE = "service"
+STATE_FROM_CACHE = "cache"
+STATE_FROM_NETWORK = "network"
+STATE_UNCHECKED = "unchecked"
+
+
+@dataclass(eq=False)
+class BuyResult:
+    """Result of buying an AppWash Service.
+
+    Is truthy and compares equal to True if the service was bought, so it can be used like the bool returned before.
+
+    Attributes:
+        service_id: ID of the service.
+        bought: Whether the service was bought.
+        state: State the safe check was based on. None if the service was bought without checking.
+        state_source: Where the checked state came from: "service", "cache", "network" or "unchecked".
+        state_age: Seconds since the checked state was observed.
+
+    """
+
+    service_id: str
+    bought: bool
+    state: STATE
+    state_source: str
+    state_age: float
+
+    def __bool__(self) -> bool:
+        return self.bought
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, bool):
+            return self.bought == other
+        if isinstance(other, BuyResult):
+            return (
+                self.service_id,
+                self.bought,
+                self.state,
+                self.state_source,
+            ) == (other.service_id, other.bought, other.state, other.state_source)
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash(self.bought)
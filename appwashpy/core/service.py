@@ -1,3 +1,4 @@
+import time
 from dataclasses import dataclass, field
 from typing import TYPE_CHECKING
 
@@ -6,6 +7,7 @@ from appwashpy.common.enums import SERVICE_TYPE, STATE
 # Fix cyclical import because of type annotation
 if TYPE_CHECKING:
     from appwashpy import AppWash
+    from appwashpy.core.purchase import BuyResult
 
 
 @dataclass
@@ -21,6 +23,7 @@ class Service:
         reservable: Whether the service is reservable.
         state: Current state of the service. Known States: AVAILABLE, OCCUPIED, FAULTED, SESSION_WAIT_ON
         session_start: Timestamp of when the service was started, if it is currently activate.
+        observed_at: Monotonic time of when the state was loaded.
 
     """
 
@@ -33,9 +36,14 @@ class Service:
     reservable: bool
     state: STATE
     session_start: int
+    observed_at: float = field(
+        default_factory=time.monotonic, repr=False, compare=False
+    )
 
     @staticmethod
-    def _from_result(client: "AppWash", result: dict) -> "Service":
+    def _from_result(
+        client: "AppWash", result: dict, observed_at: float = None
+    ) -> "Service":
         return Service(
             _client=client,
             service_id=result["externalId"],
@@ -44,22 +52,23 @@ class Service:
             name=result["serviceName"],
             cost_cents=result["pricing"][0]["componentPriceObjects"][0]["costCents"],
             reservable=False if result["reservable"] == "NOT_RESERVABLE" else True,
-            session_start=result["lastSessionStart"]
-            if "lastSessionStart" in result
-            else None,
+            session_start=(
+                result["lastSessionStart"] if "lastSessionStart" in result else None
+            ),
             state=result["state"],
+            observed_at=observed_at if observed_at != None else time.monotonic(),
         )
 
-    def buy(self, safe: bool = True) -> bool:
+    def buy(self, safe: bool = True) -> "BuyResult":
         """Buys the service.
 
         Be careful, calling this function multiple times cancels the previous service and bill you again.
         No warranty for freedom from errors and no compensation for damages incurred.
 
         Returns:
-            Whether the service was bought sucessfully.
+            BuyResult telling whether the service was bought sucessfully.
         """
-        return self._client.buy_service(self.service_id, safe)
+        return self._client.buy_service(self.service_id, safe, service=self)
 
     def stop(self) -> None:
         """Buys the service."""
@@ -0,0 +1,433 @@
+"""Local simulator of the AppWash API for load tests without the real backend.
+
+Point a client at it by overriding the base URL:
+
+    with Simulator(locations=10, services_per_location=500) as simulator:
+        appwash = AppWash("example@mail.org", "password", base_url=simulator.base_url)
+"""
+
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Union
+
+from appwashpy.client.requests import endpoint_type
+from appwashpy.common.enums import ENDPOINT, SERVICE_TYPE, STATE
+
+# Error codes answered by the simulator. 33 and 61 are those of the real API, the others are stand-ins
+ERROR_TOKEN_EXPIRED = 1
+ERROR_SERVICE_UNAVAILABLE = 21
+ERROR_NOT_FOUND = 33
+ERROR_LOGIN_FAILED = 61
+
+ERROR_DESCRIPTIONS = {
+    ERROR_TOKEN_EXPIRED: "Your session has expired. Please log in again. (code 1)",
+    ERROR_SERVICE_UNAVAILABLE: "This service is not available. (code 21)",
+    ERROR_NOT_FOUND: "We couldn't find this location. Please try again later. (code 33)",
+    ERROR_LOGIN_FAILED: "Login failed. Please check your username and password. (code 61)",
+}
+
+PRICES = {
+    SERVICE_TYPE.WASHING_MACHINE.name: 275,
+    SERVICE_TYPE.DRYER.name: 225,
+}
+
+# States in which a session is running and its start is reported
+ACTIVE_STATES = (STATE.OCCUPIED.name, STATE.SESSION_WAIT_ON.name, STATE.STOPPABLE.name)
+
+PATH_ID = re.compile(r"/([^/]+)(?:/connectorsv2|/start|/stop)?$")
+
+
+def constant_latency(seconds: float) -> Callable[[random.Random], float]:
+    """Every response is delayed by the same number of seconds."""
+    return lambda rng: seconds
+
+
+def uniform_latency(low: float, high: float) -> Callable[[random.Random], float]:
+    """Responses are delayed uniformly between low and high seconds."""
+    return lambda rng: rng.uniform(low, high)
+
+
+def lognormal_latency(
+    median: float, sigma: float = 0.5
+) -> Callable[[random.Random], float]:
+    """Responses are delayed log-normally around median seconds, giving the long tail of a real API."""
+    return lambda rng: median * rng.lognormvariate(0, sigma)
+
+
+class SimulatedService:
+    """A machine of the simulator moving through the STATE values.
+
+    Starting an AVAILABLE machine puts it into SESSION_WAIT_ON, after session_wait seconds it runs as STOPPABLE
+    and after cycle seconds it is AVAILABLE again. Stopping ends the session at once.
+    Machines used by other customers are OCCUPIED until busy_until.
+    """
+
+    def __init__(
+        self,
+        service_id: str,
+        location_id: str,
+        service_type: str,
+        state: str = STATE.AVAILABLE.name,
+        busy_until: float = 0,
+    ):
+        self.service_id = service_id
+        self.location_id = location_id
+        self.service_type = service_type
+        self.state = state
+        self.busy_until = busy_until
+        self.started_at = 0
+
+    def advance(self, now: float, session_wait: float, cycle: float) -> None:
+        """Applies the transitions that happened until now."""
+        if self.state == STATE.OCCUPIED.name and now >= self.busy_until:
+            self.state = STATE.AVAILABLE.name
+        elif self.state in (STATE.SESSION_WAIT_ON.name, STATE.STOPPABLE.name):
+            if now >= self.started_at + cycle:
+                self.state = STATE.AVAILABLE.name
+            elif now >= self.started_at + session_wait:
+                self.state = STATE.STOPPABLE.name
+
+    def start(self, now: float) -> bool:
+        if self.state != STATE.AVAILABLE.name:
+            return False
+        self.state = STATE.SESSION_WAIT_ON.name
+        self.started_at = now
+        return True
+
+    def stop(self) -> bool:
+        if self.state not in (STATE.SESSION_WAIT_ON.name, STATE.STOPPABLE.name):
+            return False
+        self.state = STATE.AVAILABLE.name
+        return True
+
+    def to_result(self) -> dict:
+        service_type = self.service_type
+        result = {
+            "externalId": self.service_id,
+            "locationId": self.location_id,
+            "location": f"Simulated Location {self.location_id}",
+            "serviceType": service_type,
+            "serviceName": service_type.replace("_", " ").title(),
+            "state": self.state,
+            "pricing": [_pricing(service_type)],
+            "reservable": "NOT_RESERVABLE",
+            "blockTimeSeconds": 900,
+        }
+        if self.state in ACTIVE_STATES:
+            result["lastSessionStart"] = int(self.started_at)
+        return result
+
+
+class SimulatorHandler(BaseHTTPRequestHandler):
+    # Keep-alive requires HTTP/1.1 and a Content-Length on every response
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        self._reply(None)
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        body = self.rfile.read(length)
+        self._reply(json.loads(body) if body else None)
+
+    def _reply(self, body: dict) -> None:
+        path = self.path.split("?", 1)[0]
+        prefix = self.server.path_prefix
+        if path.startswith(prefix):
+            path = path[len(prefix) :]
+        # The client joins the base URL and the endpoint with a double slash
+        endpoint = "/" + path.lstrip("/")
+
+        status, result = self.server.handle(endpoint, body, self.headers.get("token"))
+        content = json.dumps(result).encode()
+
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class Simulator(ThreadingHTTPServer):
+    """Threaded simulator of the AppWash API listening on localhost.
+
+    The state of the machines and the validity of tokens follow clock, so tests can fast-forward time.
+    Faults are injected per request: with error_rate an errorCode out of error_codes is answered,
+    with http_error_rate an HTTP 503.
+
+    Attributes:
+        locations (optional): Number of synthetic locations, their IDs count up from first_location_id.
+        services_per_location (optional): Number of machines per location, alternating washing machines and dryers.
+        occupancy (optional): Share of machines initially OCCUPIED by other customers.
+        faulted (optional): Share of machines in state FAULTED.
+        accounts (optional): Dict mapping email to password. Any login succeeds if None, otherwise others fail with code 61.
+        token_lifetime (optional): Seconds a token is valid. Requests with an expired token fail with ERROR_TOKEN_EXPIRED.
+        latency (optional): Callable returning the delay of a response in seconds, or a dict mapping an ENDPOINT to one.
+        error_rate (optional): Probability of a request failing with one of error_codes.
+        error_codes (optional): Error codes injected by error_rate.
+        http_error_rate (optional): Probability of a request failing with HTTP 503.
+        session_wait (optional): Seconds a started machine stays in SESSION_WAIT_ON.
+        cycle (optional): Seconds from starting a machine until it is AVAILABLE again.
+        seed (optional): Seed of the random generator, for reproducible runs.
+        clock (optional): Callable returning the current timestamp in seconds.
+        first_location_id (optional): ID of the first location.
+        port (optional): Port to listen on, a free one if 0.
+        request_count: Number of requests handled.
+    """
+
+    daemon_threads = True
+    path_prefix = "/api-rest/"
+
+    def __init__(
+        self,
+        locations: int = 1,
+        services_per_location: int = 20,
+        occupancy: float = 0.3,
+        faulted: float = 0.0,
+        accounts: dict = None,
+        token_lifetime: float = 86400,
+        latency: Union[Callable, dict] = None,
+        error_rate: float = 0.0,
+        error_codes: tuple = (ERROR_NOT_FOUND,),
+        http_error_rate: float = 0.0,
+        session_wait: float = 60,
+        cycle: float = 3600,
+        seed: int = None,
+        clock: Callable[[], float] = time.time,
+        first_location_id: int = 10000,
+        port: int = 0,
+    ):
+        super().__init__(("127.0.0.1", port), SimulatorHandler)
+        self.accounts = accounts
+        self.token_lifetime = token_lifetime
+        self.latency = latency
+        self.error_rate = error_rate
+        self.error_codes = tuple(error_codes)
+        self.http_error_rate = http_error_rate
+        self.session_wait = session_wait
+        self.cycle = cycle
+        self.clock = clock
+        self.request_count = 0
+
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._tokens = {}
+        self._token_counter = 0
+        self._session_counter = 0
+        self._locations = {}
+        self._services = {}
+
+        now = clock()
+        for i in range(locations):
+            location_id = str(first_location_id + i)
+            services = []
+            for j in range(services_per_location):
+                service_type = (
+                    SERVICE_TYPE.DRYER.name
+                    if j % 2
+                    else SERVICE_TYPE.WASHING_MACHINE.name
+                )
+                service = SimulatedService(
+                    f"{location_id}{j:05d}", location_id, service_type
+                )
+                roll = self._random.random()
+                if roll < faulted:
+                    service.state = STATE.FAULTED.name
+                elif roll < faulted + occupancy:
+                    service.state = STATE.OCCUPIED.name
+                    service.busy_until = now + self._random.uniform(0, cycle)
+                    # The other customer started it one cycle before it is free again
+                    service.started_at = service.busy_until - cycle
+                services.append(service)
+                self._services[service.service_id] = service
+            self._locations[location_id] = services
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}{self.path_prefix}"
+
+    @property
+    def location_ids(self) -> list[str]:
+        return list(self._locations)
+
+    def services_of(self, location_id: str) -> list[SimulatedService]:
+        """The machines of a location."""
+        return self._locations[location_id]
+
+    def expire_tokens(self) -> None:
+        """Invalidates all issued tokens, as if they had expired."""
+        with self._lock:
+            self._tokens.clear()
+
+    def _envelope(self, error_code: int = 0, data=None) -> dict:
+        result = {
+            "errorCode": error_code,
+            "errorDescription": ERROR_DESCRIPTIONS.get(error_code, ""),
+            "token_expire_ts": 0,
+            "serverTime": int(self.clock()),
+        }
+        if data != None:
+            result["data"] = data
+        return result
+
+    def _delay(self, endpoint: ENDPOINT) -> float:
+        latency = self.latency
+        if isinstance(latency, dict):
+            latency = latency.get(endpoint)
+        return latency(self._random) if latency != None else 0
+
+    def handle(self, path: str, body: dict, token: str) -> tuple:
+        """Answers a request to path. Returns the HTTP status and the result."""
+        endpoint = endpoint_type(path)
+        with self._lock:
+            self.request_count += 1
+            delay = self._delay(endpoint)
+            http_error = self._random.random() < self.http_error_rate
+            injected = self._random.random() < self.error_rate
+            error_code = self._random.choice(self.error_codes) if injected else 0
+        if delay > 0:
+            time.sleep(delay)
+
+        if http_error:
+            return 503, {}
+        if error_code != 0:
+            return 200, self._envelope(error_code)
+
+        with self._lock:
+            now = self.clock()
+            if endpoint == ENDPOINT.LOGIN:
+                return 200, self._login(body or {}, now)
+
+            expiry = self._tokens.get(token)
+            if expiry == None or expiry <= now:
+                return 200, self._envelope(ERROR_TOKEN_EXPIRED)
+
+            match = PATH_ID.search(path)
+            key = match.group(1) if match else None
+            if endpoint == ENDPOINT.LOCATION:
+                return 200, self._location(key)
+            if endpoint == ENDPOINT.SERVICES:
+                return 200, self._list_services(
+                    key, now, (body or {}).get("serviceType")
+                )
+            if endpoint == ENDPOINT.SERVICE:
+                return 200, self._service(key, now)
+            if endpoint == ENDPOINT.START:
+                return 200, self._start(key, now)
+            if endpoint == ENDPOINT.STOP:
+                return 200, self._stop(key, now)
+        return 404, {}
+
+    def _login(self, body: dict, now: float) -> dict:
+        email, password = body.get("email"), body.get("password")
+        if self.accounts != None and self.accounts.get(email) != password:
+            return self._envelope(ERROR_LOGIN_FAILED)
+
+        self._token_counter += 1
+        token = f"simulated:{self._token_counter}"
+        expiry = int(now + self.token_lifetime)
+        self._tokens[token] = expiry
+
+        result = self._envelope()
+        result["token_expire_ts"] = expiry
+        result["activeSessions"] = []
+        result["login"] = {"email": email, "externalId": "123456789", "token": token}
+        return result
+
+    def _location(self, location_id: str) -> dict:
+        if location_id not in self._locations:
+            return self._envelope(ERROR_NOT_FOUND)
+        return self._envelope(
+            data={
+                "name": f"Simulated Location {location_id}",
+                "externalId": location_id,
+                "locationTypeV2": "OTHER",
+                "locationStatus": "PRODUCTION_PHASE",
+                "services": [
+                    {"type": SERVICE_TYPE.DRYER.name, "name": "Dryer"},
+                    {
+                        "type": SERVICE_TYPE.WASHING_MACHINE.name,
+                        "name": "Washing Machine",
+                    },
+                ],
+                "pricing": [_pricing(service_type) for service_type in PRICES],
+                "maxDaysInAdvance": 7,
+                "reservedType": "NOT_RESERVABLE",
+            }
+        )
+
+    def _list_services(self, location_id: str, now: float, service_type: str) -> dict:
+        if location_id not in self._locations:
+            return self._envelope(ERROR_NOT_FOUND)
+        results = []
+        for service in self._locations[location_id]:
+            service.advance(now, self.session_wait, self.cycle)
+            if service_type == None or service.service_type == service_type:
+                results.append(service.to_result())
+        return self._envelope(data=results)
+
+    def _service(self, service_id: str, now: float) -> dict:
+        service = self._services.get(service_id)
+        if service == None:
+            return self._envelope(ERROR_NOT_FOUND)
+        service.advance(now, self.session_wait, self.cycle)
+        return self._envelope(data=service.to_result())
+
+    def _start(self, service_id: str, now: float) -> dict:
+        service = self._services.get(service_id)
+        if service == None:
+            return self._envelope(ERROR_NOT_FOUND)
+        service.advance(now, self.session_wait, self.cycle)
+        if not service.start(now):
+            return self._envelope(ERROR_SERVICE_UNAVAILABLE)
+        self._session_counter += 1
+        return self._envelope(
+            data={
+                "sessionId": str(self._session_counter),
+                "externalId": service_id,
+                "locationExternalId": service.location_id,
+                "serviceType": service.service_type,
+                "startDateTime": int(now),
+                "endDateTime": 0,
+                "state": service.state,
+            }
+        )
+
+    def _stop(self, service_id: str, now: float) -> dict:
+        service = self._services.get(service_id)
+        if service == None:
+            return self._envelope(ERROR_NOT_FOUND)
+        service.advance(now, self.session_wait, self.cycle)
+        if not service.stop():
+            return self._envelope(ERROR_SERVICE_UNAVAILABLE)
+        return self._envelope()
+
+    def __enter__(self) -> "Simulator":
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.shutdown()
+        self.server_close()
+
+
+def _pricing(service_type: str) -> dict:
+    cost_cents = PRICES.get(service_type, 0)
+    return {
+        "serviceType": service_type,
+        "componentPriceObjects": [
+            {
+                "type": "UNIT_PRICE",
+                "priceString": f"EUR {cost_cents / 100:.2f}",
+                "costCents": cost_cents,
+            }
+        ],
+    }
@@ -0,0 +1,70 @@
+"""Time to compute occupancy heatmaps, cycle lengths and free-within estimates over a synthetic history.
+
+Every machine alternates between AVAILABLE and OCCUPIED with random durations, recorded as transitions.
+
+Usage:
+    python benchmarks/bench_analytics.py [--machines 10000] [--days 365] [--cycles-per-day 3]
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from appwashpy.core.analytics import OccupancyAnalytics
+
+START = 1640995200  # 2022-01-01
+
+
+def history(machines: int, days: int, cycles_per_day: float, seed: int = 0) -> tuple:
+    rng = np.random.default_rng(seed)
+    per_machine = int(days * cycles_per_day) * 2
+    gaps = np.empty((machines, per_machine))
+    gaps[:, 0::2] = rng.exponential(
+        86400 / cycles_per_day, (machines, per_machine // 2)
+    )
+    gaps[:, 1::2] = rng.normal(3600, 600, (machines, per_machine // 2)).clip(600)
+    observed_at = START + np.cumsum(gaps, axis=1)
+
+    # Integer IDs, decoding millions of string IDs from a database dominates the runtime otherwise
+    service_ids = np.repeat(np.arange(machines), per_machine)
+    location_ids = np.repeat(np.arange(machines) // 50, per_machine)
+    service_types = np.repeat(
+        np.where(np.arange(machines) % 2, "DRYER", "WASHING_MACHINE"), per_machine
+    )
+    states = np.tile(["OCCUPIED", "AVAILABLE"], machines * per_machine // 2)
+    return service_ids, location_ids, service_types, states, observed_at.ravel()
+
+
+def timed(name: str, function):
+    start = time.perf_counter()
+    result = function()
+    print(f"{name:<28} {time.perf_counter() - start:8.3f} s")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--machines", type=int, default=10000)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--cycles-per-day", type=float, default=3)
+    args = parser.parse_args()
+
+    columns = history(args.machines, args.days, args.cycles_per_day)
+    print(f"{len(columns[0]):,} transitions of {args.machines:,} machines")
+    until = START + args.days * 86400
+
+    analytics = timed("load", lambda: OccupancyAnalytics(*columns, until=until))
+    timed("heatmap by type", lambda: analytics.heatmap())
+    timed(
+        "heatmap by location, type",
+        lambda: analytics.heatmap(("location_id", "service_type")),
+    )
+    timed("heatmap by machine", lambda: analytics.heatmap("service_id"))
+    timed("cycle lengths", lambda: analytics.cycle_lengths())
+    timed("free within 30 min", lambda: analytics.free_within(1800))
+    timed("location free within 30 min", lambda: analytics.location_free_within(1800))
+
+
+if __name__ == "__main__":
+    main()
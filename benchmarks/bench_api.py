@@ -0,0 +1,128 @@
+"""Throughput and latency of services(), location() and buy_service() over HTTP against the stub server.
+
+Every operation runs through the real request path (pooled session, retries, circuit breaker) of one shared
+client at each concurrency level. Coalescing is disabled, so every call is an actual request. The payload size,
+i.e. the number of connectors, only affects services().
+
+Results are printed as JSON, one object per operation, payload size and concurrency. Pass --baseline with the
+output of a previous run to add the relative change of throughput and p99 latency.
+
+Usage:
+    python benchmarks/bench_api.py [--calls 200] [--sizes 2 100 1000] [--concurrency 1 4 16]
+                                   [--output results.json] [--baseline previous.json]
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from appwashpy import AppWash
+from payloads import EMAIL, LOCATION_ID, PASSWORD, SERVICE_ID
+from stub_server import StubServer
+
+OPERATIONS = {
+    "services": lambda client: client.services(LOCATION_ID),
+    "location": lambda client: client.location(LOCATION_ID),
+    "buy_service": lambda client: client.buy_service(SERVICE_ID),
+}
+
+
+def percentile(latencies: list, q: float) -> float:
+    return latencies[min(int(len(latencies) * q), len(latencies) - 1)]
+
+
+def measure(client: AppWash, operation, calls: int, concurrency: int) -> dict:
+    def call(_):
+        start = time.perf_counter()
+        operation(client)
+        return time.perf_counter() - start
+
+    with ThreadPoolExecutor(concurrency) as executor:
+        # Warm up the connections of every worker
+        list(executor.map(call, range(concurrency)))
+        start = time.perf_counter()
+        latencies = sorted(executor.map(call, range(calls)))
+        elapsed = time.perf_counter() - start
+
+    return {
+        "calls": calls,
+        "seconds": round(elapsed, 6),
+        "throughput": round(calls / elapsed, 2),
+        "mean_ms": round(statistics.mean(latencies) * 1000, 3),
+        "p50_ms": round(percentile(latencies, 0.5) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 3),
+    }
+
+
+def compare(results: list, baseline: list) -> None:
+    """Adds the relative change against the matching results of a previous run."""
+    previous = {(r["operation"], r["services"], r["concurrency"]): r for r in baseline}
+    for result in results:
+        old = previous.get(
+            (result["operation"], result["services"], result["concurrency"])
+        )
+        if old != None:
+            result["throughput_change"] = round(
+                result["throughput"] / old["throughput"] - 1, 4
+            )
+            result["p99_change"] = round(result["p99_ms"] / old["p99_ms"] - 1, 4)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[2, 100, 1000])
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--operations", nargs="+", default=list(OPERATIONS))
+    parser.add_argument("--output", help="File to write the JSON results to")
+    parser.add_argument("--baseline", help="JSON results of a previous run")
+    args = parser.parse_args()
+
+    results = []
+    with StubServer() as server:
+        for concurrency in args.concurrency:
+            with AppWash(
+                EMAIL,
+                PASSWORD,
+                base_url=server.base_url,
+                pool_maxsize=concurrency,
+                coalesce=False,
+            ) as client:
+                for name in args.operations:
+                    sizes = args.sizes if name == "services" else [server.service_count]
+                    for size in sizes:
+                        server.service_count = size
+                        result = {
+                            "operation": name,
+                            "services": size,
+                            "concurrency": concurrency,
+                        }
+                        result.update(
+                            measure(client, OPERATIONS[name], args.calls, concurrency)
+                        )
+                        results.append(result)
+                        print(
+                            f"{name:<12} services {size:>5}  concurrency {concurrency:>3}  "
+                            f"{result['throughput']:9.1f}/s  p50 {result['p50_ms']:8.3f} ms  "
+                            f"p99 {result['p99_ms']:8.3f} ms",
+                            file=sys.stderr,
+                        )
+                    server.service_count = 2
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            compare(results, json.load(file))
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(output + "\n")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""Import time of appwashpy in fresh interpreters, checked against a regression budget.
+
+Each import statement is timed in a new interpreter, so nothing is cached in sys.modules. The median time of
+each statement is compared with its budget, and `import appwashpy` must not load the heavy dependencies at all.
+Exits with 1 if a budget is exceeded, so it can run in CI. `python -X importtime -c "import appwashpy"` shows
+which module is responsible.
+
+Results are printed as JSON, one object per target.
+
+Usage:
+    python benchmarks/bench_import.py [--runs 20] [--budget-scale 1.0] [--output results.json]
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+# Import statements and their budgets in milliseconds
+TARGETS = {
+    "import appwashpy": 25,
+    "from appwashpy import STATE, SERVICE_TYPE": 25,
+    "import appwashpy.cli": 80,
+    # Not lazy by design, measured for comparison
+    "from appwashpy import AppWash": None,
+}
+
+# Modules that `import appwashpy` must not load
+HEAVY_MODULES = ("requests", "urllib3", "aiohttp", "numpy", "sqlite3", "orjson")
+
+
+def import_time(statement: str) -> float:
+    """Milliseconds the statement takes in a fresh interpreter."""
+    code = f"import time\nstart = time.perf_counter()\n{statement}\nprint(time.perf_counter() - start)"
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    return float(result.stdout) * 1000
+
+
+def loaded_heavy_modules() -> list:
+    result = subprocess.run(
+        [sys.executable, "-c", "import sys, appwashpy; print(' '.join(sys.modules))"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    modules = set(result.stdout.split())
+    return [module for module in HEAVY_MODULES if module in modules]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument(
+        "--budget-scale",
+        type=float,
+        default=1.0,
+        help="Multiplies every budget, e.g. for slow CI machines",
+    )
+    parser.add_argument("--output", help="Also write the results to this file")
+    args = parser.parse_args()
+
+    # Warm up the file system cache, the first run is always slower
+    import_time("import appwashpy")
+
+    results = []
+    for statement, budget in TARGETS.items():
+        times = sorted(import_time(statement) for _ in range(args.runs))
+        result = {
+            "statement": statement,
+            "runs": args.runs,
+            "median_ms": round(statistics.median(times), 3),
+            "min_ms": round(times[0], 3),
+            "max_ms": round(times[-1], 3),
+        }
+        if budget != None:
+            result["budget_ms"] = budget * args.budget_scale
+            result["ok"] = result["median_ms"] <= result["budget_ms"]
+        results.append(result)
+        print(json.dumps(result))
+
+    heavy = loaded_heavy_modules()
+    print(json.dumps({"statement": "import appwashpy", "heavy_modules": heavy}))
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump({"results": results, "heavy_modules": heavy}, file, indent=2)
+
+    return 0 if not heavy and all(r.get("ok", True) for r in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,78 @@
+"""Decode time, time to first service and peak memory of the connectorsv2 decoding paths.
+
+Compares decoding the whole body with the json module, with orjson (if installed) and
+incrementally with JsonArrayStream as used by AppWash.iter_services().
+
+Usage:
+    python benchmarks/bench_json.py [--sizes 100 1000 10000]
+"""
+
+import argparse
+import json
+import time
+import tracemalloc
+
+import payloads
+from appwashpy.common.serialization import JsonArrayStream
+from appwashpy.common.settings import STREAM_CHUNK_SIZE
+from appwashpy.core.service import Service
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def full(loads):
+    def decode(body: bytes):
+        for result in loads(body)["data"]:
+            yield Service._from_result(None, result)
+
+    return decode
+
+
+def streamed(body: bytes):
+    chunks = (
+        body[i : i + STREAM_CHUNK_SIZE] for i in range(0, len(body), STREAM_CHUNK_SIZE)
+    )
+    for result in JsonArrayStream(chunks, "data"):
+        yield Service._from_result(None, result)
+
+
+def measure(decode, body: bytes) -> tuple:
+    """Returns total seconds, seconds to the first service and peak bytes allocated while consuming the services."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    first = None
+    for _ in decode(body):
+        if first == None:
+            first = time.perf_counter() - start
+    total = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return total, first, peak
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000])
+    args = parser.parse_args()
+
+    paths = [("json", full(json.loads))]
+    if orjson != None:
+        paths.append(("orjson", full(orjson.loads)))
+    paths.append(("streamed", streamed))
+
+    for size in args.sizes:
+        body = json.dumps(payloads.services(size)).encode()
+        print(f"{size} services, {len(body) / 1024:.0f} KiB")
+        for name, decode in paths:
+            total, first, peak = measure(decode, body)
+            print(
+                f"  {name:<10} total {total * 1000:8.2f} ms   "
+                f"first {first * 1000:8.3f} ms   peak {peak / 1024:9.0f} KiB"
+            )
+
+
+if __name__ == "__main__":
+    main()
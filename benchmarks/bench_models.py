@@ -0,0 +1,68 @@
+"""Memory and parse throughput of Service/Location compared to CompactService/CompactLocation.
+
+Usage:
+    python benchmarks/bench_models.py [--count 100000]
+"""
+
+import argparse
+import gc
+import json
+import time
+import tracemalloc
+
+import payloads
+from appwashpy.core.compact import CompactLocation, CompactService
+from appwashpy.core.location import Location
+from appwashpy.core.service import Service
+
+
+def build(model, body: bytes, with_client: bool) -> tuple:
+    """Parses the body and builds one object per entry.
+
+    Returns the objects, the seconds spent building them and the bytes retained once the raw data is released.
+    """
+    gc.collect()
+    tracemalloc.start()
+    data = json.loads(body)["data"]
+    start = time.perf_counter()
+    if with_client:
+        objects = [model._from_result(None, entry) for entry in data]
+    else:
+        objects = [model._from_result(entry) for entry in data]
+    del data
+    elapsed = time.perf_counter() - start
+    gc.collect()
+    retained = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return objects, elapsed, retained
+
+
+def report(name: str, count: int, elapsed: float, retained: int) -> None:
+    print(
+        f"{name:<16} {count / elapsed:12,.0f} objects/s   {retained / count:8.1f} bytes/object"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--count", type=int, default=100000)
+    args = parser.parse_args()
+
+    services = json.dumps(payloads.services(args.count)).encode()
+    locations = json.dumps(
+        {"data": [payloads.location(str(i))["data"] for i in range(args.count)]}
+    ).encode()
+
+    for name, model, body, with_client in (
+        ("Service", Service, services, True),
+        ("CompactService", CompactService, services, True),
+        ("Location", Location, locations, False),
+        ("CompactLocation", CompactLocation, locations, False),
+    ):
+        objects, elapsed, retained = build(model, body, with_client)
+        report(name, len(objects), elapsed, retained)
+        del objects
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""Per-call latency of AppWash.services() with and without the pooled keep-alive session.
+
+Usage:
+    python benchmarks/bench_session.py [--calls 500]
+"""
+
+import argparse
+import statistics
+import time
+
+import requests
+
+from appwashpy import AppWash
+from payloads import EMAIL, LOCATION_ID, PASSWORD
+from stub_server import StubServer
+
+
+def measure(client: AppWash, calls: int) -> list:
+    client.services(LOCATION_ID)  # warm up, includes the login
+    latencies = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        client.services(LOCATION_ID)
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def report(name: str, latencies: list) -> None:
+    latencies = sorted(latencies)
+    p50 = latencies[len(latencies) // 2] * 1000
+    p99 = latencies[int(len(latencies) * 0.99)] * 1000
+    mean = statistics.mean(latencies) * 1000
+    print(f"{name:<12} mean {mean:7.3f} ms   p50 {p50:7.3f} ms   p99 {p99:7.3f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=500)
+    args = parser.parse_args()
+
+    with StubServer() as server:
+        # Previous behaviour: module-level requests.request, a new connection per call
+        unpooled = AppWash(EMAIL, PASSWORD, base_url=server.base_url)
+        unpooled._session = requests
+        report("unpooled", measure(unpooled, args.calls))
+
+        with AppWash(EMAIL, PASSWORD, base_url=server.base_url) as pooled:
+            report("pooled", measure(pooled, args.calls))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""Sample payloads of the AppWash API, mirroring the fixtures in tests/client/test_appwash.py."""
+
+EMAIL = "example@mail.org"
+PASSWORD = "abcdefgh"
+LOCATION_ID = "11111"
+SERVICE_ID = "12345"
+TOKEN = "1111111:11111111111:1111"
+SERVERTIME = 1657791333
+TOKEN_EXPIRE_TS = 4102444800
+
+
+def _envelope(data=None) -> dict:
+    result = {
+        "errorCode": 0,
+        "errorDescription": "",
+        "token_expire_ts": TOKEN_EXPIRE_TS,
+        "serverTime": SERVERTIME,
+    }
+    if data != None:
+        result["data"] = data
+    return result
+
+
+def login() -> dict:
+    result = _envelope()
+    result["activeSessions"] = []
+    result["login"] = {"email": EMAIL, "externalId": "123456789", "token": TOKEN}
+    return result
+
+
+def location(location_id: str = LOCATION_ID) -> dict:
+    return _envelope(
+        {
+            "name": "Box 220402",
+            "externalId": location_id,
+            "locationTypeV2": "OTHER",
+            "locationStatus": "PRODUCTION_PHASE",
+            "services": [
+                {"type": "DRYER", "name": "Trockner"},
+                {"type": "WASHING_MACHINE", "name": "Waschmaschine"},
+            ],
+            "pricing": [_pricing("WASHING_MACHINE", 275), _pricing("DRYER", 225)],
+            "maxDaysInAdvance": 7,
+            "reservedType": "NOT_RESERVABLE",
+        }
+    )
+
+
+def connector(
+    service_id: str = SERVICE_ID,
+    location_id: str = LOCATION_ID,
+    service_type: str = "WASHING_MACHINE",
+    state: str = "AVAILABLE",
+) -> dict:
+    return {
+        "externalId": service_id,
+        "locationId": location_id,
+        "location": "Waschküche - Haus 2",
+        "serviceType": service_type,
+        "serviceName": "Waschmaschine",
+        "state": state,
+        "pricing": [_pricing(service_type, 275)],
+        "reservable": "NOT_RESERVABLE",
+        "blockTimeSeconds": 900,
+    }
+
+
+def services(count: int = 2, location_id: str = LOCATION_ID) -> dict:
+    return _envelope(
+        [
+            connector(
+                str(30000 + i),
+                location_id,
+                "DRYER" if i % 2 else "WASHING_MACHINE",
+            )
+            for i in range(count)
+        ]
+    )
+
+
+def service(service_id: str = SERVICE_ID) -> dict:
+    return _envelope(connector(service_id))
+
+
+def start(service_id: str = SERVICE_ID) -> dict:
+    return _envelope({"externalId": service_id, "state": "SESSION_WAIT_ON"})
+
+
+def stop() -> dict:
+    return _envelope()
+
+
+def _pricing(service_type: str, cost_cents: int) -> dict:
+    return {
+        "serviceType": service_type,
+        "componentPriceObjects": [{"type": "UNIT_PRICE", "costCents": cost_cents}],
+    }
@@ -0,0 +1,90 @@
+"""Local HTTP server replaying sample AppWash payloads for benchmarks."""
+
+import json
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import payloads
+
+ROUTES = (
+    (re.compile(r"/login$"), lambda server, m: payloads.login()),
+    (
+        re.compile(r"/locations/split/(\w+)$"),
+        lambda server, m: payloads.location(m.group(1)),
+    ),
+    (
+        re.compile(r"/location/(\w+)/connectorsv2$"),
+        lambda server, m: payloads.services(server.service_count, m.group(1)),
+    ),
+    (
+        re.compile(r"/connector/(\w+)/start$"),
+        lambda server, m: payloads.start(m.group(1)),
+    ),
+    (re.compile(r"/connector/(\w+)/stop$"), lambda server, m: payloads.stop()),
+    (re.compile(r"/connector/(\w+)$"), lambda server, m: payloads.service(m.group(1))),
+)
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    # Keep-alive requires HTTP/1.1 and a Content-Length on every response
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        self._reply()
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        self.rfile.read(length)
+        self._reply()
+
+    def _reply(self):
+        self.server.request_count += 1
+        for pattern, handler in ROUTES:
+            match = pattern.search(self.path)
+            if match:
+                body = self.server.encode(handler(self.server, match))
+                self.send_response(200)
+                break
+        else:
+            body = b"{}"
+            self.send_response(404)
+
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StubServer(ThreadingHTTPServer):
+    """Threaded stub of the AppWash API listening on localhost.
+
+    Attributes:
+        service_count: Number of connectors returned by the connectorsv2 endpoint.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, service_count: int = 2):
+        super().__init__(("127.0.0.1", 0), StubHandler)
+        self.service_count = service_count
+        self.request_count = 0
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}/api-rest/"
+
+    def encode(self, payload: dict) -> bytes:
+        return json.dumps(payload).encode()
+
+    def __enter__(self) -> "StubServer":
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.shutdown()
+        self.server_close()
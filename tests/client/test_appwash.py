@@ -1,21 +1,27 @@
+import json
+import threading
+import time
+
 import pytest
+
 from appwashpy import (
+    LOCATION_TYPE,
+    SERVICE_TYPE,
     AppWash,
+    CircuitBreaker,
     Location,
+    Metrics,
+    ResponseCache,
     Service,
-    LOCATION_TYPE,
-    SERVICE_TYPE,
     check_credentials,
 )
 from appwashpy.common.enums import STATE
-from appwashpy.common.errors import AppWashApiError, WrongCredentialsError
-
-EMAIL = "example@mail.org"
-PASSWORD = "abcdefgh"
-LOCATION_ID = "11111"
-TOKEN = "1111111:11111111111:1111"
-SERVERTIME = 1657791333
-SERVICE_ID = "12345"
+from appwashpy.common.errors import (
+    AppWashApiError,
+    AppWashConnectionError,
+    WrongCredentialsError,
+)
+from tests.helpers import EMAIL, LOCATION_ID, PASSWORD, SERVICE_ID, TOKEN
 
 
 @pytest.fixture
@@ -45,261 +51,6 @@ def service(mocker, services_result, appwash) -> Service:
     return services[0]
 
 
-@pytest.fixture
-def authentication_successful_result():
-    """Sample result for Authentication Request"""
-    return {
-        "errorCode": 0,
-        "errorDescription": "",
-        "token_expire_ts": 1658354400,
-        "serverTime": SERVERTIME,
-        "activeSessions": [],
-        "login": {
-            "email": EMAIL,
-            "username": EMAIL,
-            "externalId": "123456789",
-            "language": "EN",
-            "token": TOKEN,
-            "offlineAllowed": True,
-            "manageOthers": True,
-            "administrator": True,
-            "viewInvoice": True,
-            "viewTransactionHistory": False,
-            "viewProducts": False,
-            "apiMessagePermission": True,
-            "correctionAllowed": False,
-            "installer": False,
-            "startMultiple": True,
-            "startForOthers": False,
-            "timeForReview": False,
-        },
-    }
-
-
-@pytest.fixture
-def authentication_wrong_credentials_result():
-    """Sample result for Authentication Request with wrong credentials"""
-    return {
-        "errorCode": 61,
-        "errorDescription": "Login failed. Please check your username and password. (code 61)",
-        "token_expire_ts": 0,
-        "serverTime": SERVERTIME,
-    }
-
-
-@pytest.fixture
-def location_result():
-    return {
-        "errorCode": 0,
-        "errorDescription": "",
-        "token_expire_ts": 1658354400,
-        "serverTime": SERVERTIME,
-        "data": {
-            "name": "Box 220402",
-            "externalId": LOCATION_ID,
-            "gps": {},
-            "locationTypeV2": "OTHER",
-            "locationTypeObject": {"type": "OTHER", "name": "Andere"},
-            "locationStatus": "PRODUCTION_PHASE",
-            "durationRequired": False,
-            "knownCommunicationIssues": False,
-            "services": [
-                {"type": "DRYER", "name": "Trockner"},
-                {"type": "WASHING_MACHINE", "name": "Waschmaschine"},
-            ],
-            "pricing": [
-                {
-                    "serviceType": "WASHING_MACHINE",
-                    "componentPriceObjects": [
-                        {
-                            "type": "UNIT_PRICE",
-                            "fullPriceString": "Pro Waschgang: EUR 2.75",
-                            "priceString": "EUR 2.75",
-                            "costCents": 275,
-                        }
-                    ],
-                },
-                {
-                    "serviceType": "DRYER",
-                    "componentPriceObjects": [
-                        {
-                            "type": "UNIT_PRICE",
-                            "fullPriceString": "Pro Trockengang: EUR 2.25",
-                            "priceString": "EUR 2.25",
-                            "costCents": 225,
-                        }
-                    ],
-                },
-            ],
-            "products": [],
-            "childLocations": [],
-            "maxDaysInAdvance": 7,
-            "reservedType": "NOT_RESERVABLE",
-            "serviceTypes": [],
-        },
-    }
-
-
-@pytest.fixture
-def location_invalid_result():
-    return {
-        "errorCode": 33,
-        "errorDescription": "We couldn't find this location. Please try again later. (code 33)",
-        "token_expire_ts": 1658354400,
-        "serverTime": SERVERTIME,
-    }
-
-
-@pytest.fixture
-def services_result():
-    return {
-        "errorCode": 0,
-        "errorDescription": "",
-        "token_expire_ts": 1658354400,
-        "serverTime": 1657800054,
-        "data": [
-            {
-                "externalId": "38031",
-                "locationId": LOCATION_ID,
-                "location": "Waschküche - Haus 2",
-                "locationTopLevelName": "Ulm - Hochsträß 2",
-                "serviceType": "DRYER",
-                "serviceName": "Trockner",
-                "unit": "Transaktion",
-                "state": "AVAILABLE",
-                "stateDescription": "frei",
-                "requiredFields": [],
-                "freeFormQuestionInt": [],
-                "pricing": [
-                    {
-                        "serviceType": "DRYER",
-                        "componentPriceObjects": [
-                            {
-                                "type": "UNIT_PRICE",
-                                "fullPriceString": "Pro Trockengang: EUR 2.25",
-                                "priceString": "EUR 2.25",
-                                "costCents": 225,
-                            }
-                        ],
-                    }
-                ],
-                "tariffSetName": "default",
-                "gps": {},
-                "reservable": "NOT_RESERVABLE",
-                "reservations": [],
-                "blockTimeSeconds": 900,
-                "timeOfArrivalSeconds": 0,
-                "checkoutTimeSeconds": 0,
-                "startWithPredeterminedUsage": False,
-                "optionalName": "",
-            },
-            {
-                "externalId": "38032",
-                "locationId": LOCATION_ID,
-                "location": "Waschküche - Haus 2",
-                "locationTopLevelName": "Ulm - Hochsträß 2",
-                "serviceType": "WASHING_MACHINE",
-                "serviceName": "Waschmaschine",
-                "unit": "Transaktion",
-                "state": "AVAILABLE",
-                "stateDescription": "frei",
-                "requiredFields": [],
-                "freeFormQuestionInt": [],
-                "pricing": [
-                    {
-                        "serviceType": "WASHING_MACHINE",
-                        "componentPriceObjects": [
-                            {
-                                "type": "UNIT_PRICE",
-                                "fullPriceString": "Pro Waschgang: EUR 2.75",
-                                "priceString": "EUR 2.75",
-                                "costCents": 275,
-                            }
-                        ],
-                    }
-                ],
-                "tariffSetName": "default",
-                "gps": {},
-                "reservable": "NOT_RESERVABLE",
-                "reservations": [],
-                "blockTimeSeconds": 900,
-                "timeOfArrivalSeconds": 0,
-                "checkoutTimeSeconds": 0,
-                "startWithPredeterminedUsage": False,
-                "optionalName": "",
-            },
-        ],
-    }
-
-
-@pytest.fixture
-def service_result():
-    return {
-        "errorCode": 0,
-        "errorDescription": "",
-        "token_expire_ts": 1658354400,
-        "serverTime": 1657832158,
-        "data": {
-            "externalId": SERVICE_ID,
-            "locationId": LOCATION_ID,
-            "location": "Sample Name",
-            "locationTopLevelName": "SampleTopLevelName",
-            "serviceType": "WASHING_MACHINE",
-            "serviceName": "Waschmaschine",
-            "unit": "Transaktion",
-            "state": "AVAILABLE",
-            "stateDescription": "frei",
-            "requiredFields": [],
-            "freeFormQuestionInt": [],
-            "pricing": [
-                {
-                    "serviceType": "WASHING_MACHINE",
-                    "componentPriceObjects": [
-                        {
-                            "type": "UNIT_PRICE",
-                            "fullPriceString": "Pro Waschgang: EUR 2.50",
-                            "priceString": "EUR 2.50",
-                            "costCents": 250,
-                        }
-                    ],
-                }
-            ],
-            "tariffSetName": "default",
-            "gps": {},
-            "reservable": "NOT_RESERVABLE",
-            "reservations": [],
-            "blockTimeSeconds": 900,
-            "timeOfArrivalSeconds": 0,
-            "checkoutTimeSeconds": 0,
-            "startWithPredeterminedUsage": False,
-            "optionalName": "",
-        },
-    }
-
-
-@pytest.fixture
-def service_buy_result():
-    return {
-        "errorCode": 0,
-        "errorDescription": "",
-        "token_expire_ts": 1658268000,
-        "serverTime": SERVERTIME,
-        "data": {
-            "sessionId": "4114114",
-            "externalId": "12345",
-            "locationExternalId": LOCATION_ID,
-            "locationName": "Location",
-            "serviceType": "WASHING_MACHINE",
-            "startDateTime": 1657714551,
-            "endDateTime": 0,
-            "state": "SESSION_WAIT_ON",
-            "stateTranslation": {"type": "SESSION_WAIT_ON", "name": "wird gestartet"},
-            "stateDescription": "wird gestartet",
-            "pinCodes": [],
-        },
-    }
-
-
 def test_create_appwash(mocker, authentication_successful_result):
     """Test if the AppWash Object gets created successfully."""
 
@@ -512,14 +263,46 @@ def test_service_buy(mocker, service_buy_result, service):
 def test_service_wont_safe_buy_if_stoppable(mocker, service: Service):
     """Test if service will be bought if it's state is STOPPABLE or SESSION_WAIT_ON."""
 
-    def mock_service(self, service_id):
-        service.state = STATE.STOPPABLE
-        return service
+    service.state = STATE.STOPPABLE
+    perform_request = mocker.patch(
+        "appwashpy.client.requests.ApiRequest._perform_request"
+    )
+
+    res = service.buy()
+
+    assert res == False
+    assert res.state_source == "service"
+    perform_request.assert_not_called()
+
+
+def test_service_wont_safe_buy_if_session_wait_on(mocker, service: Service):
+    """Test if service will be bought if it's state is STOPPABLE or SESSION_WAIT_ON."""
+
+    service.state = STATE.SESSION_WAIT_ON
+    perform_request = mocker.patch(
+        "appwashpy.client.requests.ApiRequest._perform_request"
+    )
+
+    res = service.buy()
+
+    assert res == False
+    assert res.state_source == "service"
+    perform_request.assert_not_called()
 
-    mocker.patch("appwashpy.client.appwash.AppWash.service", mock_service)
+
+def test_safe_buy_reloads_stale_state(
+    mocker, service_result, service_buy_result, service: Service
+):
+    """Test if a safe buy loads the service again if its state is older than max_state_age."""
+    service.observed_at -= 60
+    requested = []
 
     def mock_perform_request(self):
-        self._response = service_buy_result
+        requested.append(self.endpoint)
+        if self.endpoint.endswith("/start"):
+            self._response = service_buy_result
+        else:
+            self._response = service_result
 
     mocker.patch(
         "appwashpy.client.requests.ApiRequest._perform_request", mock_perform_request
@@ -527,28 +310,92 @@ def test_service_wont_safe_buy_if_stoppable(mocker, service: Service):
 
     res = service.buy()
 
-    assert res == False
+    assert res == True
+    assert res.state_source == "network"
+    assert requested == [
+        f"//connector/{service.service_id}",
+        f"/connector/{service.service_id}/start",
+    ]
 
 
-def test_service_wont_safe_buy_if_session_wait_on(mocker, service: Service):
-    """Test if service will be bought if it's state is STOPPABLE or SESSION_WAIT_ON."""
+def test_safe_buy_uses_cached_state(
+    mocker, services_result, service_buy_result, authenticated_appwash
+):
+    """Test if a safe buy by ID takes a recent state from the services cached for its location."""
+    appwash = authenticated_appwash(cache=ResponseCache())
+    requested = []
 
-    def mock_service(self, service_id):
-        service.state = STATE.SESSION_WAIT_ON
-        return service
+    def mock_perform_request(self):
+        requested.append(self.endpoint)
+        if self.endpoint.endswith("/start"):
+            self._response = service_buy_result
+        else:
+            self._response = services_result
 
-    mocker.patch("appwashpy.client.appwash.AppWash.service", mock_service)
+    mocker.patch(
+        "appwashpy.client.requests.ApiRequest._perform_request", mock_perform_request
+    )
+
+    appwash.services()
+    res = appwash.buy_service("38031")
+
+    assert res
+    assert res.state_source == "cache"
+    assert res.state == STATE.AVAILABLE
+    assert requested == [
+        f"/location/{LOCATION_ID}/connectorsv2",
+        "/connector/38031/start",
+    ]
+
+
+def test_safe_buy_reloads_state_cached_long_ago(
+    mocker, services_result, service_result, service_buy_result, authenticated_appwash
+):
+    """Test if a service built from an old cached response isn't treated as freshly observed."""
+    appwash = authenticated_appwash(cache=ResponseCache())
+    requested = []
 
     def mock_perform_request(self):
-        self._response = service_buy_result
+        requested.append(self.endpoint)
+        if self.endpoint.endswith("/start"):
+            self._response = service_buy_result
+        elif self.endpoint.endswith("/connectorsv2"):
+            self._response = services_result
+        else:
+            self._response = service_result
 
     mocker.patch(
         "appwashpy.client.requests.ApiRequest._perform_request", mock_perform_request
     )
 
+    appwash.services()
+    # 55 seconds later the services are still cached, but their state is too old for a safe buy
+    mocker.patch("time.monotonic", return_value=time.monotonic() + 55)
+    service = appwash.services()[0]
     res = service.buy()
 
-    assert res == False
+    assert res.state_source == "network"
+    assert requested == [
+        f"/location/{LOCATION_ID}/connectorsv2",
+        f"//connector/{service.service_id}",
+        f"/connector/{service.service_id}/start",
+    ]
+
+
+def test_unsafe_buy_skips_check(mocker, service_buy_result, appwash):
+    """Test if buying without safe mode doesn't check the state."""
+
+    def mock_perform_request(self):
+        self._response = service_buy_result
+
+    mocker.patch(
+        "appwashpy.client.requests.ApiRequest._perform_request", mock_perform_request
+    )
+
+    res = appwash.buy_service(SERVICE_ID, safe=False)
+
+    assert res == True
+    assert res.state_source == "unchecked"
 
 
 def test_check_credentials_valid(mocker, authentication_successful_result):
@@ -589,3 +436,278 @@ def test_check_credentials_connection_error(mocker):
 
     with pytest.raises(Exception):
         check_credentials(EMAIL, PASSWORD)
+
+
+def test_requests_reuse_client_session(mocker, authentication_successful_result):
+    """Tests if all requests of a client are sent through its pooled session."""
+    session = mocker.Mock()
+    session.request.return_value.content = json.dumps(
+        authentication_successful_result
+    ).encode()
+
+    appwash = AppWash(EMAIL, PASSWORD, base_url="http://localhost/", session=session)
+    appwash._authenticate()
+    appwash._authenticate()
+
+    assert session.request.call_count == 2
+    assert session.request.call_args.kwargs["url"] == "http://localhost//login"
+
+
+def test_close_owned_session(mocker):
+    """Tests if leaving the context manager closes the session created by the client."""
+    with AppWash(EMAIL, PASSWORD) as appwash:
+        close = mocker.spy(appwash._session, "close")
+
+    close.assert_called_once()
+
+
+def test_close_keeps_passed_session(mocker):
+    """Tests if close() leaves a session passed by the caller open."""
+    session = mocker.Mock()
+
+    AppWash(EMAIL, PASSWORD, session=session).close()
+
+    session.close.assert_not_called()
+
+
+def test_token_corrects_clock_skew(mocker, authentication_successful_result):
+    """Tests if the token expiry is compared against the server time of the login."""
+    mocker.patch(
+        "appwashpy.client.appwash.current_timestamp",
+        return_value=authentication_successful_result["token_expire_ts"] + 3600,
+    )
+    mocker.patch(
+        "appwashpy.client.requests.ApiRequest._perform_request",
+        lambda self: setattr(self, "_response", authentication_successful_result),
+    )
+
+    appwash = AppWash(EMAIL, PASSWORD)
+    appwash._authenticate()
+    authenticate = mocker.spy(appwash, "_authenticate")
+
+    assert appwash.token == TOKEN
+    authenticate.assert_not_called()
+
+
+def test_token_single_login(mocker, authentication_successful_result):
+    """Tests if threads requesting an expired token share a single login."""
+    logins = []
+
+    def mock_perform_request(self):
+        logins.append(self.url)
+        time.sleep(0.05)
+        self._response = authentication_successful_result
+
+    mocker.patch(
+        "appwashpy.client.requests.ApiRequest._perform_request", mock_perform_request
+    )
+
+    appwash = AppWash(EMAIL, PASSWORD)
+    threads = [threading.Thread(target=lambda: appwash.token) for _ in range(10)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(logins) == 1
+
+
+def test_token_renewed_in_background(mocker, authentication_successful_result):
+    """Tests if a token close to its expiry is returned and renewed in the background."""
+    mocker.patch(
+        "appwashpy.client.requests.ApiRequest._perform_request",
+        lambda self: setattr(self, "_response", authentication_successful_result),
+    )
+
+    appwash = AppWash(EMAIL, PASSWORD, token_refresh_margin=300)
+    appwash._authenticate()
+    appwash._token = "old"
+    appwash._token_expiry = appwash._server_timestamp() + 60
+
+    assert appwash.token == "old"
+    appwash._refresh_thread.join()
+    assert appwash._token == TOKEN
+
+
+def test_services_many(mocker, services_result, location_invalid_result, appwash):
+    """Tests if services_many maps every location to its services or its error."""
+
+    def mock_perform_request(self):
+        if "/invalid/" in self.url:
+            self._response = location_invalid_result
+        else:
+            self._response = services_result
+
+    mocker.patch(
+        "appwashpy.client.requests.ApiRequest._perform_request", mock_perform_request
+    )
+
+    results = appwash.services_many([LOCATION_ID, "invalid", "22222", LOCATION_ID])
+
+    assert list(results) == [LOCATION_ID, "invalid", "22222"]
+    assert isinstance(results["invalid"], AppWashApiError)
+    assert all(isinstance(s, Service) for s in results[LOCATION_ID])
+    assert len(results["22222"]) == 2
+
+
+def test_locations_many(mocker, location_result, appwash):
+    """Tests if locations_many loads all locations."""
+
+    def mock_perform_request(self):
+        self._response = location_result
+
+    mocker.patch(
+        "appwashpy.client.requests.ApiRequest._perform_request", mock_perform_request
+    )
+
+    results = appwash.locations_many([LOCATION_ID, "22222"], max_workers=2)
+
+    assert all(isinstance(l, Location) for l in results.values())
+
+
+def test_iter_services(mocker, services_result, appwash):
+    """Tests if iter_services yields the services of a streamed response."""
+    body = json.dumps(services_result).encode()
+
+    def mock_perform_request(self):
+        self._chunks = (body[i : i + 16] for i in range(0, len(body), 16))
+
+    mocker.patch(
+        "appwashpy.client.requests.StreamingApiRequest._perform_request",
+        mock_perform_request,
+    )
+
+    services = list(appwash.iter_services(LOCATION_ID))
+
+    assert [s.service_id for s in services] == ["38031", "38032"]
+    assert all(isinstance(s, Service) for s in services)
+
+
+def test_iter_services_invalid_location(mocker, location_invalid_result, appwash):
+    """Tests if iter_services raises an error if the location doesn't exist."""
+
+    def mock_perform_request(self):
+        self._chunks = iter([json.dumps(location_invalid_result).encode()])
+
+    mocker.patch(
+        "appwashpy.client.requests.StreamingApiRequest._perform_request",
+        mock_perform_request,
+    )
+
+    with pytest.raises(AppWashApiError):
+        list(appwash.iter_services("abc"))
+
+
+def streamed_response(mocker, appwash: AppWash, body: bytes):
+    """Lets the session of the client answer with a streamed body in chunks of 16 bytes."""
+    response = mocker.Mock(status_code=200)
+    response.iter_content.return_value = (
+        body[i : i + 16] for i in range(0, len(body), 16)
+    )
+    appwash._session = mocker.Mock()
+    appwash._session.request.return_value = response
+    return response
+
+
+def test_iter_services_stopped_early(mocker, services_result, authenticated_appwash):
+    """Tests if the response is closed and the slot released when the caller stops iterating."""
+    appwash = authenticated_appwash(max_concurrency=1, metrics=Metrics())
+    response = streamed_response(mocker, appwash, json.dumps(services_result).encode())
+
+    services = appwash.iter_services()
+    next(services)
+    assert not response.close.called
+    assert not appwash._request_slots.acquire(blocking=False)
+    services.close()
+
+    response.close.assert_called_once()
+    assert appwash._request_slots.acquire(blocking=False)
+    assert appwash.metrics.to_dict()["SERVICES"]["requests"] == 1
+
+
+def test_iter_services_invalid_body(mocker, authenticated_appwash):
+    """Tests if a body that can't be decoded raises an AppWashConnectionError and closes the response."""
+    appwash = authenticated_appwash(circuit_breaker=CircuitBreaker(failure_threshold=1))
+    response = streamed_response(mocker, appwash, b'{"errorCode": 0, "data": [{"x": ]}')
+
+    with pytest.raises(AppWashConnectionError):
+        list(appwash.iter_services())
+
+    response.close.assert_called_once()
+    assert appwash.circuit_breaker.state == "OPEN"
+
+
+def location_services(services_result, states: dict, cost_cents: int = None) -> dict:
+    """Copy of services_result with the states of the services by ID and an optional price of all."""
+    result = json.loads(json.dumps(services_result))
+    for service in result["data"]:
+        service["state"] = states.get(service["externalId"], service["state"])
+        if cost_cents != None:
+            service["pricing"][0]["componentPriceObjects"][0]["costCents"] = cost_cents
+    return result
+
+
+def test_find_available_returns_early(
+    mocker, services_result, location_invalid_result, appwash
+):
+    """Tests if find_available returns once enough services are found and skips failing locations."""
+    occupied = location_services(
+        services_result, {"38031": "OCCUPIED", "38032": "OCCUPIED"}
+    )
+    requested = []
+
+    def mock_perform_request(self):
+        requested.append(self.url)
+        time.sleep(0.01)
+        if "/invalid/" in self.url:
+            self._response = location_invalid_result
+        elif "/22222/" in self.url:
+            self._response = services_result
+        else:
+            self._response = occupied
+
+    mocker.patch(
+        "appwashpy.client.requests.ApiRequest._perform_request", mock_perform_request
+    )
+
+    location_ids = ["invalid", LOCATION_ID, "22222"] + [str(i) for i in range(100)]
+    services = appwash.find_available(location_ids, count=2, max_workers=1)
+
+    assert [s.service_id for s in services] == ["38031", "38032"]
+    assert all(s.state == STATE.AVAILABLE for s in services)
+    assert len(requested) < len(location_ids)
+
+
+def test_find_available_cheapest(mocker, services_result, appwash):
+    """Tests if find_available returns the cheapest available services of all locations."""
+    results = {
+        LOCATION_ID: location_services(services_result, {}, 300),
+        "22222": location_services(services_result, {"38031": "OCCUPIED"}, 100),
+    }
+
+    def mock_perform_request(self):
+        self._response = results[self.url.split("/")[-2]]
+
+    mocker.patch(
+        "appwashpy.client.requests.ApiRequest._perform_request", mock_perform_request
+    )
+
+    services = appwash.find_available(
+        [LOCATION_ID, "22222"], SERVICE_TYPE.WASHING_MACHINE, count=2, cheapest=True
+    )
+
+    assert [s.cost_cents for s in services] == [100, 300]
+
+
+def test_find_available_all_failing(mocker, location_invalid_result, appwash):
+    """Tests if find_available raises the error if no location could be loaded."""
+
+    def mock_perform_request(self):
+        self._response = location_invalid_result
+
+    mocker.patch(
+        "appwashpy.client.requests.ApiRequest._perform_request", mock_perform_request
+    )
+
+    with pytest.raises(AppWashApiError):
+        appwash.find_available(["invalid", "other"])
@@ -0,0 +1,102 @@
+import asyncio
+
+import pytest
+
+from appwashpy import AsyncAppWash, Location, Service
+from appwashpy.common.errors import AppWashApiError, WrongCredentialsError
+from tests.helpers import EMAIL, LOCATION_ID, PASSWORD, SERVICE_ID, TOKEN
+
+
+def mock_responses(mocker, *results):
+    """Lets AsyncApiRequest return the given results one after another."""
+    results = list(results)
+
+    async def mock_perform_request(self):
+        self._response = results.pop(0) if len(results) > 1 else results[0]
+
+    return mocker.patch(
+        "appwashpy.client.async_requests.AsyncApiRequest._perform_request",
+        mock_perform_request,
+    )
+
+
+@pytest.fixture
+def appwash(authenticated_appwash) -> AsyncAppWash:
+    return authenticated_appwash(client_class=AsyncAppWash)
+
+
+def test_services(mocker, services_result, appwash):
+    """Test loading services with the async client."""
+    mock_responses(mocker, services_result)
+
+    services = asyncio.run(appwash.services())
+
+    assert len(services) == 2
+    assert all(isinstance(s, Service) for s in services)
+    assert services[0].location_id == LOCATION_ID
+
+
+def test_location(mocker, location_result, appwash):
+    """Test loading a location with the async client."""
+    mock_responses(mocker, location_result)
+
+    location = asyncio.run(appwash.location())
+
+    assert isinstance(location, Location)
+    assert location.id == LOCATION_ID
+
+
+def test_service_invalid(mocker, location_invalid_result, appwash):
+    """Test if an error gets raised if the API returns an error code."""
+    mock_responses(mocker, location_invalid_result)
+
+    with pytest.raises(AppWashApiError):
+        asyncio.run(appwash.service(SERVICE_ID))
+
+
+def test_service_buy(mocker, service_result, service_buy_result, appwash):
+    """Test buying a service through the awaitable service.buy()."""
+    mock_responses(mocker, service_result, service_result, service_buy_result)
+
+    async def buy():
+        service = await appwash.service(SERVICE_ID)
+        return await service.buy()
+
+    assert asyncio.run(buy())
+
+
+def test_concurrent_requests_share_login(mocker, authentication_successful_result):
+    """Test if concurrent requests with an expired token trigger a single login."""
+    logins = 0
+
+    async def mock_perform_request(self):
+        nonlocal logins
+        if self.endpoint == "/login":
+            logins += 1
+            await asyncio.sleep(0.01)
+            self._response = dict(
+                authentication_successful_result, token_expire_ts=4102444800
+            )
+        else:
+            self._response = {"errorCode": 0, "errorDescription": ""}
+
+    mocker.patch(
+        "appwashpy.client.async_requests.AsyncApiRequest._perform_request",
+        mock_perform_request,
+    )
+    appwash = AsyncAppWash(EMAIL, PASSWORD)
+
+    async def run():
+        await asyncio.gather(*(appwash.stop_service(SERVICE_ID) for _ in range(10)))
+
+    asyncio.run(run())
+
+    assert logins == 1
+    assert appwash._token == TOKEN
+
+
+def test_check_credentials(mocker, authentication_wrong_credentials_result):
+    """Test if check_credentials returns False with invalid credentials."""
+    mock_responses(mocker, authentication_wrong_credentials_result)
+
+    assert asyncio.run(AsyncAppWash(EMAIL, "").check_credentials()) == False
@@ -0,0 +1,163 @@
+from appwashpy import SERVICE_TYPE, STATE, AppWash
+from appwashpy.common.errors import AppWashConnectionError
+from appwashpy.core.intent import INTENT_BOUGHT, INTENT_CANCELLED, INTENT_UNKNOWN
+from appwashpy.testing.simulator import Simulator
+from tests.helpers import EMAIL, LOCATION_ID, PASSWORD
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1657791333.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_intents_share_one_poll(
+    mocker, services_result, service_buy_result, authenticated_appwash
+):
+    """Test if all intents of a location share one request and get different services."""
+    appwash = authenticated_appwash()
+    requested = []
+
+    def mock_perform_request(self):
+        requested.append(self.endpoint)
+        if self.endpoint.endswith("/start"):
+            self._response = service_buy_result
+        else:
+            self._response = services_result
+
+    mocker.patch(
+        "appwashpy.client.requests.ApiRequest._perform_request", mock_perform_request
+    )
+
+    queue = appwash.buy_queue()
+    first = queue.submit(LOCATION_ID)
+    second = queue.submit(LOCATION_ID)
+    third = queue.submit(LOCATION_ID)
+
+    assert queue.poll() == [first, second]
+    assert requested == [
+        f"/location/{LOCATION_ID}/connectorsv2",
+        "/connector/38031/start",
+        "/connector/38032/start",
+    ]
+    assert (first.service_id, second.service_id) == ("38031", "38032")
+    assert first.status == INTENT_BOUGHT and first.done
+    assert first.result.state_source == "service"
+
+    # Both services still look available, but they are booked already
+    requested.clear()
+    assert queue.poll() == []
+    assert requested == [f"/location/{LOCATION_ID}/connectorsv2"]
+    assert len(queue) == 1 and not third.done
+
+
+def test_intents_served_in_order():
+    """Test if intents wait for a matching service and are served first come first served."""
+    clock = Clock()
+    with Simulator(
+        services_per_location=4, occupancy=0, cycle=3600, clock=clock
+    ) as simulator:
+        with AppWash(EMAIL, PASSWORD, base_url=simulator.base_url) as appwash:
+            location_id = simulator.location_ids[0]
+            queue = appwash.buy_queue(interval=0)
+            washers = [
+                queue.submit(location_id, SERVICE_TYPE.WASHING_MACHINE)
+                for _ in range(3)
+            ]
+            dryer = queue.submit(location_id, SERVICE_TYPE.DRYER)
+
+            assert queue.poll() == washers[:2] + [dryer]
+            assert len({intent.service_id for intent in washers[:2]}) == 2
+            assert all(
+                appwash.service(intent.service_id).state == STATE.SESSION_WAIT_ON
+                for intent in washers[:2]
+            )
+
+            assert queue.poll() == []
+            clock.now += 3600
+            queue.run()
+
+            assert washers[2].service_id in {
+                intent.service_id for intent in washers[:2]
+            }
+            assert len(queue) == 0
+
+
+def test_cancel_intent(mocker, services_result, authenticated_appwash):
+    """Test if a cancelled intent isn't bought."""
+    appwash = authenticated_appwash()
+    perform_request = mocker.patch(
+        "appwashpy.client.requests.ApiRequest._perform_request"
+    )
+
+    queue = appwash.buy_queue()
+    intent = queue.submit(LOCATION_ID)
+
+    assert queue.cancel(intent)
+    assert intent.status == INTENT_CANCELLED and intent.wait(0)
+    assert queue.poll() == []
+    perform_request.assert_not_called()
+
+
+def start_failing(mocker, services_result: dict, error: dict) -> list:
+    requested = []
+
+    def mock_perform_request(self):
+        requested.append(self.endpoint)
+        if self.endpoint.endswith("/start"):
+            if isinstance(error, Exception):
+                raise error
+            self._response = error
+        else:
+            self._response = services_result
+
+    mocker.patch(
+        "appwashpy.client.requests.ApiRequest._perform_request", mock_perform_request
+    )
+    return requested
+
+
+def test_refused_purchase_retried(mocker, services_result, authenticated_appwash):
+    """Test if an intent whose service the API refused to start stays pending and the service is offered again."""
+    appwash = authenticated_appwash()
+    requested = start_failing(
+        mocker, services_result, {"errorCode": 21, "errorDescription": "Busy"}
+    )
+
+    queue = appwash.buy_queue()
+    intent = queue.submit(LOCATION_ID)
+
+    assert queue.poll() == []
+    assert queue.poll() == []
+    assert len(queue) == 1 and not intent.done
+    assert intent.attempts == 2
+    assert requested.count("/connector/38031/start") == 2
+
+
+def test_ambiguous_purchase_not_retried(mocker, services_result, authenticated_appwash):
+    """Test if an intent isn't bought again if it is unknown whether its service was started."""
+    appwash = authenticated_appwash()
+    requested = start_failing(
+        mocker, services_result, AppWashConnectionError("Read timed out")
+    )
+
+    queue = appwash.buy_queue()
+    intent = queue.submit(LOCATION_ID)
+
+    assert queue.poll() == []
+    assert intent.status == INTENT_UNKNOWN and intent.done
+    assert intent.service_id == "38031"
+    assert isinstance(intent.error, AppWashConnectionError)
+
+    assert len(queue) == 0
+
+    # Another intent never gets the service that may have been started
+    queue.submit(LOCATION_ID)
+    requested.clear()
+    queue.poll()
+    assert requested == [
+        f"/location/{LOCATION_ID}/connectorsv2",
+        "/connector/38032/start",
+    ]
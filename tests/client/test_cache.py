@@ -0,0 +1,107 @@
+import pytest
+
+from appwashpy import AppWash, ResponseCache
+from tests.helpers import LOCATION_ID
+
+
+@pytest.fixture
+def appwash(authenticated_appwash) -> AppWash:
+    return authenticated_appwash(cache=ResponseCache())
+
+
+@pytest.fixture
+def requests(mocker, services_result, location_result, service_buy_result) -> list:
+    """Answers requests by endpoint and records their URLs."""
+    requests = []
+
+    def mock_perform_request(self):
+        requests.append(self.url)
+        if self.url.endswith("connectorsv2"):
+            self._response = services_result
+        elif self.url.endswith("/start"):
+            self._response = service_buy_result
+        else:
+            self._response = location_result
+
+    mocker.patch(
+        "appwashpy.client.requests.ApiRequest._perform_request", mock_perform_request
+    )
+    return requests
+
+
+def test_lru_eviction():
+    """Test if the least recently used entry is evicted once maxsize is reached."""
+    cache = ResponseCache(maxsize=2)
+    cache.set(("service", "1"), 1)
+    cache.set(("service", "2"), 2)
+    cache.get(("service", "1"))
+    cache.set(("service", "3"), 3)
+
+    assert cache.get(("service", "2")) == None
+    assert cache.get(("service", "1")) == 1
+    assert len(cache) == 2
+
+
+def test_ttl_per_endpoint(mocker):
+    """Test if entries expire after the TTL of their endpoint."""
+    monotonic = mocker.patch("appwashpy.client.cache.time.monotonic", return_value=0)
+    cache = ResponseCache(location_ttl=3600, services_ttl=60)
+    cache.set(("location", LOCATION_ID), "location")
+    cache.set(("services", LOCATION_ID, "None"), "services")
+
+    monotonic.return_value = 120
+
+    assert cache.get(("location", LOCATION_ID)) == "location"
+    assert cache.get(("services", LOCATION_ID, "None")) == None
+    assert cache.stats()["hits"]["location"] == 1
+    assert cache.stats()["misses"]["services"] == 1
+
+
+def test_services_cached(appwash, requests):
+    """Test if repeated services() and location() calls are served from the cache."""
+    first = appwash.services()
+    second = appwash.services()
+    appwash.location()
+    appwash.location()
+
+    assert len(requests) == 2
+    assert first == second
+    assert first[0] is not second[0]
+
+
+def test_buy_invalidates_location(appwash, requests):
+    """Test if buying a service invalidates the cached services of its location."""
+    service = appwash.services()[0]
+    appwash.buy_service(service.service_id, safe=False)
+    appwash.services()
+
+    assert len(requests) == 3
+    assert requests[-1].endswith("connectorsv2")
+
+
+def test_service_locations_forgotten(mocker):
+    """Test if the locations of services are forgotten once their location is evicted or expired."""
+    monotonic = mocker.patch("appwashpy.client.cache.time.monotonic", return_value=0)
+    cache = ResponseCache(services_ttl=60, maxsize=2)
+    for location_id in ("1", "2"):
+        cache.set(
+            ("services", location_id, "None"), [{"externalId": f"{location_id}1"}]
+        )
+
+    cache.set(("location", "3"), "location")
+    assert "11" not in cache._service_locations
+    assert "21" in cache._service_locations
+
+    monotonic.return_value = 120
+    assert cache.get(("services", "2", "None")) == None
+    assert cache._service_locations == {}
+    assert cache._location_services == {}
+
+
+def test_uncached_loads_not_remembered(appwash, requests):
+    """Test if services loaded without storing them, e.g. by watchers, don't grow the index of service locations."""
+    appwash._load_services(LOCATION_ID)
+    appwash._load_service("38031")
+
+    assert appwash.cache._service_locations == {}
+    assert appwash.cache.lookup_service("38031") == (None, None)
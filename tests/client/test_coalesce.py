@@ -0,0 +1,80 @@
+import threading
+import time
+
+from appwashpy.client.coalesce import SingleFlight
+
+
+def run_concurrently(function, count: int) -> list:
+    results = [None] * count
+
+    def run(index):
+        try:
+            results[index] = function()
+        except Exception as error:
+            results[index] = error
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def test_concurrent_calls_share_result():
+    """Test if concurrent calls for the same key execute once and share the result."""
+    single_flight = SingleFlight()
+
+    def slow():
+        time.sleep(0.05)
+        return object()
+
+    results = run_concurrently(lambda: single_flight.do("key", slow), 5)
+
+    assert all(result is results[0] for result in results)
+    assert single_flight.stats() == {"executed": 1, "coalesced": 4}
+
+
+def test_error_shared():
+    """Test if the exception of the executed call is raised for all waiting calls."""
+    single_flight = SingleFlight()
+
+    def failing():
+        time.sleep(0.05)
+        raise ValueError()
+
+    results = run_concurrently(lambda: single_flight.do("key", failing), 3)
+
+    assert all(isinstance(result, ValueError) for result in results)
+    assert single_flight.executed == 1
+
+
+def test_sequential_calls_not_coalesced():
+    """Test if a call after the previous one finished executes again."""
+    single_flight = SingleFlight()
+
+    single_flight.do("key", lambda: 1)
+    assert single_flight.do("key", lambda: 2) == 2
+    assert single_flight.coalesced == 0
+
+
+def test_appwash_coalesces_services(mocker, services_result, authenticated_appwash):
+    """Test if concurrent services() calls for one location send a single request."""
+    requests = []
+
+    def mock_perform_request(self):
+        requests.append(self.url)
+        time.sleep(0.05)
+        self._response = services_result
+
+    mocker.patch(
+        "appwashpy.client.requests.ApiRequest._perform_request", mock_perform_request
+    )
+    appwash = authenticated_appwash()
+
+    results = run_concurrently(appwash.services, 4)
+
+    assert len(requests) == 1
+    assert all(len(services) == 2 for services in results)
+    assert results[0][0] is not results[1][0]
+    assert appwash.coalescer.stats()["coalesced"] == 3
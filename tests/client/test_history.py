@@ -0,0 +1,94 @@
+import json
+
+import pytest
+
+from appwashpy import AppWash, HistoryRecorder
+from appwashpy.client.history import COLUMNS
+from tests.helpers import LOCATION_ID
+
+
+@pytest.fixture
+def recorder(tmp_path) -> HistoryRecorder:
+    recorder = HistoryRecorder(str(tmp_path / "history.sqlite3"), batch_size=100)
+    yield recorder
+    recorder.close()
+
+
+@pytest.fixture
+def appwash(mocker, recorder, services_result, authenticated_appwash) -> AppWash:
+    appwash = authenticated_appwash(recorder=recorder)
+    appwash.results = [services_result]
+
+    def mock_perform_request(self):
+        self._response = appwash.results.pop(0)
+
+    mocker.patch(
+        "appwashpy.client.requests.ApiRequest._perform_request", mock_perform_request
+    )
+    return appwash
+
+
+def with_state(services_result: dict, service_id: str, state: str) -> dict:
+    result = json.loads(json.dumps(services_result))
+    for service in result["data"]:
+        if service["externalId"] == service_id:
+            service["state"] = state
+    return result
+
+
+def test_records_transitions_only(appwash, recorder, services_result):
+    """Test if only services whose state changed are recorded."""
+    appwash.results += [
+        services_result,
+        with_state(services_result, "38031", "OCCUPIED"),
+    ]
+
+    appwash.services()
+    appwash.services()
+    appwash.services()
+
+    rows = [dict(zip(COLUMNS, row)) for row in recorder.transitions(LOCATION_ID)]
+    assert [(r["service_id"], r["state"]) for r in rows] == [
+        ("38031", "AVAILABLE"),
+        ("38032", "AVAILABLE"),
+        ("38031", "OCCUPIED"),
+    ]
+    assert rows[0]["service_type"] == "DRYER"
+    assert recorder.recorded == 3
+
+
+def test_writes_are_batched(appwash, recorder):
+    """Test if transitions are written once batch_size of them are pending."""
+    recorder.batch_size = 3
+    recorder.flush_interval = 3600
+
+    appwash.services()
+    count = recorder._connection.execute("SELECT COUNT(*) FROM transitions")
+    assert count.fetchone()[0] == 0
+
+    recorder.flush()
+    count = recorder._connection.execute("SELECT COUNT(*) FROM transitions")
+    assert count.fetchone()[0] == 2
+
+
+def test_history_survives_restart(tmp_path, appwash, recorder, services_result):
+    """Test if a reopened history continues without recording unchanged states again."""
+    appwash.services()
+    recorder.close()
+
+    reopened = HistoryRecorder(str(tmp_path / "history.sqlite3"))
+    appwash.recorder = reopened
+    appwash.results.append(services_result)
+    appwash.services()
+
+    assert len(reopened.transitions()) == 2
+    assert reopened.transitions(service_id="38032", since=0)[0][3] == "AVAILABLE"
+    reopened.close()
+
+
+def test_watch_records_initial_states(appwash, recorder):
+    """Test if the first poll of a watcher is recorded although it isn't reported."""
+    watcher = appwash.watch()
+
+    assert watcher.poll() == []
+    assert len(recorder.transitions()) == 2
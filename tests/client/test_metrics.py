@@ -0,0 +1,134 @@
+import json
+
+import pytest
+
+from appwashpy import AppWash, Metrics, RetryPolicy
+from appwashpy.common.errors import AppWashConnectionError
+from tests.helpers import LOCATION_ID
+
+
+def mock_response(mocker, status_code: int, result: dict):
+    response = mocker.Mock()
+    response.status_code = status_code
+    response.content = json.dumps(result).encode()
+    return response
+
+
+@pytest.fixture
+def metrics() -> Metrics:
+    return Metrics(buckets=(0.1, 1))
+
+
+@pytest.fixture
+def appwash(mocker, metrics, authenticated_appwash) -> AppWash:
+    mocker.patch("appwashpy.client.requests.time.sleep")
+    appwash = authenticated_appwash(
+        session=mocker.Mock(), retry_policy=RetryPolicy(max_attempts=2), metrics=metrics
+    )
+    return appwash
+
+
+def test_metrics_per_endpoint(mocker, appwash, metrics, services_result):
+    """Test if latency, status codes and response sizes are recorded per endpoint."""
+    response = mock_response(mocker, 200, services_result)
+    appwash._session.request.return_value = response
+
+    appwash.services()
+    appwash.services()
+
+    services = metrics.to_dict()["SERVICES"]
+    assert services["requests"] == 2
+    assert sum(services["latency_buckets"].values()) == 2
+    assert services["status_codes"] == {200: 2}
+    assert services["error_codes"] == {0: 2}
+    assert services["response_bytes"] == 2 * len(response.content)
+
+
+def test_metrics_failed_attempts(mocker, appwash, metrics, services_result):
+    """Test if every failed attempt is recorded with its status code and exception."""
+    appwash._session.request.return_value = mock_response(mocker, 503, {})
+
+    with pytest.raises(AppWashConnectionError):
+        appwash.services()
+
+    services = metrics.to_dict()["SERVICES"]
+    assert services["requests"] == 2
+    assert services["status_codes"] == {503: 2}
+    assert services["exceptions"] == {"AppWashConnectionError": 2}
+    assert services["response_bytes"] == 0
+
+
+def test_metrics_response_bytes_per_attempt(mocker, appwash, metrics):
+    """Test if a failed attempt after a retry doesn't count the body of the previous attempt again."""
+    invalid = mocker.Mock(status_code=200, content=b"not json")
+    appwash._session.request.side_effect = [invalid, mock_response(mocker, 503, {})]
+
+    with pytest.raises(AppWashConnectionError):
+        appwash.services()
+
+    services = metrics.to_dict()["SERVICES"]
+    assert services["requests"] == 2
+    assert services["response_bytes"] == len(b"not json")
+
+
+def test_metrics_hooks(mocker, appwash, metrics, services_result):
+    """Test if the hooks are called before and after every attempt."""
+    appwash._session.request.return_value = mock_response(mocker, 200, services_result)
+    before = mocker.Mock()
+    after = mocker.Mock()
+    metrics.add_hooks(before_request=before, after_request=after)
+
+    appwash.services()
+
+    request = before.call_args.args[0]
+    assert request.url.endswith(f"/location/{LOCATION_ID}/connectorsv2")
+    assert after.call_args.args[0] is request
+    assert after.call_args.args[2] == None
+
+
+def test_metrics_prometheus(mocker, appwash, metrics, services_result):
+    """Test if the metrics are exported in the Prometheus text format."""
+    appwash._session.request.return_value = mock_response(mocker, 200, services_result)
+
+    appwash.services()
+
+    text = metrics.to_prometheus()
+    assert (
+        'appwash_request_duration_seconds_bucket{endpoint="SERVICES",le="+Inf"} 1'
+        in text
+    )
+    assert 'appwash_request_duration_seconds_count{endpoint="SERVICES"} 1' in text
+    assert 'appwash_responses_total{endpoint="SERVICES",status="200"} 1' in text
+    assert 'appwash_api_errors_total{endpoint="SERVICES",error_code="0"} 1' in text
+
+
+def test_metrics_disabled(mocker, services_result, authenticated_appwash):
+    """Test if no metrics are recorded by default."""
+    appwash = authenticated_appwash(session=mocker.Mock())
+    appwash._session.request.return_value = mock_response(mocker, 200, services_result)
+
+    appwash.services()
+
+    assert appwash.metrics == None
+
+
+def test_metrics_prometheus_grouped(
+    mocker, appwash, metrics, services_result, service_result
+):
+    """Test if the samples of each metric directly follow its TYPE line, for all endpoints."""
+    appwash._session.request.return_value = mock_response(mocker, 200, services_result)
+    appwash.services()
+    appwash._session.request.return_value = mock_response(mocker, 200, service_result)
+    appwash.service("12345")
+    appwash._session.request.return_value = mock_response(mocker, 503, {})
+    with pytest.raises(AppWashConnectionError):
+        appwash.services()
+
+    families = []
+    for line in metrics.to_prometheus().splitlines():
+        if line.startswith("# TYPE "):
+            families.append(line.split()[2])
+        else:
+            assert line.startswith(families[-1])
+
+    assert len(families) == len(set(families)) == 5
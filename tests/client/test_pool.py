@@ -0,0 +1,132 @@
+import threading
+import time
+
+import pytest
+
+from appwashpy import AccountPool, check_credentials_many
+from appwashpy.testing.simulator import Simulator, constant_latency
+from tests.helpers import EMAIL, LOCATION_ID, PASSWORD, authenticate
+
+OTHER_EMAIL = "other@mail.org"
+OTHER_PASSWORD = "otherpassword"
+
+
+@pytest.fixture
+def simulator():
+    accounts = {EMAIL: PASSWORD, OTHER_EMAIL: OTHER_PASSWORD}
+    # No machine is busy, so the first service can always be bought
+    with Simulator(
+        locations=2, services_per_location=4, occupancy=0, accounts=accounts, seed=0
+    ) as simulator:
+        yield simulator
+
+
+@pytest.fixture
+def pool(simulator):
+    with AccountPool(base_url=simulator.base_url) as pool:
+        pool.add_account(EMAIL, PASSWORD, [simulator.location_ids[0]])
+        pool.add_account(OTHER_EMAIL, OTHER_PASSWORD, [simulator.location_ids[1]])
+        yield pool
+
+
+def test_accounts_share_connection_pool(pool, simulator):
+    """Test if all accounts use the connections of the pool but have their own cookies and token."""
+    first, second = pool.accounts[EMAIL]._session, pool.accounts[OTHER_EMAIL]._session
+
+    assert first.get_adapter(simulator.base_url) is pool.adapter
+    assert second.get_adapter(simulator.base_url) is pool.adapter
+    assert first.cookies is not second.cookies
+
+    assert pool.accounts[EMAIL].token != pool.accounts[OTHER_EMAIL].token
+
+
+def test_calls_routed_by_location(pool, simulator):
+    """Test if calls for a location use the account it is assigned to."""
+    first, second = simulator.location_ids
+
+    assert pool.client(first).email == EMAIL
+    assert pool.client(second).email == OTHER_EMAIL
+    services = pool.services(second)
+    assert {service._client.email for service in services} == {OTHER_EMAIL}
+    assert pool.location(first).id == first
+
+
+def test_service_routed_after_loading(pool, simulator):
+    """Test if a service loaded through the pool is bought and stopped with the account of its location."""
+    service = pool.services(simulator.location_ids[1])[0]
+
+    assert pool.buy_service(service.service_id)
+    pool.stop_service(service.service_id)
+    assert pool.service(service.service_id).service_id == service.service_id
+
+
+def test_unknown_location(pool):
+    """Test if calls for unassigned locations and services raise a ValueError."""
+    with pytest.raises(ValueError):
+        pool.services("404")
+    with pytest.raises(ValueError):
+        pool.buy_service("404")
+    with pytest.raises(ValueError):
+        pool.assign("404", "nobody@mail.org")
+
+
+def test_services_many(pool, simulator):
+    """Test if the services of all assigned locations are loaded."""
+    results = pool.services_many()
+
+    assert list(results) == simulator.location_ids
+    assert all(len(services) == 4 for services in results.values())
+
+
+def test_concurrency_capped_per_account(mocker, services_result):
+    """Test if an account never has more than max_concurrency requests in flight."""
+    pool = AccountPool(max_concurrency=2, max_workers=8)
+    client = pool.add_account(EMAIL, PASSWORD)
+    authenticate(client)
+    location_ids = [f"{LOCATION_ID}{i}" for i in range(8)]
+    for location_id in location_ids:
+        pool.assign(location_id, EMAIL)
+
+    lock = threading.Lock()
+    in_flight = [0]
+    peak = [0]
+
+    def mock_perform_request(self):
+        with lock:
+            in_flight[0] += 1
+            peak[0] = max(peak[0], in_flight[0])
+        time.sleep(0.02)
+        with lock:
+            in_flight[0] -= 1
+        self._response = services_result
+
+    mocker.patch(
+        "appwashpy.client.requests.ApiRequest._perform_request", mock_perform_request
+    )
+    pool.services_many(location_ids)
+
+    assert peak[0] == 2
+
+
+def test_check_credentials_changed_password(pool, simulator):
+    """Test if accounts with a valid token log in again, so a changed password is detected."""
+    pool.accounts[EMAIL].token
+    simulator.accounts[EMAIL] = "changed"
+
+    assert pool.check_credentials() == {EMAIL: False, OTHER_EMAIL: True}
+
+
+def test_check_credentials_many(simulator):
+    """Test if many credentials are checked concurrently."""
+    simulator.latency = constant_latency(0.1)
+    credentials = [(EMAIL, PASSWORD), (OTHER_EMAIL, OTHER_PASSWORD)]
+    credentials += [(f"{i}@mail.org", "wrong") for i in range(6)]
+
+    start = time.perf_counter()
+    results = check_credentials_many(credentials, base_url=simulator.base_url)
+    elapsed = time.perf_counter() - start
+
+    assert results[EMAIL] == True
+    assert results[OTHER_EMAIL] == True
+    assert [results[f"{i}@mail.org"] for i in range(6)] == [False] * 6
+    assert elapsed < 0.1 * len(credentials)
@@ -0,0 +1,72 @@
+import threading
+import time
+
+from appwashpy import RateLimiter
+from appwashpy.client.ratelimit import HIGH_PRIORITY, LOW_PRIORITY
+from tests.helpers import SERVICE_ID
+
+
+def test_burst_without_waiting():
+    """Test if up to burst requests pass immediately."""
+    limiter = RateLimiter(rate=1, burst=3)
+    start = time.monotonic()
+
+    for _ in range(3):
+        limiter.acquire()
+
+    assert time.monotonic() - start < 0.1
+    assert limiter.waited == 0
+
+
+def test_rate_limited():
+    """Test if requests beyond the burst are delayed according to the rate."""
+    limiter = RateLimiter(rate=20, burst=1)
+    start = time.monotonic()
+
+    for _ in range(3):
+        limiter.acquire()
+
+    assert time.monotonic() - start >= 0.09
+    assert limiter.waited == 2
+
+
+def test_high_priority_served_first():
+    """Test if a waiting high priority request is served before earlier low priority ones."""
+    limiter = RateLimiter(rate=10, burst=1)
+    limiter.acquire()
+    order = []
+
+    def acquire(name, priority):
+        limiter.acquire(priority)
+        order.append(name)
+
+    threads = [
+        threading.Thread(target=acquire, args=(f"low{i}", LOW_PRIORITY))
+        for i in range(2)
+    ]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.03)
+    threads.append(threading.Thread(target=acquire, args=("high", HIGH_PRIORITY)))
+    threads[-1].start()
+    for thread in threads:
+        thread.join()
+
+    assert order[0] == "high"
+
+
+def test_appwash_requests_pass_limiter(
+    mocker, service_buy_result, authenticated_appwash
+):
+    """Test if the requests of a client acquire a token with the priority of their endpoint."""
+    mocker.patch(
+        "appwashpy.client.requests.ApiRequest._perform_request",
+        lambda self: setattr(self, "_response", service_buy_result),
+    )
+    limiter = RateLimiter(rate=100)
+    acquire = mocker.spy(limiter, "acquire")
+    appwash = authenticated_appwash(rate_limiter=limiter)
+
+    appwash.buy_service(SERVICE_ID, safe=False)
+
+    acquire.assert_called_once_with(HIGH_PRIORITY)
@@ -0,0 +1,152 @@
+import pytest
+import requests
+
+from appwashpy import ENDPOINT, AppWash, CircuitBreaker, Metrics, RetryPolicy
+from appwashpy.client.requests import endpoint_type
+from appwashpy.common.errors import AppWashConnectionError, CircuitOpenError
+from tests.helpers import SERVICE_ID
+
+
+@pytest.fixture
+def appwash(mocker, authenticated_appwash) -> AppWash:
+    mocker.patch("appwashpy.client.requests.time.sleep")
+    appwash = authenticated_appwash(
+        retry_policy=RetryPolicy(max_attempts=3),
+        circuit_breaker=CircuitBreaker(failure_threshold=4, reset_timeout=30),
+    )
+    return appwash
+
+
+def failing_then(mocker, failures: int, result: dict) -> list:
+    """Lets the first requests fail with a connection error, returns the list of attempted URLs."""
+    attempts = []
+
+    def mock_perform_request(self):
+        attempts.append(self.url)
+        if len(attempts) <= failures:
+            raise requests.ConnectionError("connection refused")
+        self._response = result
+
+    mocker.patch(
+        "appwashpy.client.requests.ApiRequest._perform_request", mock_perform_request
+    )
+    return attempts
+
+
+@pytest.mark.parametrize(
+    "endpoint, expected",
+    [
+        ("/login", ENDPOINT.LOGIN),
+        ("/locations/split/11111", ENDPOINT.LOCATION),
+        ("/location/11111/connectorsv2", ENDPOINT.SERVICES),
+        ("//connector/12345", ENDPOINT.SERVICE),
+        ("/connector/12345/start", ENDPOINT.START),
+        ("/connector/12345/stop", ENDPOINT.STOP),
+    ],
+)
+def test_endpoint_type(endpoint, expected):
+    """Test if request paths are classified by endpoint."""
+    assert endpoint_type(endpoint) == expected
+
+
+def test_read_retried(mocker, appwash, services_result):
+    """Test if a failing read is retried and succeeds."""
+    attempts = failing_then(mocker, 2, services_result)
+
+    assert len(appwash.services()) == 2
+    assert len(attempts) == 3
+    assert appwash.retry_stats.to_dict()["retries"] == {"SERVICES": 2}
+
+
+def test_read_gives_up(mocker, appwash, services_result):
+    """Test if a read failing on every attempt raises AppWashConnectionError."""
+    attempts = failing_then(mocker, 3, services_result)
+
+    with pytest.raises(AppWashConnectionError):
+        appwash.services()
+    assert len(attempts) == 3
+    assert appwash.retry_stats.to_dict()["failures"] == {"SERVICES": 1}
+
+
+def test_start_not_retried(mocker, appwash, service_buy_result):
+    """Test if starting a service isn't retried by default."""
+    attempts = failing_then(mocker, 1, service_buy_result)
+
+    with pytest.raises(AppWashConnectionError):
+        appwash.buy_service(SERVICE_ID, safe=False)
+    assert len(attempts) == 1
+
+
+def test_retry_policy_per_endpoint(mocker, service_buy_result, authenticated_appwash):
+    """Test if retries of starting a service can be enabled explicitly."""
+    mocker.patch("appwashpy.client.requests.time.sleep")
+    appwash = authenticated_appwash(
+        retry_policies={ENDPOINT.START: RetryPolicy(max_attempts=2)}
+    )
+    attempts = failing_then(mocker, 1, service_buy_result)
+
+    assert appwash.buy_service(SERVICE_ID, safe=False)
+    assert len(attempts) == 2
+
+
+def test_circuit_breaker_opens(mocker, appwash, services_result):
+    """Test if the breaker fails fast once the failure threshold is reached."""
+    attempts = failing_then(mocker, 100, services_result)
+
+    with pytest.raises(AppWashConnectionError):
+        appwash.services()
+    with pytest.raises(CircuitOpenError):
+        appwash.services()
+
+    assert len(attempts) == 4
+    assert appwash.circuit_breaker.trips == 1
+    assert appwash.circuit_breaker.state == "OPEN"
+
+
+def test_circuit_breaker_trial_closes(mocker):
+    """Test if a successful trial request after reset_timeout closes the breaker."""
+    monotonic = mocker.patch("appwashpy.client.retry.time.monotonic", return_value=0)
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30)
+    breaker.record_failure()
+
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request()
+
+    monotonic.return_value = 31
+    breaker.before_request()
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request()
+    breaker.record_success()
+
+    assert breaker.state == "CLOSED"
+    assert breaker.rejected == 2
+
+
+def test_circuit_breaker_trial_ends_on_unexpected_error(
+    mocker, authenticated_appwash, services_result
+):
+    """Test if a trial request ended by a raising metrics hook doesn't keep the breaker from letting another trial through."""
+    monotonic = mocker.patch("appwashpy.client.retry.time.monotonic", return_value=0)
+    metrics = Metrics()
+    appwash = authenticated_appwash(
+        circuit_breaker=CircuitBreaker(failure_threshold=1, reset_timeout=30),
+        metrics=metrics,
+    )
+    appwash.circuit_breaker.record_failure()
+    failing_then(mocker, 0, services_result)
+    hook = mocker.Mock(side_effect=[RuntimeError("hook failed"), None])
+    metrics.add_hooks(before_request=hook)
+
+    monotonic.return_value = 31
+    with pytest.raises(RuntimeError):
+        appwash.services()
+
+    assert len(appwash.services()) == 2
+    assert appwash.circuit_breaker.state == "CLOSED"
+
+
+def test_backoff_doubles_until_max():
+    """Test if the backoff doubles per attempt and is capped."""
+    policy = RetryPolicy(backoff=1, max_backoff=5, jitter=False)
+
+    assert [policy.delay(attempt) for attempt in range(1, 5)] == [1, 2, 4, 5]
@@ -0,0 +1,133 @@
+from appwashpy import AdaptivePoller, Service
+from appwashpy.common.enums import STATE
+from appwashpy.common.errors import AppWashConnectionError
+
+
+class FakeClient:
+    """Returns services whose state is controlled by the test."""
+
+    def __init__(self):
+        self.states = {}
+        self.calls = []
+
+    def service(self, service_id: str) -> Service:
+        self.calls.append(service_id)
+        if self.states[service_id] == None:
+            raise AppWashConnectionError("timeout")
+        state, session_start = self.states[service_id]
+        return Service(
+            _client=self,
+            service_id=service_id,
+            location_id="11111",
+            type="WASHING_MACHINE",
+            name="Waschmaschine",
+            cost_cents=250,
+            reservable=False,
+            state=state,
+            session_start=session_start,
+        )
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def poller(client: FakeClient, clock: Clock) -> AdaptivePoller:
+    return AdaptivePoller(
+        client,
+        client.states,
+        base_interval=60,
+        min_interval=15,
+        max_interval=1800,
+        default_cycle=3600,
+        clock=clock,
+    )
+
+
+def test_available_polled_every_base_interval():
+    """Test if available services are polled every base_interval."""
+    client, clock = FakeClient(), Clock()
+    client.states["1"] = (STATE.AVAILABLE.name, None)
+    scheduler = poller(client, clock)
+
+    scheduler.poll_due()
+    clock.now += 59
+    assert scheduler.poll_due() == []
+    clock.now += 1
+    assert len(scheduler.poll_due()) == 1
+
+
+def test_no_services():
+    """Test if iterating a poller without services stops instead of failing."""
+    scheduler = poller(FakeClient(), Clock())
+
+    assert list(scheduler) == []
+    assert scheduler.stats()["calls"] == 0
+
+
+def test_occupied_polled_before_expected_finish():
+    """Test if an occupied service is next polled shortly before its expected finish."""
+    client, clock = FakeClient(), Clock()
+    client.states["1"] = (STATE.OCCUPIED.name, 1000)
+    scheduler = poller(client, clock)
+
+    scheduler.poll_due()
+
+    assert scheduler._queue[0][0] == 1000 + 1800
+    clock.now = 1000 + 1800
+    scheduler.poll_due()
+    assert scheduler._queue[0][0] == 1000 + 3600 - 15
+
+
+def test_observed_cycle_length_used():
+    """Test if finished sessions adapt the expected cycle length."""
+    client, clock = FakeClient(), Clock()
+    client.states["1"] = (STATE.OCCUPIED.name, 1000)
+    scheduler = poller(client, clock)
+    scheduler.poll_due()
+
+    clock.now = 1000 + 1800
+    client.states["1"] = (STATE.AVAILABLE.name, None)
+    scheduler.poll_due()
+
+    assert scheduler.expected_cycle(client.service("1")) == 1800
+
+
+def test_stats_report_saved_calls():
+    """Test if the saved calls are reported against fixed-interval polling."""
+    client, clock = FakeClient(), Clock()
+    client.states["1"] = (STATE.OCCUPIED.name, 1000)
+    scheduler = poller(client, clock)
+
+    for _ in range(31):
+        scheduler.poll_due()
+        clock.now += 60
+
+    stats = scheduler.stats()
+    assert stats["calls"] == 2
+    assert stats["fixed_interval_calls"] == 32
+    assert stats["calls_saved"] == 30
+
+
+def test_failed_poll_retried_with_backoff():
+    """Test if a service that fails to load stays scheduled and the other due services are still polled."""
+    client, clock = FakeClient(), Clock()
+    client.states["1"] = None
+    client.states["2"] = (STATE.AVAILABLE.name, None)
+    scheduler = poller(client, clock)
+
+    assert [service.service_id for service in scheduler.poll_due()] == ["2"]
+    assert (1000 + 15, "1") in scheduler._queue
+
+    clock.now += 15
+    scheduler.poll_due()
+    assert (1000 + 15 + 30, "1") in scheduler._queue
+
+    client.states["1"] = (STATE.AVAILABLE.name, None)
+    clock.now += 30
+    assert [service.service_id for service in scheduler.poll_due()] == ["1"]
+    assert scheduler.stats()["errors"] == 2
@@ -0,0 +1,94 @@
+import multiprocessing
+
+import pytest
+
+from appwashpy import AppWash, FileTokenStore
+from appwashpy.common.helper import current_timestamp
+from tests.helpers import EMAIL, PASSWORD, TOKEN
+
+
+@pytest.fixture
+def store(tmp_path) -> FileTokenStore:
+    return FileTokenStore(str(tmp_path / "tokens.json"))
+
+
+def valid_entry(token: str = TOKEN) -> dict:
+    return {
+        "token": token,
+        "token_expiry": current_timestamp() + 3600,
+        "clock_offset": 0,
+    }
+
+
+def test_save_and_load(store):
+    """Test if a saved entry can be loaded again and is keyed by email."""
+    store.save(EMAIL, valid_entry())
+
+    assert store.load(EMAIL)["token"] == TOKEN
+    assert store.load("other@mail.org") == None
+
+
+def test_get_or_create_reuses_valid_entry(store, mocker):
+    """Test if a valid stored token is returned without creating a new one."""
+    store.save(EMAIL, valid_entry())
+    create = mocker.Mock()
+
+    assert store.get_or_create(EMAIL, create)["token"] == TOKEN
+    create.assert_not_called()
+
+
+def test_get_or_create_replaces_expiring_entry(store):
+    """Test if a token expiring within min_ttl is replaced."""
+    store.save(EMAIL, valid_entry("old"))
+
+    entry = store.get_or_create(EMAIL, lambda: valid_entry("new"), min_ttl=7200)
+
+    assert entry["token"] == "new"
+    assert store.load(EMAIL)["token"] == "new"
+
+
+def test_appwash_skips_login_with_stored_token(store, mocker):
+    """Test if AppWash uses the stored token instead of logging in."""
+    store.save(EMAIL, valid_entry())
+    authenticate = mocker.patch("appwashpy.client.appwash.AppWash._authenticate")
+
+    appwash = AppWash(EMAIL, PASSWORD, token_store=store)
+
+    assert appwash.token == TOKEN
+    authenticate.assert_not_called()
+
+
+def test_appwash_stores_new_token(store, mocker, authentication_successful_result):
+    """Test if the token of a login is written to the store."""
+    mocker.patch(
+        "appwashpy.client.requests.ApiRequest._perform_request",
+        lambda self: setattr(self, "_response", authentication_successful_result),
+    )
+
+    AppWash(EMAIL, PASSWORD, token_store=store).token
+
+    assert store.load(EMAIL)["token"] == TOKEN
+
+
+def _create_in_process(path, counter):
+    def create():
+        with counter.get_lock():
+            counter.value += 1
+        return valid_entry()
+
+    FileTokenStore(path).get_or_create(EMAIL, create)
+
+
+def test_concurrent_processes_create_once(store):
+    """Test if concurrent processes share a single token creation."""
+    counter = multiprocessing.Value("i", 0)
+    processes = [
+        multiprocessing.Process(target=_create_in_process, args=(store.path, counter))
+        for _ in range(4)
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+
+    assert counter.value == 1
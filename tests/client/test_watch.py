@@ -0,0 +1,78 @@
+import copy
+
+import pytest
+
+from appwashpy import AppWash, Service, ServiceStateChange
+from appwashpy.common.enums import STATE
+
+
+@pytest.fixture
+def appwash(authenticated_appwash) -> AppWash:
+    return authenticated_appwash()
+
+
+@pytest.fixture
+def snapshots(mocker, services_result) -> list:
+    """Results returned by consecutive polls, editable by the tests."""
+    snapshots = [services_result]
+
+    def mock_perform_request(self):
+        self._response = snapshots[0] if len(snapshots) == 1 else snapshots.pop(0)
+
+    mocker.patch(
+        "appwashpy.client.requests.ApiRequest._perform_request", mock_perform_request
+    )
+    return snapshots
+
+
+def test_first_poll_silent(appwash, snapshots):
+    """Test if the first poll only records the initial states."""
+    watcher = appwash.watch()
+
+    assert watcher.poll() == []
+
+
+def test_emit_initial(appwash, snapshots):
+    """Test if emit_initial reports every service on the first poll."""
+    changes = appwash.watch(emit_initial=True).poll()
+
+    assert len(changes) == 2
+    assert changes[0].old_state == None
+    assert changes[0].new_state == STATE.AVAILABLE
+
+
+def test_state_change(mocker, appwash, snapshots, services_result):
+    """Test if only the service with a changed state is reported."""
+    occupied = copy.deepcopy(services_result)
+    occupied["data"][0]["state"] = "OCCUPIED"
+    occupied["data"][0]["lastSessionStart"] = 1657800000
+    snapshots.insert(0, services_result)
+    snapshots[-1] = occupied
+
+    watcher = appwash.watch()
+    watcher.poll()
+    from_result = mocker.spy(Service, "_from_result")
+    changes = watcher.poll()
+
+    assert len(changes) == 1
+    change = changes[0]
+    assert isinstance(change, ServiceStateChange)
+    assert change.service_id == "38031"
+    assert change.old_state == STATE.AVAILABLE
+    assert change.new_state == STATE.OCCUPIED
+    assert change.session_start == 1657800000
+    assert from_result.call_count == 1
+
+
+def test_iterate(mocker, appwash, snapshots, services_result):
+    """Test if iterating the watcher yields the changes of consecutive polls."""
+    mocker.patch("appwashpy.client.watch.time.sleep")
+    faulted = copy.deepcopy(services_result)
+    faulted["data"][1]["state"] = "FAULTED"
+    snapshots.insert(0, services_result)
+    snapshots[-1] = faulted
+
+    change = next(iter(appwash.watch(interval=0)))
+
+    assert change.service_id == "38032"
+    assert change.new_state == STATE.FAULTED
@@ -0,0 +1,61 @@
+import json
+
+import pytest
+
+from appwashpy.common.serialization import JsonArrayStream
+
+
+def chunked(data: dict, size: int) -> list:
+    body = json.dumps(data, ensure_ascii=False).encode()
+    return [body[i : i + size] for i in range(0, len(body), size)]
+
+
+@pytest.mark.parametrize("size", [1, 5, 64, 100000])
+def test_stream_matches_full_decode(services_result, size):
+    """Test if streaming yields the same items and header as decoding the whole body."""
+    stream = JsonArrayStream(chunked(services_result, size), "data")
+
+    assert list(stream) == services_result["data"]
+    assert stream.header["errorCode"] == 0
+    assert stream.header["serverTime"] == services_result["serverTime"]
+
+
+def test_stream_numbers_split_across_chunks():
+    """Test if numbers at a chunk boundary aren't decoded before they are complete."""
+    stream = JsonArrayStream([b'{"data": [12', b"34, 5", b"6]}"], "data")
+
+    assert list(stream) == [1234, 56]
+
+
+def test_stream_floats_in_single_bytes():
+    """Test if floats and exponents cut at any byte are decoded once they are complete."""
+    data = {
+        "errorCode": 0,
+        "data": [1.5, -0.25, 1e3, 2.5e-3, 10, {"a": 1.75}],
+        "t": 3e2,
+    }
+
+    stream = JsonArrayStream(chunked(data, 1), "data")
+
+    assert list(stream) == data["data"]
+    assert stream.header == {"errorCode": 0, "t": 300.0}
+
+
+def test_stream_number_followed_by_garbage():
+    """Test if a number followed by something other than a delimiter raises an error."""
+    with pytest.raises(ValueError):
+        list(JsonArrayStream([b'{"data": [1.5x, 2]}'], "data"))
+
+
+def test_stream_without_array(location_invalid_result):
+    """Test if a response without the array yields nothing but fills the header."""
+    stream = JsonArrayStream(chunked(location_invalid_result, 7), "data")
+
+    assert list(stream) == []
+    assert stream.header["errorCode"] == 33
+
+
+def test_stream_truncated():
+    """Test if a truncated body raises an error."""
+    with pytest.raises(ValueError):
+        list(JsonArrayStream([b'{"data": [{"a": 1}, {"b"'], "data"))
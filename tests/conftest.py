@@ -0,0 +1,282 @@
+"""Sample results of the AppWash API shared by the tests."""
+
+import pytest
+
+from appwashpy import AppWash
+from tests.helpers import (
+    EMAIL,
+    LOCATION_ID,
+    PASSWORD,
+    SERVERTIME,
+    SERVICE_ID,
+    TOKEN,
+    authenticate,
+)
+
+
+@pytest.fixture
+def authenticated_appwash():
+    """Factory of clients that are already logged in.
+
+    Takes the keyword arguments of AppWash, and client_class to create e.g. an AsyncAppWash instead.
+    """
+
+    def create(client_class=AppWash, location_id: str = LOCATION_ID, **options):
+        return authenticate(client_class(EMAIL, PASSWORD, location_id, **options))
+
+    return create
+
+
+@pytest.fixture
+def authentication_successful_result():
+    """Sample result for Authentication Request"""
+    return {
+        "errorCode": 0,
+        "errorDescription": "",
+        "token_expire_ts": 1658354400,
+        "serverTime": SERVERTIME,
+        "activeSessions": [],
+        "login": {
+            "email": EMAIL,
+            "username": EMAIL,
+            "externalId": "123456789",
+            "language": "EN",
+            "token": TOKEN,
+            "offlineAllowed": True,
+            "manageOthers": True,
+            "administrator": True,
+            "viewInvoice": True,
+            "viewTransactionHistory": False,
+            "viewProducts": False,
+            "apiMessagePermission": True,
+            "correctionAllowed": False,
+            "installer": False,
+            "startMultiple": True,
+            "startForOthers": False,
+            "timeForReview": False,
+        },
+    }
+
+
+@pytest.fixture
+def authentication_wrong_credentials_result():
+    """Sample result for Authentication Request with wrong credentials"""
+    return {
+        "errorCode": 61,
+        "errorDescription": "Login failed. Please check your username and password. (code 61)",
+        "token_expire_ts": 0,
+        "serverTime": SERVERTIME,
+    }
+
+
+@pytest.fixture
+def location_result():
+    return {
+        "errorCode": 0,
+        "errorDescription": "",
+        "token_expire_ts": 1658354400,
+        "serverTime": SERVERTIME,
+        "data": {
+            "name": "Box 220402",
+            "externalId": LOCATION_ID,
+            "gps": {},
+            "locationTypeV2": "OTHER",
+            "locationTypeObject": {"type": "OTHER", "name": "Andere"},
+            "locationStatus": "PRODUCTION_PHASE",
+            "durationRequired": False,
+            "knownCommunicationIssues": False,
+            "services": [
+                {"type": "DRYER", "name": "Trockner"},
+                {"type": "WASHING_MACHINE", "name": "Waschmaschine"},
+            ],
+            "pricing": [
+                {
+                    "serviceType": "WASHING_MACHINE",
+                    "componentPriceObjects": [
+                        {
+                            "type": "UNIT_PRICE",
+                            "fullPriceString": "Pro Waschgang: EUR 2.75",
+                            "priceString": "EUR 2.75",
+                            "costCents": 275,
+                        }
+                    ],
+                },
+                {
+                    "serviceType": "DRYER",
+                    "componentPriceObjects": [
+                        {
+                            "type": "UNIT_PRICE",
+                            "fullPriceString": "Pro Trockengang: EUR 2.25",
+                            "priceString": "EUR 2.25",
+                            "costCents": 225,
+                        }
+                    ],
+                },
+            ],
+            "products": [],
+            "childLocations": [],
+            "maxDaysInAdvance": 7,
+            "reservedType": "NOT_RESERVABLE",
+            "serviceTypes": [],
+        },
+    }
+
+
+@pytest.fixture
+def location_invalid_result():
+    return {
+        "errorCode": 33,
+        "errorDescription": "We couldn't find this location. Please try again later. (code 33)",
+        "token_expire_ts": 1658354400,
+        "serverTime": SERVERTIME,
+    }
+
+
+@pytest.fixture
+def services_result():
+    return {
+        "errorCode": 0,
+        "errorDescription": "",
+        "token_expire_ts": 1658354400,
+        "serverTime": 1657800054,
+        "data": [
+            {
+                "externalId": "38031",
+                "locationId": LOCATION_ID,
+                "location": "Waschküche - Haus 2",
+                "locationTopLevelName": "Ulm - Hochsträß 2",
+                "serviceType": "DRYER",
+                "serviceName": "Trockner",
+                "unit": "Transaktion",
+                "state": "AVAILABLE",
+                "stateDescription": "frei",
+                "requiredFields": [],
+                "freeFormQuestionInt": [],
+                "pricing": [
+                    {
+                        "serviceType": "DRYER",
+                        "componentPriceObjects": [
+                            {
+                                "type": "UNIT_PRICE",
+                                "fullPriceString": "Pro Trockengang: EUR 2.25",
+                                "priceString": "EUR 2.25",
+                                "costCents": 225,
+                            }
+                        ],
+                    }
+                ],
+                "tariffSetName": "default",
+                "gps": {},
+                "reservable": "NOT_RESERVABLE",
+                "reservations": [],
+                "blockTimeSeconds": 900,
+                "timeOfArrivalSeconds": 0,
+                "checkoutTimeSeconds": 0,
+                "startWithPredeterminedUsage": False,
+                "optionalName": "",
+            },
+            {
+                "externalId": "38032",
+                "locationId": LOCATION_ID,
+                "location": "Waschküche - Haus 2",
+                "locationTopLevelName": "Ulm - Hochsträß 2",
+                "serviceType": "WASHING_MACHINE",
+                "serviceName": "Waschmaschine",
+                "unit": "Transaktion",
+                "state": "AVAILABLE",
+                "stateDescription": "frei",
+                "requiredFields": [],
+                "freeFormQuestionInt": [],
+                "pricing": [
+                    {
+                        "serviceType": "WASHING_MACHINE",
+                        "componentPriceObjects": [
+                            {
+                                "type": "UNIT_PRICE",
+                                "fullPriceString": "Pro Waschgang: EUR 2.75",
+                                "priceString": "EUR 2.75",
+                                "costCents": 275,
+                            }
+                        ],
+                    }
+                ],
+                "tariffSetName": "default",
+                "gps": {},
+                "reservable": "NOT_RESERVABLE",
+                "reservations": [],
+                "blockTimeSeconds": 900,
+                "timeOfArrivalSeconds": 0,
+                "checkoutTimeSeconds": 0,
+                "startWithPredeterminedUsage": False,
+                "optionalName": "",
+            },
+        ],
+    }
+
+
+@pytest.fixture
+def service_result():
+    return {
+        "errorCode": 0,
+        "errorDescription": "",
+        "token_expire_ts": 1658354400,
+        "serverTime": 1657832158,
+        "data": {
+            "externalId": SERVICE_ID,
+            "locationId": LOCATION_ID,
+            "location": "Sample Name",
+            "locationTopLevelName": "SampleTopLevelName",
+            "serviceType": "WASHING_MACHINE",
+            "serviceName": "Waschmaschine",
+            "unit": "Transaktion",
+            "state": "AVAILABLE",
+            "stateDescription": "frei",
+            "requiredFields": [],
+            "freeFormQuestionInt": [],
+            "pricing": [
+                {
+                    "serviceType": "WASHING_MACHINE",
+                    "componentPriceObjects": [
+                        {
+                            "type": "UNIT_PRICE",
+                            "fullPriceString": "Pro Waschgang: EUR 2.50",
+                            "priceString": "EUR 2.50",
+                            "costCents": 250,
+                        }
+                    ],
+                }
+            ],
+            "tariffSetName": "default",
+            "gps": {},
+            "reservable": "NOT_RESERVABLE",
+            "reservations": [],
+            "blockTimeSeconds": 900,
+            "timeOfArrivalSeconds": 0,
+            "checkoutTimeSeconds": 0,
+            "startWithPredeterminedUsage": False,
+            "optionalName": "",
+        },
+    }
+
+
+@pytest.fixture
+def service_buy_result():
+    return {
+        "errorCode": 0,
+        "errorDescription": "",
+        "token_expire_ts": 1658268000,
+        "serverTime": SERVERTIME,
+        "data": {
+            "sessionId": "4114114",
+            "externalId": "12345",
+            "locationExternalId": LOCATION_ID,
+            "locationName": "Location",
+            "serviceType": "WASHING_MACHINE",
+            "startDateTime": 1657714551,
+            "endDateTime": 0,
+            "state": "SESSION_WAIT_ON",
+            "stateTranslation": {"type": "SESSION_WAIT_ON", "name": "wird gestartet"},
+            "stateDescription": "wird gestartet",
+            "pinCodes": [],
+        },
+    }
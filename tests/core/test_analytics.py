@@ -0,0 +1,128 @@
+import math
+from types import SimpleNamespace
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from appwashpy import AppWash, HistoryRecorder, OccupancyAnalytics, Service
+from tests.helpers import EMAIL, LOCATION_ID, PASSWORD
+
+# 1970-01-05 was a Monday
+MONDAY = 4 * 86400
+
+
+@pytest.fixture
+def analytics() -> OccupancyAnalytics:
+    # Dryer a is busy from 00:30 to 01:30, washing machine b from 01:00 until the end at 02:00
+    return OccupancyAnalytics(
+        ["a", "a", "a", "b", "b"],
+        ["L"] * 5,
+        ["DRYER"] * 3 + ["WASHING_MACHINE"] * 2,
+        ["AVAILABLE", "OCCUPIED", "AVAILABLE", "AVAILABLE", "OCCUPIED"],
+        [MONDAY, MONDAY + 1800, MONDAY + 5400, MONDAY, MONDAY + 3600],
+        until=MONDAY + 7200,
+    )
+
+
+def test_heatmap_by_service_type(analytics):
+    """Test if the heatmap holds the busy share per hour of the week and NaN for unobserved hours."""
+    labels, heatmap = analytics.heatmap()
+
+    assert labels == ["DRYER", "WASHING_MACHINE"]
+    assert heatmap.shape == (2, 168)
+    assert heatmap[0, :2].tolist() == [0.5, 0.5]
+    assert heatmap[1, :2].tolist() == [0.0, 1.0]
+    assert np.isnan(heatmap[:, 2:]).all()
+
+
+def test_heatmap_utc_offset(analytics):
+    """Test if the offset shifts the hours of the week."""
+    _, heatmap = analytics.heatmap(utc_offset=3600)
+
+    assert heatmap[1, 1:3].tolist() == [0.0, 1.0]
+    assert np.isnan(heatmap[1, 0])
+
+
+def test_heatmap_by_several_groups(analytics):
+    """Test if grouping by a tuple labels the groups with tuples."""
+    labels, heatmap = analytics.heatmap(("location_id", "service_type"))
+
+    assert labels == [("L", "DRYER"), ("L", "WASHING_MACHINE")]
+    assert heatmap.shape == (2, 168)
+
+
+def test_invalid_group(analytics):
+    """Test if an unknown group raises a ValueError."""
+    with pytest.raises(ValueError):
+        analytics.heatmap("state")
+
+
+def test_cycle_lengths_ignore_ongoing_runs(analytics):
+    """Test if only finished busy runs count as cycles."""
+    assert analytics.cycle_lengths() == {"DRYER": 3600.0}
+    assert analytics.cycle_lengths("service_id") == {"a": 3600.0}
+
+
+def test_free_within(analytics):
+    """Test if available services are free and busy ones without finished cycles of their type aren't."""
+    assert analytics.free_within(600) == {"a": 1.0, "b": 0.0}
+    assert analytics.location_free_within(600) == {"L": 1.0}
+    assert analytics.location_free_within(600, "WASHING_MACHINE") == {"L": 0.0}
+
+
+def test_free_within_empty_history():
+    """Test if an empty history has no services to estimate."""
+    analytics = OccupancyAnalytics.from_transitions([])
+
+    assert analytics.free_within(60) == {}
+    assert analytics.location_free_within(60) == {}
+
+
+def test_free_within_estimated_from_cycles():
+    """Test if a busy service is estimated from the finished cycles that lasted at least as long as its run."""
+    ids = ["a"] * 6 + ["b"]
+    states = ["OCCUPIED", "AVAILABLE"] * 3 + ["OCCUPIED"]
+    times = [0, 1000, 2000, 4000, 5000, 8000, 9000]
+    analytics = OccupancyAnalytics(ids, ["L"] * 7, ["DRYER"] * 7, states, times)
+
+    # Cycles of 1000, 2000 and 3000 seconds, b has been busy for 0 seconds
+    assert analytics.free_within(1500, now=9000)["b"] == pytest.approx(1 / 3)
+    # Two cycles lasted at least 1500 seconds, one of them ended within 1000 seconds more
+    assert analytics.free_within(1000, now=10500)["b"] == pytest.approx(1 / 2)
+    assert math.isclose(analytics.location_free_within(1500, now=9000)["L"], 1)
+
+
+def test_from_recorder(tmp_path):
+    """Test if the analytics are built from the transitions of a recorder."""
+    recorder = HistoryRecorder(str(tmp_path / "history.sqlite3"))
+    for state, observed_at in (
+        ("AVAILABLE", MONDAY),
+        ("OCCUPIED", MONDAY + 1800),
+        ("AVAILABLE", MONDAY + 5400),
+    ):
+        service = SimpleNamespace(
+            service_id="a",
+            location_id="L",
+            type="DRYER",
+            state=state,
+            session_start=None,
+        )
+        recorder.record([service], observed_at)
+
+    analytics = OccupancyAnalytics.from_recorder(recorder, location_id="L")
+    recorder.close()
+
+    assert analytics.cycle_lengths() == {"DRYER": 3600.0}
+    assert analytics.until == MONDAY + 5400
+
+
+def test_from_snapshots(services_result):
+    """Test if the analytics are built from snapshots of services."""
+    appwash = AppWash(EMAIL, PASSWORD, LOCATION_ID)
+    services = [Service._from_result(appwash, s) for s in services_result["data"]]
+
+    analytics = OccupancyAnalytics.from_snapshots([(MONDAY, services)])
+
+    assert analytics.labels["location_id"].tolist() == [LOCATION_ID]
+    assert len(analytics.free_within(60)) == len(services)
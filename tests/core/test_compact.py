@@ -0,0 +1,53 @@
+from appwashpy import CompactLocation, CompactService, Location, Service
+
+
+def test_compact_service_matches_service(services_result):
+    """Test if CompactService decodes the same values as Service."""
+    for result in services_result["data"]:
+        service = Service._from_result(None, result)
+        compact = CompactService._from_result(None, result)
+
+        for field in (
+            "service_id",
+            "location_id",
+            "type",
+            "name",
+            "cost_cents",
+            "reservable",
+            "state",
+            "session_start",
+        ):
+            assert getattr(compact, field) == getattr(service, field)
+
+
+def test_compact_service_has_no_dict(service_result):
+    """Test if CompactService instances use slots instead of a __dict__."""
+    compact = CompactService._from_result(None, service_result["data"])
+
+    assert not hasattr(compact, "__dict__")
+
+
+def test_compact_location_matches_location(location_result):
+    """Test if CompactLocation decodes the same values as Location and keeps no raw payload."""
+    location = Location._from_result(location_result["data"])
+    compact = CompactLocation._from_result(location_result["data"])
+
+    assert not hasattr(compact, "__dict__")
+    assert set(CompactLocation.__slots__) == set(Location.__dataclass_fields__)
+    assert compact.services == location.services
+    assert compact.id == location.id
+    assert compact.reservable == location.reservable
+
+
+def test_appwash_returns_compact_models(mocker, services_result, authenticated_appwash):
+    """Test if a compact client returns CompactService objects."""
+    mocker.patch(
+        "appwashpy.client.requests.ApiRequest._perform_request",
+        lambda self: setattr(self, "_response", services_result),
+    )
+    appwash = authenticated_appwash(compact=True)
+
+    services = appwash.services()
+
+    assert all(isinstance(s, CompactService) for s in services)
+    assert services[0]._client is appwash
@@ -0,0 +1,45 @@
+import copy
+
+from appwashpy import Location, PriceCatalog
+from appwashpy.common.enums import SERVICE_TYPE
+from appwashpy.core.pricing import index_pricing
+from tests.helpers import LOCATION_ID
+
+
+def test_index_pricing_keeps_first_entry(location_result):
+    """Test if the index maps every service type to its first pricing entry."""
+    pricing = location_result["data"]["pricing"]
+    duplicate = dict(pricing[0], componentPriceObjects=[{"costCents": 1}])
+
+    index = index_pricing(pricing + [duplicate])
+
+    assert index["WASHING_MACHINE"] is pricing[0]
+    assert index["DRYER"] is pricing[1]
+
+
+def test_identical_tariffs_interned(location_result):
+    """Test if locations with identical tariffs share the pricing entries."""
+    catalog = PriceCatalog()
+    other = copy.deepcopy(location_result["data"])
+    other["externalId"] = "22222"
+
+    first = Location._from_result(location_result["data"], catalog)
+    second = Location._from_result(other, catalog)
+
+    assert first.services[0]["costs_cent"] is second.services[0]["costs_cent"]
+    assert len(catalog) == 2
+
+
+def test_locations_below(location_result):
+    """Test if the catalog finds the locations where a service costs less than a limit."""
+    catalog = PriceCatalog()
+    expensive = copy.deepcopy(location_result["data"])
+    expensive["externalId"] = "22222"
+    expensive["pricing"][1]["componentPriceObjects"][0]["costCents"] = 300
+    Location._from_result(location_result["data"], catalog)
+    Location._from_result(expensive, catalog)
+
+    assert catalog.locations_below(SERVICE_TYPE.DRYER, 250) == [LOCATION_ID]
+    assert catalog.locations_below(SERVICE_TYPE.DRYER, 301) == [LOCATION_ID, "22222"]
+    assert catalog.cost_cents("22222", SERVICE_TYPE.DRYER) == 300
+    assert catalog.cost_cents("33333", SERVICE_TYPE.DRYER) == None
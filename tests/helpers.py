@@ -0,0 +1,18 @@
+"""Constants and helpers shared by the tests."""
+
+EMAIL = "example@mail.org"
+PASSWORD = "abcdefgh"
+LOCATION_ID = "11111"
+TOKEN = "1111111:11111111111:1111"
+SERVERTIME = 1657791333
+SERVICE_ID = "12345"
+
+# Expiry of TOKEN, far enough in the future that it is never renewed
+TOKEN_EXPIRY = 4102444800
+
+
+def authenticate(client):
+    """Logs a client in with TOKEN without a request and returns it."""
+    client._token = TOKEN
+    client._token_expiry = TOKEN_EXPIRY
+    return client
@@ -0,0 +1,178 @@
+import json
+import threading
+
+import pytest
+
+from appwashpy import AppWash
+from appwashpy.cli import main, serve
+from appwashpy.client.daemon import AppWashDaemon
+from appwashpy.testing.simulator import Simulator
+from tests.helpers import EMAIL, PASSWORD
+
+
+@pytest.fixture
+def simulator():
+    with Simulator(services_per_location=4, occupancy=0, seed=1) as simulator:
+        yield simulator
+
+
+@pytest.fixture
+def socket_path(tmp_path) -> str:
+    return str(tmp_path / "daemon.sock")
+
+
+@pytest.fixture
+def run(simulator, tmp_path, socket_path, capsys):
+    def run(*argv: str, credentials: bool = True) -> tuple:
+        options = ["--socket", socket_path, "--base-url", simulator.base_url]
+        if credentials:
+            options += ["--email", EMAIL, "--password", PASSWORD]
+            options += ["--token-store", str(tmp_path / "tokens.json")]
+        code = main(options + list(argv))
+        out, err = capsys.readouterr()
+        return code, [json.loads(line) for line in out.splitlines()], err
+
+    return run
+
+
+@pytest.fixture
+def daemon(simulator, socket_path):
+    with AppWash(EMAIL, PASSWORD, base_url=simulator.base_url) as client:
+        client.token
+        daemon = AppWashDaemon(lambda request: serve(client, request), socket_path)
+        thread = threading.Thread(
+            target=daemon.serve_forever, kwargs={"poll_interval": 0.01}, daemon=True
+        )
+        thread.start()
+        yield daemon
+        daemon.shutdown()
+        daemon.server_close()
+
+
+def test_services(run, simulator):
+    """Test if the services of a location are printed as JSON."""
+    location_id = simulator.location_ids[0]
+
+    code, results, _ = run("services", location_id, "--type", "DRYER")
+
+    assert code == 0
+    assert [s["service_id"] for s in results[0]] == [
+        s.service_id
+        for s in simulator.services_of(location_id)
+        if s.service_type == "DRYER"
+    ]
+    assert results[0][0]["state"] == "AVAILABLE"
+    assert "_client" not in results[0][0]
+
+
+def test_default_location(run, simulator):
+    """Test if --location is used by commands without a location."""
+    location_id = simulator.location_ids[0]
+
+    code, results, _ = run("--location", location_id, "location")
+
+    assert code == 0
+    assert results[0]["id"] == location_id
+
+
+def test_buy_and_stop(run, simulator):
+    """Test if a service is bought and stopped."""
+    service_id = simulator.services_of(simulator.location_ids[0])[0].service_id
+
+    code, results, _ = run("buy", service_id)
+    assert code == 0
+    assert results[0]["bought"] == True
+    assert results[0]["state_source"] == "network"
+
+    code, results, _ = run("stop", service_id)
+    assert code == 0
+    assert results == [{"service_id": service_id, "stopped": True}]
+
+
+def test_watch_initial(run, simulator):
+    """Test if watch prints one line per change and stops after --polls."""
+    location_id = simulator.location_ids[0]
+
+    code, results, _ = run("watch", location_id, "--initial", "--polls", "1")
+
+    assert code == 0
+    assert len(results) == 4
+    assert {change["new_state"] for change in results} == {"AVAILABLE"}
+
+
+def test_api_error(run):
+    """Test if an API error is printed to stderr with exit code 1."""
+    code, results, err = run("service", "404")
+
+    assert code == 1
+    assert results == []
+    assert json.loads(err)["type"] == "AppWashApiError"
+
+
+def test_missing_credentials(run):
+    """Test if the command fails without credentials and without daemon."""
+    with pytest.raises(SystemExit) as exit_info:
+        run("services", credentials=False)
+    assert exit_info.value.code == 2
+
+
+def test_daemon_serves_commands(daemon, run, simulator):
+    """Test if a running daemon serves the commands without credentials."""
+    location_id = simulator.location_ids[0]
+    requests = simulator.request_count
+
+    code, results, _ = run("services", location_id, credentials=False)
+    assert code == 0
+    assert len(results[0]) == 4
+
+    code, results, _ = run("location", location_id, credentials=False)
+    assert code == 0
+    assert results[0]["id"] == location_id
+    # The warm client of the daemon doesn't log in again
+    assert simulator.request_count == requests + 2
+
+
+def test_daemon_reports_errors(daemon, run):
+    """Test if errors raised in the daemon are reported by the command."""
+    code, _, err = run("service", "404", credentials=False)
+
+    assert code == 1
+    assert json.loads(err)["type"] == "AppWashApiError"
+
+
+def test_daemon_refuses_other_account(daemon, run, simulator):
+    """Test if the daemon doesn't run commands meant for another account or server."""
+    service = simulator.services_of(simulator.location_ids[0])[0]
+
+    code, _, err = run("--email", "other@mail.org", "buy", service.service_id)
+    assert code == 1
+    assert "logged in as" in json.loads(err)["message"]
+
+    code, _, err = run(
+        "--base-url", "http://127.0.0.1:1/", "services", credentials=False
+    )
+    assert code == 1
+    assert "connected to" in json.loads(err)["message"]
+    assert service.state == "AVAILABLE"
+
+
+def test_daemon_serves_same_account(daemon, run, simulator):
+    """Test if commands with the credentials of the daemon's account are served by it."""
+    requests = simulator.request_count
+
+    code, _, _ = run("services", simulator.location_ids[0])
+
+    assert code == 0
+    assert simulator.request_count == requests + 1
+
+
+def test_no_daemon(daemon, run):
+    """Test if --no-daemon bypasses a running daemon."""
+    with pytest.raises(SystemExit):
+        run("--no-daemon", "services", credentials=False)
+
+
+def test_second_daemon_refused(daemon, socket_path):
+    """Test if a second daemon doesn't take over the socket of a running one."""
+    with pytest.raises(OSError):
+        AppWashDaemon(lambda request: [], socket_path)
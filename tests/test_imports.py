@@ -0,0 +1,53 @@
+import subprocess
+import sys
+
+import pytest
+
+import appwashpy
+
+
+def loaded_modules(statement: str) -> set:
+    code = f"import sys\n{statement}\nprint(' '.join(sys.modules))"
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    return set(result.stdout.split())
+
+
+def test_import_doesnt_load_requests():
+    """Test if importing the package and its enums doesn't import the HTTP clients."""
+    modules = loaded_modules("from appwashpy import STATE, SERVICE_TYPE")
+
+    assert "requests" not in modules
+    assert "aiohttp" not in modules
+    assert "appwashpy.client.appwash" not in modules
+
+
+def test_client_doesnt_load_optional_features():
+    """Test if importing the client doesn't import the history and buy queue until they are used."""
+    modules = loaded_modules("from appwashpy import AppWash")
+
+    assert "sqlite3" not in modules
+    assert "appwashpy.client.history" not in modules
+    assert "appwashpy.client.buy_queue" not in modules
+
+
+def test_cli_doesnt_load_requests():
+    """Test if the command line only imports requests when it runs without daemon."""
+    assert "requests" not in loaded_modules("import appwashpy.cli")
+
+
+def test_lazy_names_resolve():
+    """Test if every public name is importable and is the object of its module."""
+    from appwashpy.client.appwash import AppWash
+
+    assert appwashpy.AppWash is AppWash
+    for name in appwashpy.__all__:
+        assert getattr(appwashpy, name) != None
+    assert set(appwashpy.__all__) <= set(dir(appwashpy))
+
+
+def test_unknown_name():
+    """Test if unknown names still raise an AttributeError."""
+    with pytest.raises(AttributeError):
+        appwashpy.AppWashClient
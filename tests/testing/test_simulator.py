@@ -0,0 +1,128 @@
+import pytest
+
+from appwashpy import STATE, AppWash, RetryPolicy
+from appwashpy.common.errors import (
+    AppWashApiError,
+    AppWashConnectionError,
+    WrongCredentialsError,
+)
+from appwashpy.testing.simulator import (
+    ERROR_NOT_FOUND,
+    ERROR_TOKEN_EXPIRED,
+    Simulator,
+    constant_latency,
+)
+from tests.helpers import EMAIL, PASSWORD
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1657791333.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock() -> Clock:
+    return Clock()
+
+
+def client(simulator: Simulator, **kwargs) -> AppWash:
+    return AppWash(EMAIL, PASSWORD, base_url=simulator.base_url, **kwargs)
+
+
+def test_synthetic_locations(clock):
+    """Test if the client loads the generated locations and machines."""
+    with Simulator(locations=3, services_per_location=1000, clock=clock) as simulator:
+        with client(simulator) as appwash:
+            location_id = simulator.location_ids[2]
+
+            assert appwash.location(location_id).id == location_id
+            assert len(appwash.services(location_id)) == 1000
+            assert len(appwash.services(location_id, "DRYER")) == 500
+            with pytest.raises(AppWashApiError, match=str(ERROR_NOT_FOUND)):
+                appwash.location("unknown")
+
+
+def test_machine_states(clock):
+    """Test if started machines move through the states and can be stopped."""
+    with Simulator(occupancy=0, session_wait=60, cycle=3600, clock=clock) as simulator:
+        with client(simulator) as appwash:
+            service_id = simulator.services_of(simulator.location_ids[0])[0].service_id
+
+            assert appwash.buy_service(service_id)
+            assert appwash.service(service_id).state == STATE.SESSION_WAIT_ON
+            assert appwash.buy_service(service_id) == False
+
+            clock.now += 60
+            assert appwash.service(service_id).state == STATE.STOPPABLE
+            appwash.stop_service(service_id)
+            assert appwash.service(service_id).state == STATE.AVAILABLE
+
+            appwash.buy_service(service_id)
+            clock.now += 3600
+            assert appwash.service(service_id).state == STATE.AVAILABLE
+
+
+def test_session_start(clock):
+    """Test if occupied and started machines report when their session started."""
+    with Simulator(occupancy=1, cycle=3600, seed=1, clock=clock) as simulator:
+        with client(simulator) as appwash:
+            services = appwash.services(simulator.location_ids[0])
+
+            assert all(s.state == STATE.OCCUPIED for s in services)
+            assert all(
+                clock.now - 3600 <= s.session_start <= clock.now for s in services
+            )
+
+            clock.now += 3600
+            service = appwash.service(services[0].service_id)
+            assert service.state == STATE.AVAILABLE
+            assert service.session_start == None
+
+            appwash.buy_service(service.service_id)
+            assert appwash.service(service.service_id).session_start == int(clock.now)
+
+
+def test_wrong_credentials(clock):
+    """Test if logins of unknown accounts fail with code 61."""
+    with Simulator(accounts={EMAIL: "other"}, clock=clock) as simulator:
+        with client(simulator) as appwash:
+            with pytest.raises(WrongCredentialsError):
+                appwash.services(simulator.location_ids[0])
+
+
+def test_token_expiry(clock):
+    """Test if requests with an expired token are rejected."""
+    with Simulator(token_lifetime=600, clock=clock) as simulator:
+        with client(simulator) as appwash:
+            location_id = simulator.location_ids[0]
+            appwash.services(location_id)
+
+            clock.now += 600
+            with pytest.raises(AppWashApiError, match=str(ERROR_TOKEN_EXPIRED)):
+                appwash.services(location_id)
+
+
+def test_fault_injection(clock):
+    """Test if injected HTTP errors and error codes reach the client."""
+    with Simulator(http_error_rate=1, clock=clock) as simulator:
+        with client(simulator, retry_policy=RetryPolicy(max_attempts=1)) as appwash:
+            with pytest.raises(AppWashConnectionError):
+                appwash.services(simulator.location_ids[0])
+
+    with Simulator(error_rate=1, error_codes=(61,), clock=clock) as simulator:
+        with client(simulator) as appwash:
+            with pytest.raises(WrongCredentialsError):
+                appwash.services(simulator.location_ids[0])
+
+
+def test_latency(clock, mocker):
+    """Test if responses are delayed by the configured latency."""
+    with Simulator(latency=constant_latency(0.05), clock=clock) as simulator:
+        sleep = mocker.spy(simulator, "_delay")
+        with client(simulator) as appwash:
+            appwash.services(simulator.location_ids[0])
+
+        assert sleep.spy_return == 0.05